@@ -0,0 +1,168 @@
+"""
+Server-side micro-batching for single-text classification requests
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-text predictions and runs them as one batch
+
+    Callers await `submit(text)`. Pending texts are flushed through the
+    async `predict_fn` as soon as `max_batch_size` texts are queued or
+    `max_latency_ms` has passed since the first one arrived, and each
+    caller receives its own result. Flushed batches run concurrently, so
+    new requests keep queueing while a batch is being scored.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[List[str]], Awaitable[List[Dict[str, Any]]]],
+        max_batch_size: int = 64,
+        max_latency_ms: float = 5.0
+    ):
+        """
+        Initialize the micro-batcher
+
+        Args:
+            predict_fn: Coroutine function classifying a list of texts in one call
+            max_batch_size: Flush as soon as this many texts are queued
+            max_latency_ms: Flush at the latest this long after the first queued text
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+        self.batches_flushed = 0
+        self.items_processed = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of texts waiting for the next flush"""
+        return len(self._pending)
+
+    async def submit(self, text: str) -> Dict[str, Any]:
+        """
+        Queue a text for classification and wait for its result
+
+        Args:
+            text: Input text to classify
+
+        Returns:
+            Dictionary with prediction results
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency_ms / 1000, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand all pending texts over to a new batch task"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Run a batch through the model and resolve its futures"""
+        texts = [text for text, _ in batch]
+        try:
+            results = await self.predict_fn(texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_flushed += 1
+        self.items_processed += len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching counters"""
+        return {
+            "queue_depth": self.queue_depth,
+            "batches_flushed": self.batches_flushed,
+            "items_processed": self.items_processed,
+            "avg_batch_size": (
+                round(self.items_processed / self.batches_flushed, 2)
+                if self.batches_flushed else 0.0
+            )
+        }
+
+
+class MicroBatcherPool:
+    """
+    Keeps one MicroBatcher per model type and number of ranked candidates
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[str, List[str], int], Awaitable[List[Dict[str, Any]]]],
+        max_batch_size: int = 64,
+        max_latency_ms: float = 5.0
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            predict_fn: Coroutine function taking (model_type, texts, top_k) and classifying the texts
+            max_batch_size: Flush size for every batcher
+            max_latency_ms: Flush latency for every batcher
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self._batchers: Dict[Tuple[str, int], MicroBatcher] = {}
+
+    def get(self, model_type: str, top_k: int = 1) -> MicroBatcher:
+        """Get (or create) the batcher for a model type and top_k"""
+        batcher = self._batchers.get((model_type, top_k))
+        if batcher is None:
+            batcher = MicroBatcher(
+                lambda texts: self.predict_fn(model_type, texts, top_k),
+                max_batch_size=self.max_batch_size,
+                max_latency_ms=self.max_latency_ms
+            )
+            self._batchers[(model_type, top_k)] = batcher
+        return batcher
+
+    async def submit(self, model_type: str, text: str, top_k: int = 1) -> Dict[str, Any]:
+        """Queue a text on the batcher of the given model type and top_k"""
+        return await self.get(model_type, top_k).submit(text)
+
+    @property
+    def queue_depth(self) -> int:
+        """Total number of queued texts across model types"""
+        return sum(batcher.queue_depth for batcher in self._batchers.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching counters for every model type"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_latency_ms": self.max_latency_ms,
+            "queue_depth": self.queue_depth,
+            "models": {
+                (model_type if top_k == 1 else f"{model_type}:top{top_k}"): batcher.get_stats()
+                for (model_type, top_k), batcher in self._batchers.items()
+            }
+        }
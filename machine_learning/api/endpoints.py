@@ -1,35 +1,118 @@
 """
 API endpoints for ML Classification API
 """
+import asyncio
 import time
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from .schemas import (
     ClassificationRequest, 
     ClassificationResponse, 
+    BatchClassificationRequest,
+    BatchClassificationResponse,
+    BatchClassificationResult,
+    EnsembleClassificationRequest,
+    EnsembleClassificationResponse,
     ModelInfo, 
     TrainingRequest, 
     TrainingResponse,
+    TrainingJobStatus,
+    ModelUpdateRequest,
+    ModelUpdateResponse,
+    ProfilingRequest,
+    ProfilingStatus,
     ErrorResponse
 )
+from .batching import MicroBatcherPool
+from .ensemble import predict_ensemble
+from .middleware import current_request
+from .inference import InferenceExecutor
 from persistence.model_manager import ModelManager
-from models.model_factory import ModelFactory
-from data.dataset_loader import DatasetLoader
-from config import DATASET_PATH, MODEL_CONFIGS
+from training import TrainingJobManager
+from utils.metrics import registry
+from utils.logger import get_logging_stats
+from utils.profiling import profiler
+from config import (
+    API_CONFIG, ENSEMBLE_CONFIG, INFERENCE_CONFIG, MICRO_BATCH_CONFIG, MODEL_CONFIGS, ONLINE_LEARNING_CONFIG,
+    TRAINING_CONFIG
+)
 
 router = APIRouter()
 
 # Global model manager instance
 model_manager = ModelManager()
 
+# Bounded pool that keeps model loading and inference off the event loop
+inference_executor = InferenceExecutor(
+    mode=INFERENCE_CONFIG["executor"],
+    max_workers=INFERENCE_CONFIG["max_workers"]
+)
+
+
+def _predict_batch(model_type: str, texts: List[str], top_k: int = 1) -> List[dict]:
+    """Load a model (if needed) and classify a batch of texts through the cache"""
+    return model_manager.predict_batch(model_type, texts, top_k)
+
+
+def _metrics_label(model_type: str) -> str:
+    """model_type label of request metrics (bounded to the configured model types)"""
+    return model_type if model_type in MODEL_CONFIGS else "other"
+
+
+def _needs_review(score: float, min_score: Optional[float]) -> bool:
+    """Whether a prediction scores below the client's confidence threshold"""
+    return min_score is not None and score < min_score
+
+
+# Runs POST /train fits in a worker pool and hot-swaps the results in
+training_jobs = TrainingJobManager(
+    model_manager,
+    max_concurrent_jobs=TRAINING_CONFIG["max_concurrent_jobs"],
+    executor=TRAINING_CONFIG["executor"],
+    history_size=TRAINING_CONFIG["history_size"]
+)
+
+
+# Groups concurrent /classify calls into vectorized batches per model type
+micro_batcher = MicroBatcherPool(
+    lambda model_type, texts, top_k: inference_executor.run(_predict_batch, model_type, texts, top_k),
+    max_batch_size=MICRO_BATCH_CONFIG["max_batch_size"],
+    max_latency_ms=MICRO_BATCH_CONFIG["max_latency_ms"]
+)
+
+
+# Serving state read at every /metrics scrape
+registry.gauge_callback(
+    "ml_api_models_loaded", "Models held in memory", lambda: [((), len(model_manager._loaded_models))]
+)
+registry.gauge_callback(
+    "ml_api_inference_in_flight", "Calls running or queued on the inference pool",
+    lambda: [((), inference_executor.get_stats()["in_flight"])]
+)
+registry.gauge_callback(
+    "ml_api_micro_batch_queue_depth", "Texts waiting for the next micro-batch flush",
+    lambda: [((), micro_batcher.queue_depth)]
+)
+registry.gauge_callback(
+    "ml_api_prediction_cache_hit_ratio", "Share of prediction cache lookups that hit",
+    lambda: [((), model_manager.prediction_cache.get_stats()["hit_rate"])]
+)
+registry.gauge_callback(
+    "ml_api_log_records", "Log records waiting on the logging queue, dropped on a full queue, or sampled out",
+    lambda: [((state,), count) for state, count in get_logging_stats().items()], ("state",)
+)
+
 
 @router.post("/classify", response_model=ClassificationResponse)
 async def classify_text(request: ClassificationRequest):
     """
     Classify a text using the specified model
     """
+    timer = current_request()
+    timer.model_type = _metrics_label(request.model_type)
+    timer.stage("validation")
     try:
         # Check if model is available
         if not model_manager.is_model_available(request.model_type):
@@ -38,20 +121,28 @@ async def classify_text(request: ClassificationRequest):
                 detail=f"Model '{request.model_type}' not found. Available models: {model_manager.get_available_models()}"
             )
         
-        # Load model
-        classifier = model_manager.load_model(request.model_type)
-        
         # Measure processing time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        # Make prediction
-        result = classifier.predict(request.text)
+        # Make prediction, answering repeated texts straight from the cache
+        result = model_manager.get_cached_prediction(request.model_type, request.text, request.top_k)
+        timer.stage("model_lookup")
+        if result is None:
+            if MICRO_BATCH_CONFIG["enabled"]:
+                result = await micro_batcher.submit(request.model_type, request.text, request.top_k)
+            else:
+                result = (await inference_executor.run(
+                    _predict_batch, request.model_type, [request.text], request.top_k
+                ))[0]
         
-        processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+        processing_time = (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
+        timer.mark()
         
         return ClassificationResponse(
             tagClass=result["tagClass"],
             score=result["score"],
+            candidates=result["candidates"],
+            needs_review=_needs_review(result["score"], request.min_score),
             model_used=result["model_used"],
             processing_time_ms=round(processing_time, 2)
         )
@@ -60,10 +151,145 @@ async def classify_text(request: ClassificationRequest):
         raise HTTPException(status_code=500, detail=f"Classification failed: {str(e)}")
 
 
-@router.post("/train", response_model=TrainingResponse)
+@router.post("/classify/batch", response_model=BatchClassificationResponse)
+async def classify_batch(request: BatchClassificationRequest):
+    """
+    Classify several texts with a single vectorized prediction pass
+    """
+    timer = current_request()
+    timer.model_type = _metrics_label(request.model_type)
+    try:
+        max_batch_size = API_CONFIG["max_batch_size"]
+        if len(request.items) > max_batch_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch too large: {len(request.items)} items (max {max_batch_size})"
+            )
+        
+        texts = [item.text for item in request.items]
+        total_chars = sum(len(text) for text in texts)
+        if total_chars > API_CONFIG["max_batch_chars"]:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch payload too large: {total_chars} characters (max {API_CONFIG['max_batch_chars']})"
+            )
+        
+        timer.stage("validation")
+        
+        # Check if model is available
+        if not model_manager.is_model_available(request.model_type):
+            raise HTTPException(
+                status_code=404, 
+                detail=f"Model '{request.model_type}' not found. Available models: {model_manager.get_available_models()}"
+            )
+        
+        # Measure processing time
+        start_time = time.perf_counter()
+        timer.stage("model_lookup")
+        
+        # Make predictions for the whole batch at once
+        predictions = await inference_executor.run(_predict_batch, request.model_type, texts, request.top_k)
+        
+        processing_time = (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
+        timer.mark()
+        
+        results = [
+            BatchClassificationResult(
+                id=item.id,
+                tagClass=prediction["tagClass"],
+                score=prediction["score"],
+                candidates=prediction["candidates"],
+                needs_review=_needs_review(prediction["score"], request.min_score)
+            )
+            for item, prediction in zip(request.items, predictions)
+        ]
+        
+        return BatchClassificationResponse(
+            model_used=predictions[0]["model_used"],
+            count=len(results),
+            results=results,
+            processing_time_ms=round(processing_time, 2),
+            per_item_time_ms=round(processing_time / len(results), 4)
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch classification failed: {str(e)}")
+
+
+@router.post("/classify/ensemble", response_model=EnsembleClassificationResponse)
+async def classify_ensemble(request: EnsembleClassificationRequest):
+    """
+    Classify a text with several models and combine their outputs
+    """
+    timer = current_request()
+    timer.model_type = "ensemble"
+    try:
+        model_types = request.model_types or ENSEMBLE_CONFIG["model_types"] or model_manager.get_available_models()
+        model_types = list(dict.fromkeys(model_types))
+        
+        missing = [model_type for model_type in model_types if not model_manager.is_model_available(model_type)]
+        if missing or not model_types:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Models not found: {missing}. Available models: {model_manager.get_available_models()}"
+            )
+        
+        unknown = sorted(set(request.weights or {}) - set(model_types))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Weights given for models not in the ensemble: {unknown}")
+        
+        weights = {model_type: ENSEMBLE_CONFIG["weights"].get(model_type, 1.0) for model_type in model_types}
+        weights.update(request.weights or {})
+        if any(weight < 0 for weight in weights.values()):
+            raise HTTPException(status_code=400, detail="Ensemble weights must not be negative")
+        
+        method = request.method or ENSEMBLE_CONFIG["method"]
+        timer.stage("validation")
+        
+        # Measure processing time
+        start_time = time.perf_counter()
+        
+        loaded = await asyncio.gather(*(
+            inference_executor.run(model_manager.load_model, model_type) for model_type in model_types
+        ))
+        timer.stage("model_lookup")
+        result = await predict_ensemble(
+            inference_executor.run, dict(zip(model_types, loaded)), [request.text], weights, method, request.top_k
+        )
+        
+        processing_time = (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
+        timer.mark()
+        
+        prediction = result["predictions"][0]
+        return EnsembleClassificationResponse(
+            tagClass=prediction["tagClass"],
+            score=prediction["score"],
+            candidates=prediction["candidates"],
+            needs_review=_needs_review(prediction["score"], request.min_score),
+            method=method,
+            members=[
+                {**member, "tagClass": member["tagClass"][0], "score": member["score"][0]}
+                for member in result["members"]
+            ],
+            processing_time_ms=round(processing_time, 2)
+        )
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ensemble classification failed: {str(e)}")
+
+
+@router.post("/train", response_model=TrainingResponse, status_code=202)
 async def train_model(request: TrainingRequest):
     """
-    Train a new model or retrain an existing one
+    Queue the training of a new model or the retraining of an existing one
+    
+    Returns immediately with a job id; poll GET /train/jobs/{job_id} for progress.
     """
     try:
         # Check if model type is supported
@@ -81,37 +307,43 @@ async def train_model(request: TrainingRequest):
                 detail=f"Model '{request.model_type}' already exists. Use retrain=true to retrain."
             )
         
-        # Load dataset
-        dataset_loader = DatasetLoader(str(DATASET_PATH))
-        X, y = dataset_loader.get_training_data()  # Use same train/test split as original
-        
-        # Create and train classifier
-        classifier = ModelFactory.create_classifier(request.model_type)
-        
-        # Get model configuration
-        model_config = MODEL_CONFIGS[request.model_type]
-        vectorizer_params = model_config.get("vectorizer_params", {})
-        
-        # Train the model
-        metadata = classifier.train(X, y, vectorizer_params)
-        
-        # Save the trained model
-        model_path = model_manager.save_model(classifier, request.model_type)
+        # Queue the training job (one per model type at a time)
+        job = training_jobs.submit(request.model_type)
         
         return TrainingResponse(
             model_type=request.model_type,
             success=True,
-            message=f"Model trained and saved successfully to {model_path}",
-            metadata=metadata
+            message=f"Training job queued. Poll /api/v1/train/jobs/{job['job_id']} for progress",
+            metadata=None,
+            job_id=job["job_id"],
+            status=job["status"]
         )
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        return TrainingResponse(
-            model_type=request.model_type,
-            success=False,
-            message=f"Training failed: {str(e)}",
-            metadata=None
-        )
+        raise HTTPException(status_code=500, detail=f"Failed to queue training: {str(e)}")
+
+
+@router.get("/train/jobs", response_model=List[TrainingJobStatus])
+async def get_training_jobs():
+    """
+    List recent training jobs, oldest first
+    """
+    return training_jobs.list_jobs()
+
+
+@router.get("/train/jobs/{job_id}", response_model=TrainingJobStatus)
+async def get_training_job(job_id: str):
+    """
+    Get the status, phase timings and final metrics of a training job
+    """
+    job = training_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Training job '{job_id}' not found")
+    return job
 
 
 @router.get("/models", response_model=List[ModelInfo])
@@ -174,6 +406,116 @@ async def get_model_info(model_type: str):
         raise HTTPException(status_code=500, detail=f"Failed to get model info: {str(e)}")
 
 
+@router.get("/models/{model_type}/evaluation")
+async def get_model_evaluation(model_type: str):
+    """
+    Get the cross-validation results stored with the current model version
+    """
+    if not model_manager.is_model_available(model_type):
+        raise HTTPException(status_code=404, detail=f"Model '{model_type}' not found")
+    
+    metadata = model_manager.get_model_info(model_type)
+    if "evaluation" not in metadata:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Model '{model_type}' has no evaluation results. Retrain it to cross-validate."
+        )
+    
+    return {
+        "model_type": model_type,
+        "version": metadata.get("version"),
+        "evaluation": metadata["evaluation"]
+    }
+
+
+@router.get("/models/{model_type}/versions")
+async def get_model_versions(model_type: str):
+    """
+    List the saved versions of a model and the one being served
+    """
+    versions = model_manager.list_versions(model_type)
+    if not versions and not model_manager.is_model_available(model_type):
+        raise HTTPException(status_code=404, detail=f"Model '{model_type}' not found")
+    
+    return {
+        "model_type": model_type,
+        "current_version": model_manager.get_current_version(model_type),
+        "versions": versions
+    }
+
+
+@router.post("/models/{model_type}/versions/{version}/activate")
+async def activate_model_version(model_type: str, version: str):
+    """
+    Serve a saved version of a model (loaded in the background, then swapped in)
+    """
+    try:
+        await inference_executor.run(model_manager.swap, model_type, version)
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to activate version: {str(e)}")
+    
+    return {"message": f"Model '{model_type}' now serving version '{version}'"}
+
+
+@router.post("/models/{model_type}/update", response_model=ModelUpdateResponse)
+async def update_model(model_type: str, request: ModelUpdateRequest):
+    """
+    Incrementally train a model on corrected labels (no full retrain)
+    """
+    try:
+        max_samples = ONLINE_LEARNING_CONFIG["max_samples"]
+        if len(request.samples) > max_samples:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Too many samples: {len(request.samples)} (max {max_samples})"
+            )
+        
+        if not model_manager.is_model_available(model_type):
+            raise HTTPException(status_code=404, detail=f"Model '{model_type}' not found")
+        
+        start_time = time.perf_counter()
+        
+        texts = [sample.text for sample in request.samples]
+        labels = [sample.label for sample in request.samples]
+        result = await inference_executor.run(model_manager.update_model, model_type, texts, labels)
+        
+        processing_time = (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
+        
+        return ModelUpdateResponse(
+            model_type=model_type,
+            previous_version=result["previous_version"],
+            version=result["version"],
+            samples=len(texts),
+            persisted=result["persisted"],
+            pending_updates=result["pending_updates"],
+            processing_time_ms=round(processing_time, 2)
+        )
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update model: {str(e)}")
+
+
+@router.post("/models/{model_type}/rollback")
+async def rollback_model(model_type: str):
+    """
+    Serve the version saved before the current one
+    """
+    try:
+        classifier = await inference_executor.run(model_manager.rollback, model_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to roll back model: {str(e)}")
+    
+    return {"message": f"Model '{model_type}' rolled back to version '{classifier.version}'"}
+
+
 @router.delete("/models/{model_type}")
 async def delete_model(model_type: str):
     """
@@ -197,6 +539,41 @@ async def delete_model(model_type: str):
         raise HTTPException(status_code=500, detail=f"Failed to delete model: {str(e)}")
 
 
+@router.get("/debug/profile", response_class=PlainTextResponse)
+async def get_profile(reset: bool = False):
+    """
+    Collapsed call stacks of the profiled model calls (flamegraph.pl / speedscope input)
+    
+    Every line is "frame;frame;frame microseconds"; reset=true clears the
+    collected stacks after reading them.
+    """
+    collapsed = profiler.collapsed()
+    if reset:
+        profiler.reset()
+    return PlainTextResponse(collapsed)
+
+
+@router.post("/debug/profile", response_model=ProfilingStatus)
+async def configure_profiling(request: ProfilingRequest):
+    """
+    Switch the sampling profiler on or off
+    """
+    try:
+        profiler.configure(request.enabled, request.sample_rate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return profiler.get_stats()
+
+
+@router.delete("/debug/profile", response_model=ProfilingStatus)
+async def reset_profile():
+    """
+    Drop the collected stacks and counters
+    """
+    profiler.reset()
+    return profiler.get_stats()
+
+
 @router.get("/health")
 async def health_check():
     """
@@ -205,5 +582,8 @@ async def health_check():
     return {
         "status": "healthy",
         "available_models": model_manager.get_available_models(),
-        "total_loaded_models": len(model_manager._loaded_models)
+        "total_loaded_models": len(model_manager._loaded_models),
+        "inference": inference_executor.get_stats(),
+        "prediction_cache": model_manager.prediction_cache.get_stats(),
+        "micro_batching": micro_batcher.get_stats()
     }
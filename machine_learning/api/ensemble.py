@@ -0,0 +1,156 @@
+"""
+Ensemble inference: one request scored by several models
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from models.base_classifier import BaseClassifier, rank_top_k
+from utils.metrics import STAGE_SECONDS
+
+ENSEMBLE_METHODS = ("average", "vote")
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """Call a function and measure its own run time (excluding executor queueing)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, round((time.perf_counter() - start) * 1000, 2)
+
+
+def combine_scores(
+    members: List[Tuple[np.ndarray, np.ndarray, float]],
+    method: str = "average"
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Combine the probability matrices of several models
+
+    Columns are aligned on the sorted union of the models' classes.
+    "average" returns the weighted mean of the probabilities; "vote"
+    gives every model's argmax its weight and returns the vote shares,
+    with ties between classes broken by the averaged probabilities.
+
+    Args:
+        members: (classes, probabilities, weight) of every model
+        method: "average" or "vote"
+
+    Returns:
+        Tuple of (classes, scores, ranking): the scores to report and the
+        matrix to rank the classes by
+
+    Raises:
+        ValueError: If the method is unknown or the weights sum to zero
+    """
+    if method not in ENSEMBLE_METHODS:
+        raise ValueError(f"Unsupported ensemble method: {method}. Available: {list(ENSEMBLE_METHODS)}")
+
+    total_weight = sum(weight for _, _, weight in members)
+    if total_weight <= 0:
+        raise ValueError("Ensemble weights must sum to a positive value")
+
+    classes = np.unique(np.concatenate([member_classes for member_classes, _, _ in members]))
+    n_rows = members[0][1].shape[0]
+    rows = np.arange(n_rows)
+    average = np.zeros((n_rows, len(classes)))
+    votes = np.zeros((n_rows, len(classes)))
+
+    for member_classes, probabilities, weight in members:
+        columns = np.searchsorted(classes, member_classes)
+        average[:, columns] += weight * probabilities
+        votes[rows, columns[probabilities.argmax(axis=1)]] += weight
+    average /= total_weight
+    votes /= total_weight
+
+    if method == "average":
+        return classes, average, average
+    return classes, votes, votes + average * 1e-6
+
+
+async def predict_ensemble(
+    run: Callable[..., Awaitable[Any]],
+    classifiers: Dict[str, BaseClassifier],
+    texts: List[str],
+    weights: Dict[str, float],
+    method: str = "average",
+    k: int = 1
+) -> Dict[str, Any]:
+    """
+    Score texts with several models and combine their outputs
+
+    Models whose fitted vectorizers are identical (same vectorizer_key)
+    share one transform of the texts. Every vectorizer group, and every
+    model inside a group, runs as its own call on the executor, so
+    independent models are evaluated concurrently.
+
+    Args:
+        run: Coroutine function running a blocking call off the event loop
+            (InferenceExecutor.run)
+        classifiers: Loaded classifiers by model type
+        texts: Texts to classify
+        weights: Weight of every model type
+        method: "average" or "vote"
+        k: Number of ranked candidate classes per text
+
+    Returns:
+        Dictionary with the combined "predictions" (one per text) and the
+        per-model "members" results and latencies
+    """
+    groups: Dict[str, List[str]] = {}
+    for model_type, classifier in classifiers.items():
+        groups.setdefault(classifier.vectorizer_key, []).append(model_type)
+
+    async def score_group(model_types: List[str]):
+        vectorizer = classifiers[model_types[0]].vectorizer
+        X, vectorize_ms = await run(_timed, vectorizer.transform, texts)
+        scored = await asyncio.gather(*(
+            run(_timed, classifiers[model_type].score_features, X) for model_type in model_types
+        ))
+        STAGE_SECONDS.labels("vectorize", model_types[0]).observe(vectorize_ms / 1000)
+        for model_type, (_, score_ms) in zip(model_types, scored):
+            STAGE_SECONDS.labels("score", model_type).observe(score_ms / 1000)
+        return [
+            (model_type, probabilities, vectorize_ms, score_ms, len(model_types) > 1)
+            for model_type, (probabilities, score_ms) in zip(model_types, scored)
+        ]
+
+    results = [member for group in await asyncio.gather(*map(score_group, groups.values())) for member in group]
+
+    classes, scores, ranking = combine_scores(
+        [(classifiers[model_type].classes_, probabilities, weights[model_type])
+         for model_type, probabilities, _, _, _ in results],
+        method
+    )
+    top, _ = rank_top_k(ranking, k)
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    labels = classes[top].tolist()
+
+    members = []
+    for model_type, probabilities, vectorize_ms, score_ms, shared in results:
+        classifier = classifiers[model_type]
+        best = probabilities.argmax(axis=1)
+        members.append({
+            "model_type": model_type,
+            "version": classifier.version,
+            "weight": weights[model_type],
+            "tagClass": classifier.classes_[best].tolist(),
+            "score": probabilities[np.arange(len(texts)), best].tolist(),
+            "shared_vectorizer": shared,
+            "vectorize_ms": vectorize_ms,
+            "score_ms": score_ms
+        })
+
+    return {
+        "predictions": [
+            {
+                "tagClass": row_labels[0],
+                "score": row_scores[0],
+                "candidates": [
+                    {"class": label, "score": score} for label, score in zip(row_labels, row_scores)
+                ]
+            }
+            for row_labels, row_scores in zip(labels, top_scores.tolist())
+        ],
+        "members": members
+    }
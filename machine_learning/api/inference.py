@@ -0,0 +1,86 @@
+"""
+Dispatch of CPU-bound inference off the asyncio event loop
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class InferenceExecutor:
+    """
+    Runs blocking model calls on a bounded thread pool
+
+    Vectorizing and scoring release the event loop while they run, so
+    `/health` and other requests stay responsive under inference load.
+    The "inline" mode runs calls directly on the event loop and only
+    exists for comparison benchmarks.
+    """
+
+    MODES = ("thread", "inline")
+
+    def __init__(self, mode: str = "thread", max_workers: int = 4):
+        """
+        Initialize the executor
+
+        Args:
+            mode: "thread" to use a thread pool, "inline" to block the event loop
+            max_workers: Size of the thread pool
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported inference executor: {mode}. Available: {list(self.MODES)}")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Create the thread pool on first use"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="inference"
+            )
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking function and await its result
+
+        The function runs in a copy of the caller's context, so context
+        variables set for the request (request id, stage timer) are seen
+        by the logs and metrics it records.
+
+        Args:
+            func: Function to call
+            *args: Positional arguments for the function
+
+        Returns:
+            The function's return value
+        """
+        if self.mode == "inline":
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        self._in_flight += 1
+        try:
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(self._get_pool(), functools.partial(context.run, func, *args))
+        finally:
+            self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        """Stop the thread pool, waiting for running calls to finish"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor settings and the number of calls in flight"""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "in_flight": self._in_flight
+        }
@@ -0,0 +1,192 @@
+"""
+ASGI middleware timing every request for the /metrics endpoint and
+writing one structured access log record per request
+"""
+import logging
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+from utils.logger import reset_request_id, set_request_id, setup_logger
+from utils.metrics import ERRORS, IN_FLIGHT, REQUEST_SECONDS, REQUESTS, STAGE_SECONDS
+from config import METRICS_CONFIG
+
+logger = setup_logger()
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+
+class RequestTimer:
+    """
+    Per-request stage clock
+
+    The middleware creates one per request; handlers fetch it with
+    current_request(), set `model_type` and call `stage(name)` at the end
+    of each stage, which records the time since the previous mark. The
+    "serialize" stage runs from the handler's last mark until the
+    response headers are sent.
+    """
+
+    __slots__ = ("start", "last_mark", "model_type", "handled")
+
+    def __init__(self):
+        self.start = self.last_mark = time.perf_counter()
+        self.model_type = ""
+        self.handled = False
+
+    def stage(self, name: str) -> None:
+        """Record the time since the previous mark as stage `name`"""
+        now = time.perf_counter()
+        STAGE_SECONDS.labels(name, self.model_type).observe(now - self.last_mark)
+        self.last_mark = now
+
+    def mark(self) -> None:
+        """Start the next stage without recording the current one"""
+        self.last_mark = time.perf_counter()
+        self.handled = True
+
+    def response_started(self) -> None:
+        """Record the serialize stage of handlers that marked their end"""
+        if self.handled:
+            self.stage("serialize")
+
+
+class _NullTimer(RequestTimer):
+    """Timer of requests with metrics disabled, and outside requests; records nothing"""
+
+    __slots__ = ()
+
+    def stage(self, name: str) -> None:
+        pass
+
+    def mark(self) -> None:
+        pass
+
+
+_current_request: ContextVar[Optional[RequestTimer]] = ContextVar("current_request", default=None)
+
+
+def current_request() -> RequestTimer:
+    """Timer of the request being handled (a new no-op timer outside requests)"""
+    # Never a shared instance: handlers set model_type on the timer
+    return _current_request.get() or _NullTimer()
+
+
+def _handler_name(scope) -> str:
+    """Route handler of a request, known once the router has matched it"""
+    endpoint = scope.get("endpoint")
+    return getattr(endpoint, "__name__", "unmatched")
+
+
+class MetricsMiddleware:
+    """
+    Counts requests, errors and requests in flight, and times them
+
+    Plain ASGI (no BaseHTTPMiddleware task hop) so the per-request cost
+    stays at a few counter updates and clock reads.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not METRICS_CONFIG["enabled"]:
+            # Still one timer per request, so the access log sees its model_type
+            token = _current_request.set(_NullTimer())
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _current_request.reset(token)
+            return
+
+        timer = RequestTimer()
+        token = _current_request.set(timer)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timer.response_started()
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.dec()
+            _current_request.reset(token)
+
+            handler = _handler_name(scope)
+            REQUEST_SECONDS.labels(handler, timer.model_type).observe(time.perf_counter() - timer.start)
+            REQUESTS.labels(handler, scope["method"], str(status)).inc()
+            if status >= 400:
+                ERRORS.labels(handler, str(status)).inc()
+
+
+def _request_id(scope) -> str:
+    """Client-supplied X-Request-ID if it is usable, otherwise a new id"""
+    for name, value in scope.get("headers", ()):
+        if name == REQUEST_ID_HEADER:
+            if 0 < len(value) <= 128 and value.isascii() and value.decode().isprintable():
+                return value.decode()
+            break
+    return uuid.uuid4().hex
+
+
+class RequestLogMiddleware:
+    """
+    Tags every request with an id and logs it once it has been answered
+
+    The id (the client's X-Request-ID, or a new one) is echoed in the
+    response headers and attached to every record logged while the request
+    is handled. The access record carries method, path, status, handler,
+    model_type and latency_ms; it is logged at INFO (subject to
+    LOGGING_CONFIG["info_sample_rate"]) or at WARNING for 5xx responses.
+    Added inside MetricsMiddleware so the handler's model_type is visible.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_id = _request_id(scope)
+        token = set_request_id(request_id)
+        status = 500
+
+        async def send_with_request_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", ())) + [(REQUEST_ID_HEADER, request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception:
+            # Logged here, while the request id is still set; the app's
+            # exception handler runs outside the user middleware
+            logger.exception("Unhandled error in %s %s", scope["method"], scope["path"])
+            raise
+        finally:
+            level = logging.WARNING if status >= 500 else logging.INFO
+            if logger.isEnabledFor(level):
+                logger.log(level, "%s %s %s", scope["method"], scope["path"], status, extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "handler": _handler_name(scope),
+                    "model_type": current_request().model_type or None,
+                    "latency_ms": round((time.perf_counter() - start) * 1000, 3)
+                })
+            reset_request_id(token)
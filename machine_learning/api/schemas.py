@@ -2,7 +2,7 @@
 Pydantic schemas for API request/response models
 """
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 
 class ClassificationRequest(BaseModel):
@@ -11,6 +11,18 @@ class ClassificationRequest(BaseModel):
     
     text: str = Field(..., description="Text to classify", min_length=1, max_length=10000)
     model_type: str = Field(default="svm", description="Type of model to use for classification")
+    top_k: int = Field(default=1, ge=1, le=20, description="Number of ranked candidate classes to return")
+    min_score: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="Flag predictions scoring below this for human review"
+    )
+
+
+class ClassScore(BaseModel):
+    """A candidate class with its score"""
+    model_config = ConfigDict(populate_by_name=True)
+    
+    label: str = Field(..., alias="class", description="Candidate class")
+    score: float = Field(..., description="Calibrated probability of the class", ge=0.0, le=1.0)
 
 
 class ClassificationResponse(BaseModel):
@@ -19,10 +31,91 @@ class ClassificationResponse(BaseModel):
     
     tagClass: str = Field(..., description="Predicted class")
     score: float = Field(..., description="Confidence score", ge=0.0, le=1.0)
+    candidates: List[ClassScore] = Field(default_factory=list, description="top_k classes, best first")
+    needs_review: bool = Field(False, description="Whether the score is below the requested min_score")
     model_used: str = Field(..., description="Model type used for prediction")
     processing_time_ms: Optional[float] = Field(None, description="Processing time in milliseconds")
 
 
+class BatchClassificationItem(BaseModel):
+    """A single text inside a batch classification request"""
+    id: Optional[str] = Field(None, description="Optional client identifier echoed back in the result")
+    text: str = Field(..., description="Text to classify", min_length=1, max_length=10000)
+
+
+class BatchClassificationRequest(BaseModel):
+    """Request schema for batch text classification"""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    items: List[BatchClassificationItem] = Field(..., description="Texts to classify", min_length=1)
+    model_type: str = Field(default="svm", description="Type of model to use for classification")
+    top_k: int = Field(default=1, ge=1, le=20, description="Number of ranked candidate classes to return")
+    min_score: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="Flag predictions scoring below this for human review"
+    )
+
+
+class BatchClassificationResult(BaseModel):
+    """Classification result for a single batch item"""
+    id: Optional[str] = Field(None, description="Identifier of the request item, if one was given")
+    tagClass: str = Field(..., description="Predicted class")
+    score: float = Field(..., description="Confidence score", ge=0.0, le=1.0)
+    candidates: List[ClassScore] = Field(default_factory=list, description="top_k classes, best first")
+    needs_review: bool = Field(False, description="Whether the score is below the requested min_score")
+
+
+class BatchClassificationResponse(BaseModel):
+    """Response schema for batch text classification"""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    model_used: str = Field(..., description="Model type used for prediction")
+    count: int = Field(..., description="Number of classified items")
+    results: List[BatchClassificationResult] = Field(..., description="Results in request order")
+    processing_time_ms: float = Field(..., description="Total processing time in milliseconds")
+    per_item_time_ms: float = Field(..., description="Average processing time per item in milliseconds")
+
+
+class EnsembleClassificationRequest(BaseModel):
+    """Request schema for classification by several models at once"""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    text: str = Field(..., description="Text to classify", min_length=1, max_length=10000)
+    model_types: Optional[List[str]] = Field(
+        None, min_length=1, description="Models to combine (default: ENSEMBLE_CONFIG or every available model)"
+    )
+    weights: Optional[Dict[str, float]] = Field(None, description="Weight per model type (default 1.0)")
+    method: Optional[str] = Field(None, description="average or vote (default: ENSEMBLE_CONFIG)")
+    top_k: int = Field(default=1, ge=1, le=20, description="Number of ranked candidate classes to return")
+    min_score: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="Flag predictions scoring below this for human review"
+    )
+
+
+class EnsembleMemberResult(BaseModel):
+    """Prediction and latency of one model inside an ensemble"""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    model_type: str = Field(..., description="Type of model")
+    version: str = Field(..., description="Version of the model")
+    weight: float = Field(..., description="Weight of the model's output")
+    tagClass: str = Field(..., description="Class predicted by this model")
+    score: float = Field(..., description="This model's score of its class", ge=0.0, le=1.0)
+    shared_vectorizer: bool = Field(..., description="Whether the text transform was shared with other models")
+    vectorize_ms: float = Field(..., description="Time to vectorize the text (once per shared vectorizer)")
+    score_ms: float = Field(..., description="Time to score the vectorized text")
+
+
+class EnsembleClassificationResponse(BaseModel):
+    """Response schema for ensemble classification"""
+    tagClass: str = Field(..., description="Predicted class")
+    score: float = Field(..., description="Combined score of the class", ge=0.0, le=1.0)
+    candidates: List[ClassScore] = Field(default_factory=list, description="top_k classes, best first")
+    needs_review: bool = Field(False, description="Whether the score is below the requested min_score")
+    method: str = Field(..., description="How the model outputs were combined")
+    members: List[EnsembleMemberResult] = Field(..., description="Result of every model")
+    processing_time_ms: float = Field(..., description="Processing time in milliseconds")
+
+
 class ModelInfo(BaseModel):
     """Schema for model information"""
     model_config = ConfigDict(protected_namespaces=())
@@ -49,6 +142,64 @@ class TrainingResponse(BaseModel):
     success: bool = Field(..., description="Whether training was successful")
     message: str = Field(..., description="Training result message")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Training metadata")
+    job_id: Optional[str] = Field(None, description="Identifier of the queued training job")
+    status: Optional[str] = Field(None, description="Status of the training job")
+
+
+class TrainingJobStatus(BaseModel):
+    """Status of a background training job"""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    job_id: str = Field(..., description="Identifier of the training job")
+    model_type: str = Field(..., description="Type of model being trained")
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    phase: Optional[str] = Field(None, description="Current phase: load, train, cross_validate, save or activate")
+    phase_timings_ms: Dict[str, float] = Field(default_factory=dict, description="Duration of every finished phase")
+    version: Optional[str] = Field(None, description="Version of the trained model")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Training metadata and metrics")
+    error: Optional[str] = Field(None, description="Error message of a failed job")
+    submitted_at: str = Field(..., description="When the job was queued (UTC)")
+    finished_at: Optional[str] = Field(None, description="When the job finished (UTC)")
+
+
+class LabeledSample(BaseModel):
+    """A text with its corrected label"""
+    text: str = Field(..., description="Text to learn from")
+    label: str = Field(..., description="Correct class of the text")
+
+
+class ModelUpdateRequest(BaseModel):
+    """Request schema for incremental model updates"""
+    samples: List[LabeledSample] = Field(..., min_length=1, description="Labeled samples to learn from")
+
+
+class ModelUpdateResponse(BaseModel):
+    """Response schema for incremental model updates"""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    model_type: str = Field(..., description="Type of model updated")
+    previous_version: str = Field(..., description="Version served before the update")
+    version: str = Field(..., description="Version served after the update")
+    samples: int = Field(..., description="Number of samples learned")
+    persisted: bool = Field(..., description="Whether the logged updates were applied and saved as a new version")
+    pending_updates: int = Field(..., description="Updates logged but not yet applied")
+    processing_time_ms: float = Field(..., description="Update time in milliseconds")
+
+
+class ProfilingRequest(BaseModel):
+    """Request schema for switching the profiler on or off"""
+    enabled: bool = Field(..., description="Whether model calls are sampled")
+    sample_rate: Optional[float] = Field(None, ge=0.0, le=1.0, description="Share of model calls profiled")
+
+
+class ProfilingStatus(BaseModel):
+    """Settings and counters of the profiler"""
+    enabled: bool = Field(..., description="Whether model calls are sampled")
+    sample_rate: float = Field(..., description="Share of model calls profiled")
+    calls_seen: int = Field(..., description="Model calls seen while enabled")
+    calls_profiled: int = Field(..., description="Model calls profiled")
+    profiled_ms: float = Field(..., description="Wall time of the profiled calls")
+    stacks: int = Field(..., description="Distinct call stacks collected")
 
 
 class ErrorResponse(BaseModel):
@@ -1,13 +1,20 @@
 """
 Main FastAPI application for ML Classification API
 """
+import asyncio
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
 
-from api.endpoints import router
-from config import API_CONFIG
+from api.endpoints import router, inference_executor, model_manager, training_jobs
+from api.middleware import MetricsMiddleware, RequestLogMiddleware
+from utils.logger import flush_logging, setup_logger
+from utils.metrics import registry
+from config import API_CONFIG, ONLINE_LEARNING_CONFIG
+
+logger = setup_logger()
 
 # Create FastAPI app
 app = FastAPI(
@@ -25,10 +32,70 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request ids and access log records (inside the metrics middleware, so
+# the access records see the model type set by the handlers)
+app.add_middleware(RequestLogMiddleware)
+
+# Request counts and latency histograms for GET /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include API routes
 app.include_router(router, prefix="/api/v1", tags=["classification"])
 
 
+async def flush_due_updates():
+    """Save logged incremental updates once they are due, without waiting for the next update"""
+    while True:
+        await asyncio.sleep(ONLINE_LEARNING_CONFIG["flush_check_seconds"])
+        try:
+            await inference_executor.run(model_manager.persist_updates, None, True)
+        except Exception as e:
+            logger.warning(f"Failed to save logged model updates: {e}")
+
+
+@app.on_event("startup")
+async def start_update_flusher():
+    """Check the update logs in the background (every worker runs one; the log lock serializes them)"""
+    app.state.update_flusher = asyncio.create_task(flush_due_updates())
+
+
+@app.on_event("shutdown")
+async def shutdown_inference_executor():
+    """Let running inference calls finish before the process exits"""
+    inference_executor.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_training_jobs():
+    """Let running training jobs finish and stop their worker pool"""
+    training_jobs.shutdown()
+
+
+@app.on_event("shutdown")
+async def persist_model_updates():
+    """Stop the background flush and save the logged incremental updates"""
+    app.state.update_flusher.cancel()
+    model_manager.persist_updates()
+
+
+@app.on_event("startup")
+async def start_metrics_snapshots():
+    """Share this worker's metrics with the other pre-forked workers' scrapes"""
+    registry.start_snapshots()
+
+
+@app.on_event("shutdown")
+async def write_metrics_snapshot():
+    """Keep this worker's final counts in the merged /metrics after it exits"""
+    registry.write_snapshot()
+
+
+@app.on_event("shutdown")
+async def flush_logs():
+    """Write the queued log records (pre-forked workers exit without atexit hooks)"""
+    flush_logging()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -40,6 +107,12 @@ async def root():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request counters and latency histograms in the Prometheus text format (of every pre-forked worker)"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Custom HTTP exception handler"""
@@ -0,0 +1,87 @@
+"""
+Cold-start benchmark of the joblib and npy model artifact formats
+
+Re-saves a trained model in both formats and measures, in a fresh
+interpreter per run, how long load_model and the first prediction take.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+sys.path.append(str(BASE_DIR))
+
+import config
+from persistence.model_manager import ModelManager
+from models.model_factory import ModelFactory
+
+FORMATS = ["joblib", "npy"]
+
+# Runs in a fresh interpreter; imports are excluded from the measurement
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {base_dir!r})
+from models.model_factory import ModelFactory
+classifier = ModelFactory.create_classifier({model_type!r})
+start = time.perf_counter()
+classifier.load_model({path!r})
+loaded = time.perf_counter()
+classifier.predict("Paciente: Historia Clinica")
+predicted = time.perf_counter()
+print(json.dumps({{"load_ms": (loaded - start) * 1000, "first_predict_ms": (predicted - loaded) * 1000}}))
+"""
+
+
+def measure(model_type: str, path: Path, runs: int):
+    """Run the probe `runs` times and return median load and first-predict times"""
+    loads, predicts = [], []
+    for _ in range(runs):
+        code = PROBE.format(base_dir=str(BASE_DIR), model_type=model_type, path=str(path))
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        loads.append(result["load_ms"])
+        predicts.append(result["first_predict_ms"])
+    return statistics.median(loads), statistics.median(predicts)
+
+
+def directory_size_kb(path: Path) -> float:
+    """Total size of the files in a directory"""
+    return sum(item.stat().st_size for item in path.iterdir() if item.is_file()) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-type", default="svm", help="Saved model to re-save in each format")
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters per format")
+    args = parser.parse_args()
+
+    source = ModelManager().load_model(args.model_type)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in FORMATS:
+            path = Path(tmp) / fmt
+            config.PERSISTENCE_CONFIG["format"] = fmt
+            # Re-save through a fresh instance so the source model stays untouched
+            classifier = ModelFactory.create_classifier(args.model_type)
+            classifier.model, classifier.vectorizer = source.model, source.vectorizer
+            classifier.classes_, classifier.metadata, classifier.is_trained = source.classes_, source.metadata, True
+            classifier.save_model(str(path))
+
+            load_ms, first_predict_ms = measure(args.model_type, path, args.runs)
+            rows.append((fmt, directory_size_kb(path), load_ms, first_predict_ms))
+
+    print(f"\n{'format':<8} {'size KB':>9} {'load ms':>9} {'first predict ms':>17} {'total ms':>9}")
+    print("-" * 56)
+    for fmt, size_kb, load_ms, first_predict_ms in rows:
+        print(f"{fmt:<8} {size_kb:9.0f} {load_ms:9.1f} {first_predict_ms:17.1f} {load_ms + first_predict_ms:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
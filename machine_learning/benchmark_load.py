@@ -0,0 +1,147 @@
+"""
+Load benchmark comparing inline inference with the thread-pool executor
+
+Starts the API once per executor mode, drives /classify with concurrent
+clients while a probe polls /health, and reports p50/p99 latencies.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+BASE_DIR = Path(__file__).parent
+sys.path.append(str(BASE_DIR))
+
+from config import DATASET_PATH
+
+MODES = ["inline", "thread"]
+
+
+def load_texts():
+    """Load classification texts from the dataset"""
+    with open(DATASET_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [item["content"][:10000] for item in data if item.get("content")]
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    """Start uvicorn with the given inference executor mode"""
+    env = dict(os.environ, ML_API_INFERENCE_EXECUTOR=mode)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"],
+        cwd=str(BASE_DIR),
+        env=env
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    """Poll /health until the server answers"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = await client.get("/api/v1/health")
+            if response.status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("API server did not become ready")
+
+
+async def classify_client(client, texts, model_type, stop_at, latencies, errors):
+    """Send /classify requests back to back until the deadline"""
+    rng = random.Random()
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        try:
+            response = await client.post(
+                "/api/v1/classify", json={"text": rng.choice(texts), "model_type": model_type}
+            )
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def health_probe(client, stop_at, latencies, interval: float = 0.05):
+    """Poll /health at a fixed interval until the deadline"""
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        await client.get("/api/v1/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+
+
+async def run_load(port, texts, model_type, concurrency, duration):
+    """Run one load test against a running server"""
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60.0
+    ) as client:
+        await wait_until_ready(client)
+        # Warm up so model loading is not part of the measurement
+        await client.post("/api/v1/classify", json={"text": texts[0], "model_type": model_type})
+
+        classify_latencies, health_latencies, errors = [], [], []
+        stop_at = time.monotonic() + duration
+        await asyncio.gather(
+            health_probe(client, stop_at, health_latencies),
+            *[
+                classify_client(client, texts, model_type, stop_at, classify_latencies, errors)
+                for _ in range(concurrency)
+            ]
+        )
+
+    return classify_latencies, health_latencies, errors
+
+
+def summarize(latencies):
+    """Return (p50, p99) in milliseconds"""
+    if not latencies:
+        return float("nan"), float("nan")
+    return tuple(np.percentile(latencies, [50, 99]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-type", default="svm")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load per mode")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    args = parser.parse_args()
+
+    texts = load_texts()
+    rows = []
+    for mode in args.modes:
+        print(f"Running {args.duration:.0f}s with {args.concurrency} clients, executor={mode}...")
+        server = start_server(mode, args.port)
+        try:
+            classify, health, errors = asyncio.run(
+                run_load(args.port, texts, args.model_type, args.concurrency, args.duration)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        rows.append((mode, len(classify) / args.duration, summarize(classify), summarize(health), len(errors)))
+
+    print(f"\n{'executor':<10} {'req/s':>8} {'classify p50':>13} {'classify p99':>13} "
+          f"{'health p50':>11} {'health p99':>11} {'errors':>7}")
+    print("-" * 80)
+    for mode, rps, (c50, c99), (h50, h99), errors in rows:
+        print(f"{mode:<10} {rps:8.1f} {c50:11.1f}ms {c99:11.1f}ms {h50:9.1f}ms {h99:9.1f}ms {errors:7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compare the speed/accuracy trade-off of every registered model type
+
+For each model in the factory, trains on the data/dataset.json training
+split (vectorized once through the feature store) and reports train
+time, single-text and batch inference latency, model memory and
+accuracy/macro F1 on the held-out split.
+"""
+import argparse
+import pickle
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from sklearn.metrics import f1_score
+
+# Add the current directory to Python path
+sys.path.append(str(Path(__file__).parent))
+
+from data.dataset_loader import DatasetLoader
+from data.feature_store import FeatureStore
+from models.model_factory import ModelFactory
+from config import DATASET_PATH, MODEL_CONFIGS
+
+
+def measure_model(model_type: str, texts, labels, single_runs: int):
+    """Train one model type and collect its statistics"""
+    vectorizer_params = MODEL_CONFIGS.get(model_type, {}).get("vectorizer_params", {})
+    features = FeatureStore().get_or_build(str(DATASET_PATH), vectorizer_params)
+
+    classifier = ModelFactory.create_classifier(model_type)
+    tracemalloc.start()
+    start = time.perf_counter()
+    classifier.train_on_features(features.vectorizer, features.X_train, features.y_train, vectorizer_params)
+    train_ms = (time.perf_counter() - start) * 1000
+    train_peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+
+    model_mb = len(pickle.dumps(classifier.model)) / 1e6
+
+    # Single-text latency (vectorize + score), first call excluded
+    classifier.predict(texts[0])
+    latencies = []
+    for i in range(single_runs):
+        start = time.perf_counter()
+        classifier.predict(texts[i % len(texts)])
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    start = time.perf_counter()
+    predictions = classifier.predict_batch(texts)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    predicted = [prediction["tagClass"] for prediction in predictions]
+    accuracy = sum(p == label for p, label in zip(predicted, labels)) / len(labels)
+    macro_f1 = f1_score(labels, predicted, average="macro", zero_division=0)
+
+    return {
+        "train_ms": train_ms,
+        "train_peak_mb": train_peak_mb,
+        "model_mb": model_mb,
+        "single_p50_ms": statistics.median(latencies),
+        "single_p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "batch_per_item_ms": batch_ms / len(texts),
+        "accuracy": accuracy,
+        "macro_f1": macro_f1
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", nargs="+", default=ModelFactory.get_available_models(), help="Model types")
+    parser.add_argument("--single-runs", type=int, default=200, help="Single-text predictions per model")
+    args = parser.parse_args()
+
+    _, X_test, _, y_test = DatasetLoader(str(DATASET_PATH)).get_train_test_split()
+
+    rows = [(model_type, measure_model(model_type, X_test, y_test, args.single_runs)) for model_type in args.models]
+
+    print(f"\n{'model':<14} {'train ms':>9} {'train peak MB':>14} {'model MB':>9} {'p50 ms':>7} "
+          f"{'p99 ms':>7} {'batch ms/doc':>13} {'accuracy':>9} {'macro F1':>9}")
+    print("-" * 102)
+    for model_type, stats in rows:
+        print(f"{model_type:<14} {stats['train_ms']:9.1f} {stats['train_peak_mb']:14.1f} {stats['model_mb']:9.2f} "
+              f"{stats['single_p50_ms']:7.2f} {stats['single_p99_ms']:7.2f} {stats['batch_per_item_ms']:13.4f} "
+              f"{stats['accuracy']:9.3f} {stats['macro_f1']:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark per-text prediction against vectorized batch prediction
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the current directory to Python path
+sys.path.append(str(Path(__file__).parent))
+
+from data.dataset_loader import DatasetLoader
+from persistence.model_manager import ModelManager
+from config import DATASET_PATH
+
+BATCH_SIZES = [1, 32, 1000, 10000]
+
+
+def make_corpus(texts, size, seed=42):
+    """Sample `size` documents (with replacement) from the dataset texts"""
+    rng = random.Random(seed)
+    return [rng.choice(texts) for _ in range(size)]
+
+
+def time_call(func, repeat):
+    """Return the best wall-clock time in seconds over `repeat` runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(model_type: str, batch_sizes, loop_limit: int):
+    """Print throughput of the per-text loop and the batched path"""
+    classifier = ModelManager().load_model(model_type)
+    texts, _ = DatasetLoader(str(DATASET_PATH)).get_texts_and_labels()
+
+    print(f"\n{'batch':>8} {'loop docs/s':>14} {'batch docs/s':>14} {'speedup':>9}")
+    print("-" * 48)
+    for size in batch_sizes:
+        corpus = make_corpus(texts, size)
+        repeat = max(2, min(200, 1000 // size))
+
+        batch_time = time_call(lambda: classifier.predict_batch(corpus), repeat)
+        batch_rate = size / batch_time
+
+        if size <= loop_limit:
+            loop_time = time_call(lambda: [classifier.predict(text) for text in corpus], repeat)
+            loop_rate = size / loop_time
+            speedup = f"{loop_time / batch_time:8.1f}x"
+            loop_column = f"{loop_rate:14.0f}"
+        else:
+            # The per-text loop gets prohibitively slow for the largest batches
+            speedup = f"{'-':>9}"
+            loop_column = f"{'skipped':>14}"
+
+        print(f"{size:>8} {loop_column} {batch_rate:14.0f} {speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-type", default="svm", help="Saved model to benchmark")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument(
+        "--loop-limit", type=int, default=10000,
+        help="Largest batch size for which the per-text loop is also timed"
+    )
+    args = parser.parse_args()
+
+    run_benchmark(args.model_type, args.batch_sizes, args.loop_limit)
+
+
+if __name__ == "__main__":
+    main()
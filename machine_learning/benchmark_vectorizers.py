@@ -0,0 +1,82 @@
+"""
+Compare the TF-IDF vocabulary vectorizer with the hashed-feature backend
+
+Reports test accuracy, saved artifact size, load time and transform
+throughput of an SVM trained on data/dataset.json with each backend.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+
+# Add the current directory to Python path
+sys.path.append(str(Path(__file__).parent))
+
+from data.dataset_loader import DatasetLoader
+from models.model_factory import ModelFactory
+from config import DATASET_PATH, MODEL_CONFIGS
+
+
+def measure_backend(vectorizer_params, X_train, X_test, y_train, y_test, workdir: Path):
+    """Train an SVM with the given vectorizer and collect its statistics"""
+    classifier = ModelFactory.create_classifier("svm")
+    classifier.train(X_train, y_train, vectorizer_params)
+
+    predictions = classifier.predict_batch(X_test)
+    accuracy = sum(p["tagClass"] == label for p, label in zip(predictions, y_test)) / len(y_test)
+
+    # Same on-disk format as SVMClassifier.save_model
+    vectorizer_path = workdir / "vectorizer.pkl"
+    model_path = workdir / "model.pkl"
+    joblib.dump(classifier.vectorizer, vectorizer_path, compress=True)
+    joblib.dump(classifier.model, model_path, compress=True)
+    size_kb = (vectorizer_path.stat().st_size + model_path.stat().st_size) / 1024
+
+    load_times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        joblib.load(vectorizer_path)
+        joblib.load(model_path)
+        load_times.append(time.perf_counter() - start)
+
+    corpus = (X_train + X_test) * 3
+    start = time.perf_counter()
+    classifier.vectorizer.transform(corpus)
+    throughput = len(corpus) / (time.perf_counter() - start)
+
+    return accuracy, size_kb, min(load_times) * 1000, throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--n-features", type=int, nargs="+", default=[2 ** 16, 2 ** 18, 2 ** 20],
+        help="Hashed feature space sizes to compare"
+    )
+    args = parser.parse_args()
+
+    loader = DatasetLoader(str(DATASET_PATH))
+    X_train, X_test, y_train, y_test = loader.get_train_test_split()
+
+    base_params = dict(MODEL_CONFIGS["svm"]["vectorizer_params"])
+    candidates = [("tfidf", dict(base_params, backend="tfidf"))]
+    for n_features in args.n_features:
+        candidates.append((f"hashing 2^{n_features.bit_length() - 1}",
+                           dict(base_params, backend="hashing", n_features=n_features)))
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, params in candidates:
+            rows.append((name,) + measure_backend(params, X_train, X_test, y_train, y_test, Path(tmp)))
+
+    print(f"\n{'backend':<14} {'accuracy':>9} {'size KB':>9} {'load ms':>9} {'transform docs/s':>17}")
+    print("-" * 62)
+    for name, accuracy, size_kb, load_ms, throughput in rows:
+        print(f"{name:<14} {accuracy:9.3f} {size_kb:9.0f} {load_ms:9.1f} {throughput:17.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Shared fixtures and the regression gate of the benchmark suite
+
+Everything runs on a synthetic corpus (see corpus.py) so the timings do
+not depend on the contents of data/dataset.json or saved_models/.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make the machine_learning modules importable as in the scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pytest_benchmark.utils import get_machine_id, parse_compare_fail
+
+from corpus import make_corpus, write_dataset
+from config import BENCHMARK_CONFIG
+from models.svm_classifier import SVMClassifier
+from persistence.model_manager import ModelManager
+
+DEFAULT_STORAGE = "file://./.benchmarks"
+
+# Baseline directory of this machine when it holds no baseline (the gate is off)
+_missing_baseline = None
+
+TRAIN_DOCS = 2000
+QUERY_DOCS = 2000
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """
+    Store runs in BENCHMARK_CONFIG["baselines_dir"] and gate on the baseline
+
+    Runs before pytest-benchmark reads its options. Unless --benchmark-compare
+    or a save option is given, the run is compared with the latest baseline
+    saved for this machine and fails when a benchmark regressed beyond
+    BENCHMARK_CONFIG["regression_threshold"].
+
+    Without a baseline the run fails when --benchmark-compare-fail was given
+    or BENCHMARK_CONFIG["require_baseline"] is set, and otherwise ends with
+    a warning that nothing was checked.
+    """
+    global _missing_baseline
+    option = config.option
+    if option.benchmark_storage == DEFAULT_STORAGE:
+        option.benchmark_storage = f"file://{BENCHMARK_CONFIG['baselines_dir']}"
+
+    saving = option.benchmark_save or option.benchmark_autosave
+    if not option.benchmark_compare and not saving:
+        machine_dir = BENCHMARK_CONFIG["baselines_dir"] / get_machine_id()
+        baselines = sorted(machine_dir.glob(f"[0-9][0-9][0-9][0-9]_{BENCHMARK_CONFIG['baseline_name']}.json"))
+        if baselines:
+            option.benchmark_compare = str(baselines[-1])
+        elif option.benchmark_compare_fail or BENCHMARK_CONFIG["require_baseline"]:
+            raise pytest.UsageError(
+                f"No benchmark baseline in {machine_dir}, so regressions cannot be checked. "
+                f"Record one with: python -m pytest benchmarks --benchmark-save={BENCHMARK_CONFIG['baseline_name']}"
+            )
+        else:
+            _missing_baseline = machine_dir
+
+    if option.benchmark_compare and not option.benchmark_compare_fail:
+        option.benchmark_compare_fail = [parse_compare_fail(BENCHMARK_CONFIG["regression_threshold"])]
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_terminal_summary(terminalreporter):
+    """Warn at the end of the run when no regression check took place"""
+    if _missing_baseline is not None:
+        terminalreporter.section("benchmark regression gate", sep="!", red=True, bold=True)
+        terminalreporter.write_line(
+            f"NOT CHECKED: no baseline in {_missing_baseline}. Record one with "
+            f"--benchmark-save={BENCHMARK_CONFIG['baseline_name']}, and set "
+            f"ML_BENCHMARK_REQUIRE_BASELINE=1 in CI to fail instead of warning.",
+            red=True, bold=True
+        )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_logs(tmp_path_factory):
+    """Send the app's log files to a temporary directory instead of logs/"""
+    import utils.logger
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(utils.logger, "LOGS_DIR", tmp_path_factory.mktemp("logs"))
+        yield
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    """Labelled training documents"""
+    return make_corpus(TRAIN_DOCS)
+
+
+@pytest.fixture(scope="session")
+def queries():
+    """Unlabelled documents to classify, drawn with a different seed than the training set"""
+    texts, _ = make_corpus(QUERY_DOCS, seed=7)
+    return texts
+
+
+@pytest.fixture(scope="session")
+def trained_svm(corpus):
+    """SVM classifier trained on the corpus"""
+    texts, labels = corpus
+    classifier = SVMClassifier()
+    classifier.train(texts, labels)
+    return classifier
+
+
+@pytest.fixture(scope="session")
+def dataset_file(tmp_path_factory, corpus):
+    """The corpus written in the data/dataset.json format"""
+    texts, labels = corpus
+    return write_dataset(tmp_path_factory.mktemp("data") / "dataset.json", texts, labels)
+
+
+@pytest.fixture(scope="session")
+def model_manager(tmp_path_factory, trained_svm):
+    """ModelManager on a temporary models directory serving the trained SVM"""
+    manager = ModelManager(models_dir=str(tmp_path_factory.mktemp("saved_models")))
+    manager.save_model(trained_svm, "svm")
+    return manager
+
+
+@pytest.fixture(scope="session")
+def api_client(model_manager):
+    """In-process client of the FastAPI app, serving the benchmark model"""
+    from fastapi.testclient import TestClient
+    from api import endpoints
+    from app import app
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(endpoints, "model_manager", model_manager)
+        with TestClient(app) as client:
+            yield client
@@ -0,0 +1,110 @@
+"""
+Synthetic corpus generator for the benchmark suite
+
+The documents follow the shape of data/dataset.json: a few imbalanced
+report classes, a median of ~80 tokens per document with a long tail, a
+Zipf-distributed shared vocabulary and a smaller set of words typical of
+each class. Records without "content" are included as in the real file.
+The output only depends on the seed, so timings stay comparable between
+runs and machines.
+"""
+import itertools
+import json
+import random
+from pathlib import Path
+from typing import List, Tuple
+
+SYLLABLES = [
+    "ca", "co", "cu", "da", "de", "di", "do", "la", "le", "li", "lo", "ma", "me", "mi", "mo",
+    "na", "ne", "ni", "no", "pa", "pe", "pi", "po", "ra", "re", "ri", "ro", "sa", "se", "si",
+    "so", "ta", "te", "ti", "to", "tra", "tro", "cion", "dad", "gra", "gia", "tal", "nal", "ria"
+]
+
+# Class labels and their share of the documents (close to data/dataset.json)
+CLASS_WEIGHTS = {
+    "indicacion": 0.70,
+    "historia": 0.14,
+    "tomografia": 0.04,
+    "laboratorio": 0.04,
+    "sonografia": 0.04,
+    "resonancia": 0.02,
+    "radiografia": 0.02
+}
+
+
+def make_vocabulary(size: int, rng: random.Random) -> List[str]:
+    """Distinct pseudo-words of two to four syllables"""
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_corpus(
+    n_docs: int,
+    vocabulary_size: int = 5000,
+    class_vocabulary_size: int = 60,
+    class_word_share: float = 0.15,
+    median_length: int = 80,
+    seed: int = 42
+) -> Tuple[List[str], List[str]]:
+    """
+    Generate labelled documents
+
+    Args:
+        n_docs: Number of documents
+        vocabulary_size: Words shared by every class (Zipf-distributed)
+        class_vocabulary_size: Words typical of each class
+        class_word_share: Share of a document's tokens drawn from its class words
+        median_length: Median number of tokens per document (log-normal lengths)
+        seed: Random seed
+
+    Returns:
+        Tuple of (texts, labels)
+    """
+    rng = random.Random(seed)
+    words = make_vocabulary(vocabulary_size + class_vocabulary_size * len(CLASS_WEIGHTS), rng)
+    rng.shuffle(words)
+    shared, class_words = words[:vocabulary_size], words[vocabulary_size:]
+    topics = {
+        label: class_words[i * class_vocabulary_size:(i + 1) * class_vocabulary_size]
+        for i, label in enumerate(CLASS_WEIGHTS)
+    }
+    shared_cum_weights = list(itertools.accumulate(1.0 / rank for rank in range(1, vocabulary_size + 1)))
+
+    labels = rng.choices(list(CLASS_WEIGHTS), weights=list(CLASS_WEIGHTS.values()), k=n_docs)
+    texts = []
+    for label in labels:
+        length = max(5, min(600, int(rng.lognormvariate(0, 0.8) * median_length)))
+        n_topic = sum(rng.random() < class_word_share for _ in range(length))
+        tokens = rng.choices(shared, cum_weights=shared_cum_weights, k=length - n_topic)
+        tokens += rng.choices(topics[label], k=n_topic)
+        rng.shuffle(tokens)
+        texts.append(" ".join(tokens))
+    return texts, labels
+
+
+def write_dataset(path: Path, texts: List[str], labels: List[str], missing_content_every: int = 50) -> Path:
+    """
+    Write documents in the data/dataset.json format
+
+    Args:
+        path: Output file
+        texts: Document texts
+        labels: Document labels
+        missing_content_every: Every n-th record is written without "content"
+
+    Returns:
+        The output path
+    """
+    records = []
+    for i, (text, label) in enumerate(zip(texts, labels)):
+        record = {"id": f"bench-{i:06d}", "content": text, "tag": label}
+        if missing_content_every and i % missing_content_every == missing_content_every - 1:
+            del record["content"]
+        records.append(record)
+
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=4, ensure_ascii=False)
+    return path
@@ -0,0 +1,34 @@
+"""
+Benchmarks of the classification routes through an in-process TestClient
+
+Requests are sent one at a time, so every single-text /classify includes
+the micro-batcher's flush delay (MICRO_BATCH_CONFIG["max_latency_ms"]).
+"""
+import itertools
+
+
+def test_classify(benchmark, monkeypatch, api_client, model_manager, queries):
+    """POST /classify with the prediction cache disabled"""
+    monkeypatch.setattr(model_manager.prediction_cache, "enabled", False)
+    texts = itertools.cycle(queries)
+
+    response = benchmark(lambda: api_client.post("/api/v1/classify", json={"text": next(texts)}))
+    assert response.status_code == 200
+
+
+def test_classify_cached(benchmark, api_client, queries):
+    """POST /classify answered from the prediction cache"""
+    payload = {"text": queries[0]}
+    api_client.post("/api/v1/classify", json=payload)
+
+    response = benchmark(lambda: api_client.post("/api/v1/classify", json=payload))
+    assert response.status_code == 200
+
+
+def test_classify_batch(benchmark, monkeypatch, api_client, model_manager, queries):
+    """POST /classify/batch with 64 texts and the prediction cache disabled"""
+    monkeypatch.setattr(model_manager.prediction_cache, "enabled", False)
+    payload = {"items": [{"text": text} for text in queries[:64]]}
+
+    response = benchmark(lambda: api_client.post("/api/v1/classify/batch", json=payload))
+    assert response.status_code == 200
@@ -0,0 +1,42 @@
+"""
+Benchmarks of training and inference on BaseClassifier (through SVMClassifier)
+"""
+import pytest
+
+from models.svm_classifier import SVMClassifier
+
+BATCH_SIZES = [1, 64, 1000]
+
+
+def test_train(benchmark, corpus):
+    """Vectorizer fit, SGD fit and calibration on out-of-fold scores"""
+    texts, labels = corpus
+
+    def train():
+        classifier = SVMClassifier()
+        classifier.train(texts, labels)
+        return classifier
+
+    classifier = benchmark.pedantic(train, rounds=3, iterations=1)
+    assert classifier.is_trained
+
+
+def test_predict(benchmark, trained_svm, queries):
+    """Single-text prediction"""
+    result = benchmark(trained_svm.predict, queries[0])
+    assert "tagClass" in result
+
+
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_predict_batch(benchmark, trained_svm, queries, batch_size):
+    """Vectorized prediction of a batch of texts"""
+    texts = queries[:batch_size]
+    results = benchmark(trained_svm.predict_batch, texts)
+    assert len(results) == batch_size
+
+
+def test_predict_batch_top_k(benchmark, trained_svm, queries):
+    """Batch prediction ranking five candidate classes per text"""
+    texts = queries[:1000]
+    results = benchmark(trained_svm.predict_batch, texts, 5)
+    assert len(results[0]["candidates"]) == 5
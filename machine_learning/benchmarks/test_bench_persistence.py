@@ -0,0 +1,41 @@
+"""
+Benchmarks of model persistence and dataset loading
+"""
+import pytest
+
+from config import PERSISTENCE_CONFIG
+from data.dataset_loader import DatasetLoader
+from models.svm_classifier import SVMClassifier
+
+FORMATS = ["joblib", "npy"]
+
+
+@pytest.mark.parametrize("model_format", FORMATS)
+def test_save_model(benchmark, monkeypatch, tmp_path, trained_svm, model_format):
+    """SVMClassifier.save_model in each artifact format"""
+    monkeypatch.setitem(PERSISTENCE_CONFIG, "format", model_format)
+    path = tmp_path / "svm"
+    benchmark(trained_svm.save_model, str(path))
+    assert (path / "metadata.json").exists()
+
+
+@pytest.mark.parametrize("model_format", FORMATS)
+def test_load_model(benchmark, monkeypatch, tmp_path, trained_svm, model_format):
+    """SVMClassifier.load_model (cold start of one model) in each artifact format"""
+    monkeypatch.setitem(PERSISTENCE_CONFIG, "format", model_format)
+    path = tmp_path / "svm"
+    trained_svm.save_model(str(path))
+
+    def load():
+        classifier = SVMClassifier()
+        classifier.load_model(str(path))
+        return classifier
+
+    classifier = benchmark(load)
+    assert classifier.is_trained
+
+
+def test_load_dataset(benchmark, dataset_file, corpus):
+    """DatasetLoader.load_dataset on the synthetic corpus"""
+    df = benchmark(lambda: DatasetLoader(str(dataset_file)).load_dataset())
+    assert len(df) == len(corpus[0])
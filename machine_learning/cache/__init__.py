@@ -0,0 +1,13 @@
+"""
+Prediction caching for ML Classification API
+"""
+from .backends import CacheBackend, MemoryCacheBackend, RedisCacheBackend, create_cache_backend
+from .prediction_cache import PredictionCache
+
+__all__ = [
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "create_cache_backend",
+    "PredictionCache"
+]
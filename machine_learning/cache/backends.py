@@ -0,0 +1,214 @@
+"""
+Storage backends for the prediction cache
+"""
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """
+    Key/value storage used by PredictionCache
+    """
+
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Return the stored value of every key, None where missing"""
+        pass
+
+    @abstractmethod
+    def set_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        """Store several values"""
+        pass
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every key starting with prefix and return how many were deleted"""
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get backend-specific counters"""
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU storage with optional TTL
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            max_size: Maximum number of stored values
+            ttl_seconds: Lifetime of an entry (None keeps entries until evicted)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_many(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] < now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+
+                if entry is None:
+                    values.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    values.append(entry[1])
+        return values
+
+    def set_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else float("inf")
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._lock:
+            if not prefix:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+
+            stale = [key for key in self._entries if key.startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis storage shared between API replicas
+
+    Lookups for a whole batch are a single MGET and stores are one
+    pipelined round trip of SET ... EX commands. Entries are never
+    deleted explicitly: keys are versioned and expire through the TTL.
+    Any client with the redis-py interface works, including fakeredis
+    for local runs.
+    Redis errors are counted and treated as cache misses so an outage
+    never fails a classification.
+    """
+
+    def __init__(self, client, ttl_seconds: Optional[float] = None, namespace: str = "ml_api:prediction:"):
+        """
+        Args:
+            client: redis.Redis (or compatible) client
+            ttl_seconds: Expiry of stored values (None lets Redis evict them)
+            namespace: Prefix added to every key
+        """
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self.errors = 0
+
+    @classmethod
+    def from_url(cls, url: str, timeout_seconds: float = 0.25, **kwargs) -> "RedisCacheBackend":
+        """
+        Create a backend connected to a Redis URL
+
+        Args:
+            url: Redis connection URL
+            timeout_seconds: Connect and socket timeout, kept short so a slow
+                Redis degrades to cache misses instead of slow requests
+            **kwargs: Passed to the backend constructor
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("The redis cache backend requires the 'redis' package: pip install redis") from e
+
+        client = redis.Redis.from_url(
+            url, socket_timeout=timeout_seconds, socket_connect_timeout=timeout_seconds
+        )
+        return cls(client, **kwargs)
+
+    def get_many(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        if not keys:
+            return []
+        try:
+            raw_values = self.client.mget([self.namespace + key for key in keys])
+            return [json.loads(raw) if raw is not None else None for raw in raw_values]
+        except Exception:
+            self.errors += 1
+            return [None] * len(keys)
+
+    def set_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        if not items:
+            return
+        # EX takes whole seconds and rejects 0
+        expiry = max(1, int(self.ttl_seconds)) if self.ttl_seconds else None
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipeline.set(self.namespace + key, json.dumps(value, ensure_ascii=False), ex=expiry)
+            pipeline.execute()
+        except Exception:
+            self.errors += 1
+
+    def delete_prefix(self, prefix: str) -> int:
+        # Keys include the model version, so results of a replaced model are
+        # never looked up again and expire through their TTL. Scanning the
+        # keyspace would block Redis for every replica on each model change.
+        return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis",
+            "ttl_seconds": self.ttl_seconds,
+            "errors": self.errors
+        }
+
+
+def create_cache_backend(cache_config: Dict[str, Any]) -> CacheBackend:
+    """
+    Create the backend selected by CACHE_CONFIG["backend"]
+
+    Args:
+        cache_config: Cache configuration dictionary
+
+    Returns:
+        Cache backend instance
+
+    Raises:
+        ValueError: If the backend is not supported
+    """
+    backend = cache_config.get("backend", "memory")
+    if backend == "memory":
+        return MemoryCacheBackend(
+            max_size=cache_config["max_size"],
+            ttl_seconds=cache_config["ttl_seconds"]
+        )
+    if backend == "redis":
+        return RedisCacheBackend.from_url(
+            cache_config["redis_url"],
+            timeout_seconds=cache_config.get("redis_timeout_seconds", 0.25),
+            ttl_seconds=cache_config["ttl_seconds"]
+        )
+    raise ValueError(f"Unsupported cache backend: {backend}. Available backends: ['memory', 'redis']")
@@ -0,0 +1,122 @@
+"""
+Cache of classification results keyed by model version and text
+"""
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from .backends import CacheBackend, MemoryCacheBackend
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize a text for cache lookups
+
+    Case and runs of whitespace do not change the features produced by the
+    (lowercasing, token-based) vectorizers, so retries that only differ in
+    OCR spacing or casing share a cache entry.
+    """
+    return " ".join(text.lower().split())
+
+
+class PredictionCache:
+    """
+    Cache of prediction results in front of a pluggable storage backend
+
+    Keys combine the model type, the model version, the number of ranked
+    candidates and a hash of the normalized text, so a retrained model
+    never serves stale labels. The storage defaults to an in-process LRU;
+    a Redis backend shares results between API replicas.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, enabled: bool = True):
+        """
+        Initialize the cache
+
+        Args:
+            backend: Storage backend (defaults to an in-memory LRU)
+            enabled: When False every lookup misses and nothing is stored
+        """
+        self.backend = backend or MemoryCacheBackend()
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_type: str, version: str, text: str, top_k: int = 1) -> str:
+        """Build the cache key of a text for a given model version and top_k"""
+        digest = hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).hexdigest()
+        return f"{model_type}:{version}:{top_k}:{digest}"
+
+    def get_many(
+        self, model_type: str, version: str, texts: List[str], count_misses: bool = True, top_k: int = 1
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up cached results
+
+        Args:
+            model_type: Type of model
+            version: Version of the loaded model
+            texts: Texts to look up
+            count_misses: Whether misses are counted; fast-path lookups that
+                fall through to a counted lookup pass False
+            top_k: Number of ranked candidates of the results
+
+        Returns:
+            One cached result per text, None where the lookup missed
+        """
+        if not self.enabled:
+            return [None] * len(texts)
+
+        results = self.backend.get_many([self.make_key(model_type, version, text, top_k) for text in texts])
+        found = sum(result is not None for result in results)
+        self.hits += found
+        if count_misses:
+            self.misses += len(results) - found
+        return results
+
+    def put_many(
+        self, model_type: str, version: str, texts: List[str], results: List[Dict[str, Any]], top_k: int = 1
+    ) -> None:
+        """
+        Store results
+
+        Args:
+            model_type: Type of model
+            version: Version of the model that produced the results
+            texts: Classified texts
+            results: Prediction result per text
+            top_k: Number of ranked candidates of the results
+        """
+        if not self.enabled:
+            return
+
+        self.backend.set_many({
+            self.make_key(model_type, version, text, top_k): result
+            for text, result in zip(texts, results)
+        })
+
+    def invalidate(self, model_type: Optional[str] = None) -> int:
+        """
+        Drop cached results
+
+        The Redis backend leaves shared entries to expire through their
+        TTL; keys are versioned, so they are never served after a swap.
+
+        Args:
+            model_type: Only drop results of this model type (None drops everything)
+
+        Returns:
+            Number of dropped entries
+        """
+        return self.backend.delete_prefix(f"{model_type}:" if model_type else "")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            **self.backend.get_stats()
+        }
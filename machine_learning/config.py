@@ -27,6 +27,9 @@ MODEL_CONFIGS = {
             "random_state": 42
         },
         "vectorizer_params": {
+            # "tfidf" keeps a vocabulary dict; "hashing" stores only an IDF
+            # array of n_features floats (set "n_features" to size it)
+            "backend": "tfidf",
             "ngram_range": (1, 2),
             "min_df": 2,
             "max_df": 0.9
@@ -40,6 +43,34 @@ MODEL_CONFIGS = {
             "class_weight": "balanced"
         },
         "vectorizer_params": {
+            "backend": "tfidf",
+            "ngram_range": (1, 2),
+            "min_df": 2,
+            "max_df": 0.9
+        }
+    },
+    "random_forest": {
+        "class": "RandomForestClassifier",
+        "params": {
+            "n_estimators": 200,
+            "class_weight": "balanced",
+            "n_jobs": -1,  # fit the final forest on all cores (folds, calibration and serving use one)
+            "random_state": 42
+        },
+        "vectorizer_params": {
+            "backend": "tfidf",
+            "ngram_range": (1, 2),
+            "min_df": 2,
+            "max_df": 0.9
+        }
+    },
+    "complement_nb": {
+        "class": "ComplementNBClassifier",
+        "params": {
+            "alpha": 0.3
+        },
+        "vectorizer_params": {
+            "backend": "tfidf",
             "ngram_range": (1, 2),
             "min_df": 2,
             "max_df": 0.9
@@ -53,12 +84,173 @@ API_CONFIG = {
     "description": "Multi-model text classification API for ARS Primera documents",
     "version": "1.0.0",
     "host": "0.0.0.0",
-    "port": 8000
+    "port": 8000,
+    # Limits for POST /classify/batch
+    "max_batch_size": 1000,
+    "max_batch_chars": 2_000_000
+}
+
+# Execution of CPU-bound inference outside the event loop
+INFERENCE_CONFIG = {
+    "executor": os.getenv("ML_API_INFERENCE_EXECUTOR", "thread"),  # "thread" or "inline"
+    "max_workers": int(os.getenv("ML_API_INFERENCE_WORKERS", min(4, os.cpu_count() or 1)))
+}
+
+# Micro-batching of concurrent single-text /classify requests
+MICRO_BATCH_CONFIG = {
+    "enabled": True,
+    "max_batch_size": 64,  # flush as soon as this many texts are queued
+    "max_latency_ms": 5.0  # flush at the latest this long after the first text
+}
+
+# Multi-model inference through POST /classify/ensemble
+ENSEMBLE_CONFIG = {
+    "model_types": None,  # models combined when a request names none (None: every available model)
+    "method": "average",  # "average" (weighted score averaging) or "vote" (weighted voting)
+    "weights": {}  # default weight per model type (1.0 when missing)
+}
+
+# Cache of prediction results (keyed by model version and text hash)
+CACHE_CONFIG = {
+    "enabled": True,
+    "backend": os.getenv("ML_API_CACHE_BACKEND", "memory"),  # "memory" or "redis"
+    "redis_url": os.getenv("ML_API_REDIS_URL", "redis://localhost:6379/0"),
+    "redis_timeout_seconds": 0.25,
+    "max_size": 10000,  # memory backend only
+    "ttl_seconds": 3600  # None keeps entries until they are evicted
+}
+
+# Prometheus metrics served at GET /metrics
+METRICS_CONFIG = {
+    "enabled": os.getenv("ML_API_METRICS", "1") != "0",
+    # Histogram bucket upper bounds in seconds
+    "latency_buckets": (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    # Pre-forked workers write their snapshots here; a scrape merges them
+    "multiprocess_dir": LOGS_DIR / "metrics",
+    "snapshot_seconds": 1.0  # age of another worker's values at most
+}
+
+# Sampling profiler of model calls, exported at GET /api/v1/debug/profile
+PROFILING_CONFIG = {
+    "enabled": os.getenv("ML_API_PROFILE", "0") == "1",  # also switchable through POST /debug/profile
+    "sample_rate": float(os.getenv("ML_API_PROFILE_RATE", 0.1)),  # share of model calls profiled
+    "max_stacks": 10000  # distinct call stacks kept
+}
+
+# Logging (records are queued and written by a background thread)
+LOGGING_CONFIG = {
+    "level": os.getenv("ML_API_LOG_LEVEL", "INFO"),
+    "json": os.getenv("ML_API_LOG_JSON", "1") != "0",  # JSON lines, or the plain text format
+    "file": "api.log",  # in LOGS_DIR
+    "rotation": os.getenv("ML_API_LOG_ROTATION", "size"),  # "size" or "time"
+    "max_bytes": 10 * 1024 * 1024,  # size rotation threshold
+    "when": "midnight",  # time rotation interval (TimedRotatingFileHandler `when`)
+    "backup_count": 5,
+    "queue_size": 10000,  # records beyond this are dropped rather than blocking the caller
+    "info_sample_rate": float(os.getenv("ML_API_LOG_SAMPLE_RATE", 1.0))  # share of DEBUG/INFO records kept
+}
+
+# Regression gate of the benchmark suite (python -m pytest benchmarks)
+BENCHMARK_CONFIG = {
+    "baselines_dir": BASE_DIR / "benchmarks" / "baselines",  # pytest-benchmark JSON runs, per machine
+    "baseline_name": "baseline",  # runs saved with --benchmark-save=baseline are compared against
+    # --benchmark-compare-fail expression; a benchmark slower than this fails the run
+    "regression_threshold": os.getenv("ML_BENCHMARK_THRESHOLD", "median:25%"),
+    # Fail instead of warning when this machine has no baseline (set it in CI)
+    "require_baseline": os.getenv("ML_BENCHMARK_REQUIRE_BASELINE", "0") == "1"
+}
+
+# Versioned model storage (saved_models/<type>/versions/<version>)
+MODEL_VERSIONING = {
+    "keep_versions": 3,  # previous versions kept for rollback
+    # How often a process checks CURRENT for a version activated by another one
+    "pointer_check_seconds": 1.0
+}
+
+# Hyperparameter search spaces for tune_model.py (model_params override the
+# classifier defaults, vectorizer_params override MODEL_CONFIGS)
+TUNING_CONFIG = {
+    "svm": {
+        "model_params": {
+            "alpha": [1e-5, 1e-4, 1e-3],
+            "loss": ["hinge", "modified_huber", "log_loss"],
+            "class_weight": ["balanced", None]
+        },
+        "vectorizer_params": {
+            "ngram_range": [(1, 1), (1, 2)],
+            "min_df": [1, 2, 3],
+            "max_df": [0.9, 1.0]
+        }
+    },
+    "decision_tree": {
+        "model_params": {
+            "max_depth": [5, 10, 20, None],
+            "min_samples_leaf": [1, 2, 5]
+        }
+    },
+    "random_forest": {
+        "model_params": {
+            "n_estimators": [100, 200, 400],
+            "max_depth": [None, 20],
+            "n_jobs": [1]  # trials already run in parallel
+        }
+    },
+    "complement_nb": {
+        "model_params": {
+            "alpha": [0.01, 0.1, 0.3, 1.0]
+        },
+        "vectorizer_params": {
+            "ngram_range": [(1, 1), (1, 2)],
+            "min_df": [1, 2, 3]
+        }
+    }
+}
+
+# Cross-validation run with every training (stored in the model metadata)
+EVALUATION_CONFIG = {
+    "enabled": True,
+    "n_splits": 5,
+    "n_jobs": min(5, os.cpu_count() or 1)  # folds trained in parallel processes
+}
+
+# Probability calibration fitted at training time on out-of-fold scores
+CALIBRATION_CONFIG = {
+    "method": "sigmoid",  # "sigmoid" (Platt scaling), "isotonic" or None to disable
+    "cv": 3  # folds producing the held-out scores
+}
+
+# Cache of vectorized train/test splits, keyed by dataset hash + vectorizer_params
+FEATURE_STORE_CONFIG = {
+    "enabled": True,
+    "dir": BASE_DIR / "feature_store",
+    "max_entries": 4  # least recently used feature sets beyond this are deleted
+}
+
+# Out-of-core training (train_model.py --stream)
+STREAMING_CONFIG = {
+    "chunk_size": 1000,  # samples in memory at a time
+    "epochs": 5  # partial_fit passes over the data
+}
+
+# Background training jobs (POST /train)
+TRAINING_CONFIG = {
+    "executor": os.getenv("ML_API_TRAINING_EXECUTOR", "process"),  # "process" or "thread"
+    "max_concurrent_jobs": int(os.getenv("ML_API_TRAINING_JOBS", 2)),  # across all API workers
+    "history_size": 100  # finished jobs kept for polling
+}
+
+# Incremental updates through POST /models/{type}/update
+ONLINE_LEARNING_CONFIG = {
+    "max_samples": 1000,  # per update request
+    # Updates are served at once and saved as one new version after this many...
+    "persist_every_updates": 20,
+    "persist_every_seconds": 300,  # ...or when the oldest unsaved update is this old
+    "flush_check_seconds": 5  # how often the API checks for updates due to be saved
 }
 
 # Model persistence settings
 PERSISTENCE_CONFIG = {
-    "format": "joblib",  # or "pickle"
+    "format": os.getenv("ML_API_MODEL_FORMAT", "joblib"),  # "joblib" pickles or "npy" memory-mapped arrays
     "compress": True,
     "include_metadata": True
 }
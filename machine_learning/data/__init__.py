@@ -2,5 +2,6 @@
 Data package for ML Classification API
 """
 from .dataset_loader import DatasetLoader
+from .feature_store import FeatureSet, FeatureStore
 
-__all__ = ["DatasetLoader"]
+__all__ = ["DatasetLoader", "FeatureSet", "FeatureStore"]
@@ -4,9 +4,90 @@ Dataset loading and preprocessing utilities
 import json
 import pandas as pd
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterator
 from sklearn.model_selection import train_test_split
 
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+READ_BLOCK_SIZE = 1 << 20  # characters read at a time when streaming a JSON array
+
+
+def iter_json_array(f, block_size: int = READ_BLOCK_SIZE) -> Iterator[Any]:
+    """
+    Incrementally parse a top-level JSON array, yielding one element at a time
+    
+    Only the element being decoded (plus one read block) is held in memory,
+    unlike json.load which materializes the whole array. The array syntax
+    is as strict as json.load's: elements are separated by exactly one
+    comma and a trailing comma is an error.
+    
+    Args:
+        f: Text file object positioned before the opening bracket
+        block_size: Number of characters read per block
+        
+    Raises:
+        ValueError: If the file is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    # What comes next: "open" the bracket, "first" an element or "]",
+    # "element" an element (after a comma), "separator" a comma or "]"
+    expected = "open"
+    
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n":
+            position += 1
+        
+        if position < len(buffer):
+            char = buffer[position]
+            if expected == "open":
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                expected = "first"
+                position += 1
+                continue
+            
+            if char == "]" and expected != "element":
+                return
+            
+            if expected == "separator":
+                if char != ",":
+                    raise ValueError("Expected ',' or ']' after a JSON array element")
+                expected = "element"
+                position += 1
+                continue
+            
+            if char in ",]":
+                raise ValueError(
+                    "Trailing comma in JSON array" if char == "]" else "Missing JSON array element before ','"
+                )
+            
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # Accept the value only once a delimiter follows it; a number
+                # cut at the end of a block may continue in the next one
+                if end < len(buffer) and buffer[end] in " \t\r\n,]":
+                    yield item
+                    position = end
+                    expected = "separator"
+                    continue
+                if eof:
+                    raise ValueError(
+                        "Unexpected end of file while reading JSON array" if end == len(buffer)
+                        else "Invalid JSON array element"
+                    )
+        elif eof:
+            raise ValueError("Unexpected end of file while reading JSON array")
+        
+        # Drop the consumed part of the buffer and read the next block
+        block = f.read(block_size)
+        eof = not block
+        buffer = buffer[position:] + block
+        position = 0
+
 
 class DatasetLoader:
     """
@@ -48,6 +129,52 @@ class DatasetLoader:
         
         return self.df
     
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the records of the dataset without loading the whole file
+        
+        JSON Lines files (.jsonl/.ndjson, one object per line) are read line
+        by line; JSON arrays are decoded incrementally.
+        
+        Returns:
+            Iterator over record dictionaries
+        """
+        if not self.dataset_path.exists():
+            raise FileNotFoundError(f"Dataset file not found: {self.dataset_path}")
+        
+        with open(self.dataset_path, 'r', encoding='utf-8') as f:
+            if self.dataset_path.suffix in JSONL_SUFFIXES:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            else:
+                yield from iter_json_array(f)
+    
+    def iter_chunks(self, chunk_size: int = 1000) -> Iterator[Tuple[List[str], List[str]]]:
+        """
+        Stream the dataset as chunks of texts and labels
+        
+        Peak memory is bounded by the chunk size rather than the dataset
+        size. Missing contents and tags become empty strings, as in
+        load_dataset.
+        
+        Args:
+            chunk_size: Number of samples per chunk
+            
+        Returns:
+            Iterator over (texts, labels) tuples
+        """
+        texts, labels = [], []
+        for record in self.iter_records():
+            texts.append(record.get("content") or '')
+            labels.append(record.get("tag") or '')
+            if len(texts) == chunk_size:
+                yield texts, labels
+                texts, labels = [], []
+        
+        if texts:
+            yield texts, labels
+    
     def get_texts_and_labels(self) -> Tuple[List[str], List[str]]:
         """
         Get texts and labels from the dataset
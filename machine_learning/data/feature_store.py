@@ -0,0 +1,213 @@
+"""
+On-disk cache of vectorized training data
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+import joblib
+import scipy.sparse as sp
+
+from .dataset_loader import DatasetLoader
+from models.vectorizers import build_vectorizer
+from config import FEATURE_STORE_CONFIG
+
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def hash_file(path: Path) -> str:
+    """Content hash of a file, read in blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FeatureSet:
+    """
+    A fitted vectorizer with the train/test matrices it produced
+    """
+
+    def __init__(self, key: str, vectorizer, X_train, X_test, y_train: List[str], y_test: List[str],
+                 cached: bool, timings_ms: Dict[str, float]):
+        """
+        Args:
+            key: Feature store key of the set
+            vectorizer: Vectorizer fitted on the training texts
+            X_train: CSR matrix of the training texts
+            X_test: CSR matrix of the test texts
+            y_train: Training labels
+            y_test: Test labels
+            cached: Whether the set was read from the store instead of built
+            timings_ms: Time spent loading the data and vectorizing it
+        """
+        self.key = key
+        self.vectorizer = vectorizer
+        self.X_train = X_train
+        self.X_test = X_test
+        self.y_train = y_train
+        self.y_test = y_test
+        self.cached = cached
+        self.timings_ms = timings_ms
+
+
+class FeatureStore:
+    """
+    Cache of vectorized train/test splits keyed by dataset content and vectorizer settings
+
+    Each entry lives in `<store_dir>/<key>/` and holds the fitted vectorizer
+    (`vectorizer.joblib`), the CSR matrices (`X_train.npz`, `X_test.npz`)
+    and the labels. The key hashes the dataset bytes together with the
+    vectorizer parameters and split settings, so editing the dataset or the
+    vectorizer config simply misses and builds a new entry; the least
+    recently used entries beyond `max_entries` are deleted.
+    """
+
+    def __init__(self, store_dir: str = None, max_entries: int = None, enabled: bool = None):
+        """
+        Initialize the feature store
+
+        Args:
+            store_dir: Directory holding the cached feature sets (defaults to config)
+            max_entries: Number of feature sets kept on disk (defaults to config)
+            enabled: When False every lookup builds the features without
+                caching them (defaults to config)
+        """
+        self.store_dir = Path(store_dir or FEATURE_STORE_CONFIG["dir"])
+        self.max_entries = FEATURE_STORE_CONFIG["max_entries"] if max_entries is None else max_entries
+        self.enabled = FEATURE_STORE_CONFIG["enabled"] if enabled is None else enabled
+
+    @staticmethod
+    def make_key(dataset_hash: str, vectorizer_params: Dict[str, Any], test_size: float, random_state: int) -> str:
+        """Build the key of a feature set"""
+        settings = json.dumps(
+            {
+                "dataset": dataset_hash,
+                # Tuples and lists (as read back from JSON) must hash alike
+                "vectorizer_params": json.loads(json.dumps(vectorizer_params)),
+                "test_size": test_size,
+                "random_state": random_state
+            },
+            sort_keys=True
+        )
+        return hashlib.blake2b(settings.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_or_build(
+        self,
+        dataset_path: str,
+        vectorizer_params: Dict[str, Any],
+        test_size: float = 0.2,
+        random_state: int = 42
+    ) -> FeatureSet:
+        """
+        Get the vectorized train/test split of a dataset, building it on a miss
+
+        Args:
+            dataset_path: Path to the dataset JSON file
+            vectorizer_params: Parameters for the vectorizer
+            test_size: Proportion of data to use for testing
+            random_state: Random seed of the split
+
+        Returns:
+            FeatureSet with the fitted vectorizer and the matrices
+        """
+        key = self.make_key(hash_file(Path(dataset_path)), vectorizer_params, test_size, random_state)
+        entry_path = self.store_dir / key
+
+        if self.enabled and entry_path.exists():
+            start = time.perf_counter()
+            feature_set = self._read(key, entry_path)
+            feature_set.timings_ms = {"load": round((time.perf_counter() - start) * 1000, 2), "vectorize": 0.0}
+            os.utime(entry_path)  # mark as recently used
+            return feature_set
+
+        feature_set = self._build(key, dataset_path, vectorizer_params, test_size, random_state)
+        if self.enabled:
+            self._write(feature_set, entry_path)
+            self._prune()
+        return feature_set
+
+    @staticmethod
+    def _build(key: str, dataset_path: str, vectorizer_params: Dict[str, Any],
+               test_size: float, random_state: int) -> FeatureSet:
+        """Split the dataset and fit the vectorizer on the training texts"""
+        start = time.perf_counter()
+        dataset_loader = DatasetLoader(str(dataset_path))
+        X_train, X_test, y_train, y_test = dataset_loader.get_train_test_split(test_size, random_state)
+        loaded = time.perf_counter()
+
+        vectorizer = build_vectorizer(vectorizer_params)
+        X_train_transformed = vectorizer.fit_transform(X_train).tocsr()
+        X_test_transformed = vectorizer.transform(X_test).tocsr()
+        vectorized = time.perf_counter()
+
+        return FeatureSet(
+            key, vectorizer, X_train_transformed, X_test_transformed, y_train, y_test, cached=False,
+            timings_ms={
+                "load": round((loaded - start) * 1000, 2),
+                "vectorize": round((vectorized - loaded) * 1000, 2)
+            }
+        )
+
+    @staticmethod
+    def _read(key: str, entry_path: Path) -> FeatureSet:
+        """Read a stored feature set"""
+        with open(entry_path / "labels.json", 'r', encoding='utf-8') as f:
+            labels = json.load(f)
+        return FeatureSet(
+            key,
+            joblib.load(entry_path / "vectorizer.joblib"),
+            sp.load_npz(entry_path / "X_train.npz"),
+            sp.load_npz(entry_path / "X_test.npz"),
+            labels["y_train"],
+            labels["y_test"],
+            cached=True,
+            timings_ms={}
+        )
+
+    def _write(self, feature_set: FeatureSet, entry_path: Path) -> None:
+        """Write a feature set through a staging directory renamed into place"""
+        staging_path = self.store_dir / f".{feature_set.key}.{uuid.uuid4().hex}.staging"
+        staging_path.mkdir(parents=True)
+
+        joblib.dump(feature_set.vectorizer, staging_path / "vectorizer.joblib")
+        sp.save_npz(staging_path / "X_train.npz", feature_set.X_train, compressed=False)
+        sp.save_npz(staging_path / "X_test.npz", feature_set.X_test, compressed=False)
+        with open(staging_path / "labels.json", 'w', encoding='utf-8') as f:
+            json.dump({"y_train": feature_set.y_train, "y_test": feature_set.y_test}, f, ensure_ascii=False)
+
+        try:
+            os.replace(staging_path, entry_path)
+        except OSError:
+            # Another training stored the same features first
+            shutil.rmtree(staging_path, ignore_errors=True)
+
+    def _prune(self) -> None:
+        """Delete the least recently used entries beyond max_entries"""
+        entries = sorted(
+            (item for item in self.store_dir.iterdir() if item.is_dir() and not item.name.startswith(".")),
+            key=lambda item: item.stat().st_mtime
+        )
+        for item in entries[:max(len(entries) - self.max_entries, 0)]:
+            shutil.rmtree(item, ignore_errors=True)
+
+    def clear(self) -> int:
+        """
+        Delete every stored feature set
+
+        Returns:
+            Number of deleted entries
+        """
+        if not self.store_dir.exists():
+            return 0
+        entries = [item for item in self.store_dir.iterdir() if item.is_dir()]
+        for item in entries:
+            shutil.rmtree(item, ignore_errors=True)
+        return len(entries)
+
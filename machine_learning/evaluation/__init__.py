@@ -0,0 +1,6 @@
+"""
+Evaluation package for ML Classification API
+"""
+from .cross_validation import cross_validate
+
+__all__ = ["cross_validate"]
@@ -0,0 +1,178 @@
+"""
+Stratified k-fold cross-validation of the classifiers
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, precision_recall_fscore_support
+from sklearn.model_selection import StratifiedKFold
+
+from data.dataset_loader import DatasetLoader
+from models.model_factory import ModelFactory
+from config import DATASET_PATH, MODEL_CONFIGS
+
+# Texts and labels already read by this (worker) process, by dataset path,
+# modification time and size; pool workers outlive trainings, so a changed
+# file must not be served from an earlier read
+_DATASETS = {}
+
+
+def _get_dataset(dataset_path: str):
+    """Read a dataset once per process and version of the file"""
+    stat = os.stat(dataset_path)
+    key = (dataset_path, stat.st_mtime_ns, stat.st_size)
+    if key not in _DATASETS:
+        # Drop reads of older versions of the same file
+        for stale in [cached for cached in _DATASETS if cached[0] == dataset_path]:
+            del _DATASETS[stale]
+        texts, labels = DatasetLoader(dataset_path).get_texts_and_labels()
+        _DATASETS[key] = (texts, np.asarray(labels))
+    return _DATASETS[key]
+
+
+def run_fold(
+    model_type: str,
+    dataset_path: str,
+    train_index: List[int],
+    test_index: List[int],
+    vectorizer_params: Dict[str, Any],
+    model_params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Train on one fold's training part and predict its test part
+
+    The vectorizer is fitted on the training part only, so no vocabulary
+    or IDF statistics leak from the test part.
+
+    Args:
+        model_type: Type of model to evaluate
+        dataset_path: Path to the dataset JSON file
+        train_index: Rows used for training
+        test_index: Rows held out
+        vectorizer_params: Parameters for the vectorizer
+        model_params: Overrides of the model's default parameters
+
+    Returns:
+        Dictionary with the predicted labels of the held-out rows and timings
+    """
+    texts, labels = _get_dataset(dataset_path)
+
+    classifier = ModelFactory.create_classifier(model_type)
+    start = time.perf_counter()
+    # Only the predicted labels are used, so the calibration fits are skipped;
+    # folds run in parallel processes, so each fits on one core
+    classifier.train(
+        [texts[i] for i in train_index], labels[train_index].tolist(), vectorizer_params,
+        classifier.single_core_params(model_params), calibrate=False
+    )
+    fitted = time.perf_counter()
+    predictions = classifier.predict_batch([texts[i] for i in test_index])
+    predicted = time.perf_counter()
+
+    return {
+        "test_index": test_index,
+        "predicted": [prediction["tagClass"] for prediction in predictions],
+        "fit_ms": round((fitted - start) * 1000, 2),
+        "predict_ms": round((predicted - fitted) * 1000, 2)
+    }
+
+
+def cross_validate(
+    model_type: str,
+    dataset_path: str = None,
+    n_splits: int = 5,
+    n_jobs: int = 1,
+    vectorizer_params: Dict[str, Any] = None,
+    model_params: Dict[str, Any] = None,
+    random_state: int = 42
+) -> Dict[str, Any]:
+    """
+    Run stratified k-fold cross-validation of a model configuration
+
+    Folds are trained in parallel processes when n_jobs > 1. Metrics are
+    computed on the pooled out-of-fold predictions, so every sample is
+    scored exactly once by a model that did not see it.
+
+    Args:
+        model_type: Type of model to evaluate
+        dataset_path: Path to the dataset JSON file (defaults to config)
+        n_splits: Number of folds
+        n_jobs: Number of folds trained at once
+        vectorizer_params: Parameters for the vectorizer (defaults to MODEL_CONFIGS)
+        model_params: Overrides of the model's default parameters
+        random_state: Seed of the fold assignment
+
+    Returns:
+        Dictionary with overall and per-class metrics, the confusion
+        matrix, per-fold results and timings
+    """
+    dataset_path = str(dataset_path or DATASET_PATH)
+    if vectorizer_params is None:
+        vectorizer_params = MODEL_CONFIGS.get(model_type, {}).get("vectorizer_params", {})
+
+    start = time.perf_counter()
+    texts, labels = _get_dataset(dataset_path)
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    calls = [
+        (model_type, dataset_path, train_index.tolist(), test_index.tolist(), vectorizer_params, model_params)
+        for train_index, test_index in folds.split(np.zeros(len(labels)), labels)
+    ]
+
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, n_splits)) as executor:
+            results = [future.result() for future in [executor.submit(run_fold, *args) for args in calls]]
+    else:
+        results = [run_fold(*args) for args in calls]
+
+    # Pool the out-of-fold predictions
+    predicted = np.empty(len(labels), dtype=object)
+    fold_summaries = []
+    for fold, result in enumerate(results):
+        fold_labels = labels[result["test_index"]]
+        predicted[result["test_index"]] = result["predicted"]
+        fold_summaries.append({
+            "fold": fold,
+            "train_samples": len(labels) - len(result["test_index"]),
+            "test_samples": len(result["test_index"]),
+            "accuracy": float(accuracy_score(fold_labels, result["predicted"])),
+            "macro_f1": float(f1_score(fold_labels, result["predicted"], average="macro", zero_division=0)),
+            "fit_ms": result["fit_ms"],
+            "predict_ms": result["predict_ms"]
+        })
+    predicted = predicted.astype(str)
+
+    classes = np.unique(labels).tolist()
+    precision, recall, f1, support = precision_recall_fscore_support(
+        labels, predicted, labels=classes, zero_division=0
+    )
+
+    return {
+        "method": "stratified_kfold",
+        "n_splits": n_splits,
+        "n_samples": len(labels),
+        "accuracy": float(accuracy_score(labels, predicted)),
+        "macro_f1": float(f1_score(labels, predicted, average="macro", zero_division=0)),
+        "weighted_f1": float(f1_score(labels, predicted, average="weighted", zero_division=0)),
+        "per_class": {
+            label: {
+                "precision": float(precision[i]),
+                "recall": float(recall[i]),
+                "f1": float(f1[i]),
+                "support": int(support[i])
+            }
+            for i, label in enumerate(classes)
+        },
+        "confusion_matrix": {
+            "labels": classes,
+            "matrix": confusion_matrix(labels, predicted, labels=classes).tolist()
+        },
+        "folds": fold_summaries,
+        "timings_ms": {
+            "total": round((time.perf_counter() - start) * 1000, 2),
+            "mean_fold_fit": round(float(np.mean([fold["fit_ms"] for fold in fold_summaries])), 2),
+            "mean_fold_predict": round(float(np.mean([fold["predict_ms"] for fold in fold_summaries])), 2)
+        }
+    }
@@ -0,0 +1,358 @@
+"""
+Load test for the ML Classification API
+
+Drives a mix of /classify, /classify/batch, /models and /health requests
+with httpx.AsyncClient, either at a fixed concurrency (closed loop: every
+client sends its next request as soon as the previous one is answered) or
+at a target request rate (open loop: requests start on a fixed schedule
+whether or not earlier ones have finished). Reports throughput, latency
+percentiles and error rates per endpoint, and optionally writes latency
+over time to a CSV file.
+
+Without --url the app is served in-process through httpx.ASGITransport,
+so the test needs no server and no network (e.g. in CI).
+
+Examples:
+    python load_test.py --duration 10 --concurrency 20
+    python load_test.py --url http://localhost:8000 --qps 200 --csv latency.csv
+    python load_test.py --mix classify=1 --corpus my_texts.txt --max-error-rate 0
+"""
+import argparse
+import asyncio
+import csv
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import httpx
+import numpy as np
+
+BASE_DIR = Path(__file__).parent
+sys.path.append(str(BASE_DIR))
+
+from config import DATASET_PATH
+
+API_PREFIX = "/api/v1"
+ENDPOINTS = ["classify", "batch", "models", "health"]
+DEFAULT_MIX = "classify=70,batch=10,models=10,health=10"
+PERCENTILES = [50, 95, 99]
+
+
+class Sample(NamedTuple):
+    """Outcome of one request"""
+    endpoint: str
+    started_at: float  # seconds since the start of the test
+    latency_ms: float
+    status: str  # HTTP status code, or the name of the transport error
+    ok: bool
+
+
+def load_corpus(path: Path, max_chars: int = 10000) -> List[str]:
+    """
+    Load the texts to classify
+
+    Args:
+        path: A dataset.json-style JSON array (records with "content", or
+            plain strings), a JSON Lines file of such records, or a text
+            file with one document per line
+        max_chars: Texts are truncated to this length
+
+    Returns:
+        Non-empty texts
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix == ".json":
+            items = json.load(f)
+        elif path.suffix == ".jsonl":
+            items = [json.loads(line) for line in f if line.strip()]
+        else:
+            items = [line.rstrip("\n") for line in f]
+
+    texts = [item.get("content", "") if isinstance(item, dict) else item for item in items]
+    texts = [text[:max_chars] for text in texts if text and text.strip()]
+    if not texts:
+        raise ValueError(f"No texts found in {path}")
+    return texts
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse an endpoint mix such as "classify=70,batch=10,models=10,health=10" """
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint {name!r} in mix. Choose from {ENDPOINTS}")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid weight {weight!r} for {name}")
+    if sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("The mix needs at least one positive weight")
+    return mix
+
+
+class LoadGenerator:
+    """
+    Sends the request mix and records a Sample per request
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        texts: List[str],
+        mix: Dict[str, float],
+        model_type: str = "svm",
+        batch_size: int = 16,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the generator
+
+        Args:
+            client: Client bound to the API (base_url without the /api/v1 prefix)
+            texts: Corpus the request texts are drawn from
+            mix: Relative weight of each endpoint
+            model_type: Model used by the classify requests
+            batch_size: Texts per /classify/batch request
+            seed: Seed of the text and endpoint choices
+        """
+        self.client = client
+        self.texts = texts
+        self.endpoints = list(mix)
+        self.cum_weights = list(np.cumsum([mix[name] for name in self.endpoints]))
+        self.model_type = model_type
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.samples: List[Sample] = []
+        self.t0 = time.perf_counter()
+
+    def _request(self, endpoint: str):
+        """Coroutine sending one request to the endpoint"""
+        if endpoint == "classify":
+            payload = {"text": self.rng.choice(self.texts), "model_type": self.model_type}
+            return self.client.post(f"{API_PREFIX}/classify", json=payload)
+        if endpoint == "batch":
+            items = [{"text": text} for text in self.rng.choices(self.texts, k=self.batch_size)]
+            return self.client.post(f"{API_PREFIX}/classify/batch", json={"items": items, "model_type": self.model_type})
+        if endpoint == "models":
+            return self.client.get(f"{API_PREFIX}/models")
+        return self.client.get(f"{API_PREFIX}/health")
+
+    async def send(self, endpoint: str, scheduled: Optional[float] = None) -> Sample:
+        """
+        Send one request and record its outcome
+
+        Args:
+            endpoint: Endpoint of the mix
+            scheduled: perf_counter time the request was due (open loop); the
+                latency is measured from it, so a generator or server falling
+                behind shows up as latency instead of being hidden
+        """
+        start = scheduled if scheduled is not None else time.perf_counter()
+        try:
+            response = await self._request(endpoint)
+            status, ok = str(response.status_code), response.status_code < 400
+        except httpx.HTTPError as e:
+            status, ok = type(e).__name__, False
+        sample = Sample(endpoint, start - self.t0, (time.perf_counter() - start) * 1000, status, ok)
+        self.samples.append(sample)
+        return sample
+
+    def pick(self) -> str:
+        """Draw an endpoint according to the mix"""
+        return self.rng.choices(self.endpoints, cum_weights=self.cum_weights)[0]
+
+    async def warm_up(self) -> None:
+        """Send one request per endpoint of the mix, outside the measurement"""
+        for endpoint in self.endpoints:
+            await self.send(endpoint)
+        self.samples.clear()
+
+    async def run_closed_loop(self, concurrency: int, duration: float) -> None:
+        """Keep `concurrency` requests in flight for `duration` seconds"""
+        self.t0 = time.perf_counter()
+        stop_at = self.t0 + duration
+
+        async def worker():
+            while time.perf_counter() < stop_at:
+                await self.send(self.pick())
+
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+
+    async def run_open_loop(self, qps: float, duration: float, max_in_flight: int) -> int:
+        """
+        Start requests at `qps` per second for `duration` seconds
+
+        Returns:
+            Requests skipped because `max_in_flight` requests were pending
+        """
+        self.t0 = time.perf_counter()
+        interval = 1.0 / qps
+        in_flight = set()
+        skipped = 0
+        for i in range(int(qps * duration)):
+            due = self.t0 + i * interval
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= max_in_flight:
+                skipped += 1
+                continue
+            task = asyncio.create_task(self.send(self.pick(), scheduled=due))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+        return skipped
+
+
+def summarize(samples: List[Sample], duration: float) -> Dict[str, float]:
+    """Throughput, latency percentiles and error rate of a set of samples"""
+    latencies = np.array([sample.latency_ms for sample in samples])
+    errors = sum(not sample.ok for sample in samples)
+    summary = {
+        "requests": len(samples),
+        "rps": len(samples) / duration if duration else 0.0,
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0
+    }
+    if len(latencies):
+        for p, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+            summary[f"p{p}_ms"] = float(value)
+        summary["max_ms"] = float(latencies.max())
+    else:
+        summary.update({f"p{p}_ms": float("nan") for p in PERCENTILES}, max_ms=float("nan"))
+    return summary
+
+
+def print_report(samples: List[Sample], duration: float, skipped: int = 0) -> Dict[str, float]:
+    """Print the per-endpoint and overall summary; returns the overall one"""
+    by_endpoint = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample.endpoint].append(sample)
+
+    print(f"\n{'endpoint':<10} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'max ms':>9} {'errors':>8}")
+    print("-" * 80)
+    rows = [(name, summarize(by_endpoint[name], duration)) for name in ENDPOINTS if name in by_endpoint]
+    overall = summarize(samples, duration)
+    for name, s in rows + [("all", overall)]:
+        print(f"{name:<10} {s['requests']:>9d} {s['rps']:9.1f} {s['p50_ms']:9.1f} {s['p95_ms']:9.1f} "
+              f"{s['p99_ms']:9.1f} {s['max_ms']:9.1f} {s['error_rate']:7.2%}")
+
+    statuses = defaultdict(int)
+    for sample in samples:
+        if not sample.ok:
+            statuses[f"{sample.endpoint} {sample.status}"] += 1
+    if statuses:
+        print("\nErrors: " + ", ".join(f"{key} x{count}" for key, count in sorted(statuses.items())))
+    if skipped:
+        print(f"\n⚠️  {skipped} requests not sent: too many requests in flight for the target rate")
+    return overall
+
+
+def write_timeline(samples: List[Sample], path: Path, interval: float = 1.0) -> None:
+    """
+    Write latency over time as CSV
+
+    One row per time window and endpoint (plus "all"), with the requests
+    started in the window, their errors and latency percentiles.
+    """
+    windows = defaultdict(list)
+    for sample in samples:
+        window = int(sample.started_at // interval)
+        windows[(window, sample.endpoint)].append(sample)
+        windows[(window, "all")].append(sample)
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["window_start_s", "endpoint", "requests", "errors"]
+                        + [f"p{p}_ms" for p in PERCENTILES] + ["max_ms"])
+        for (window, endpoint), window_samples in sorted(windows.items()):
+            s = summarize(window_samples, interval)
+            writer.writerow([round(window * interval, 3), endpoint, s["requests"], s["errors"]]
+                            + [round(s[f"p{p}_ms"], 3) for p in PERCENTILES] + [round(s["max_ms"], 3)])
+
+
+async def run(args) -> Dict[str, float]:
+    """Run the load test and print its report"""
+    texts = load_corpus(Path(args.corpus))
+    limits = httpx.Limits(max_connections=args.max_connections)
+
+    if args.url:
+        transport, base_url, app = None, args.url.rstrip("/"), None
+        print(f"Target: {base_url}")
+    else:
+        from app import app
+        # ASGITransport does not run lifespan events; run them around the test
+        await app.router.startup()
+        transport, base_url = httpx.ASGITransport(app=app), "http://in-process"
+        print("Target: in-process app (no network)")
+
+    try:
+        async with httpx.AsyncClient(
+            base_url=base_url, transport=transport, limits=limits, timeout=args.timeout
+        ) as client:
+            generator = LoadGenerator(client, texts, args.mix, args.model_type, args.batch_size, args.seed)
+            await generator.warm_up()
+
+            if args.qps:
+                print(f"Running {args.duration:.0f}s at {args.qps:g} req/s (open loop)...")
+                skipped = await generator.run_open_loop(args.qps, args.duration, args.max_connections)
+            else:
+                print(f"Running {args.duration:.0f}s with {args.concurrency} concurrent clients...")
+                await generator.run_closed_loop(args.concurrency, args.duration)
+                skipped = 0
+            elapsed = time.perf_counter() - generator.t0
+    finally:
+        if app is not None:
+            await app.router.shutdown()
+
+    overall = print_report(generator.samples, elapsed, skipped)
+    if args.csv:
+        write_timeline(generator.samples, Path(args.csv), args.interval)
+        print(f"\nLatency over time written to {args.csv}")
+    return overall
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running API (default: serve the app in-process)")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=10, help="Concurrent clients (closed loop, default)")
+    load.add_argument("--qps", type=float, help="Target request rate (open loop)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Relative weight per endpoint (default: {DEFAULT_MIX})")
+    parser.add_argument("--corpus", default=str(DATASET_PATH),
+                        help="Texts to classify: dataset-style .json, .jsonl, or one text per line")
+    parser.add_argument("--model-type", default="svm")
+    parser.add_argument("--batch-size", type=int, default=16, help="Texts per /classify/batch request")
+    parser.add_argument("--max-connections", type=int, default=100,
+                        help="Connection pool size; also caps requests in flight with --qps")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Request timeout in seconds")
+    parser.add_argument("--csv", help="Write latency over time to this CSV file")
+    parser.add_argument("--interval", type=float, default=1.0, help="Window of the CSV rows in seconds")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the text and endpoint choices")
+    parser.add_argument("--max-error-rate", type=float, default=0.01,
+                        help="Exit with status 1 when the overall error rate is higher (default 0.01)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    overall = asyncio.run(run(args))
+    if overall["error_rate"] > args.max_error_rate:
+        print(f"\n❌ Error rate {overall['error_rate']:.2%} above {args.max_error_rate:.2%}")
+        sys.exit(1)
+    print("\n✅ Load test completed")
+
+
+if __name__ == "__main__":
+    main()
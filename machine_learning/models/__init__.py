@@ -3,6 +3,19 @@ Models package for ML Classification API
 """
 from .base_classifier import BaseClassifier
 from .svm_classifier import SVMClassifier
+from .decision_tree_classifier import DecisionTreeClassifier
+from .random_forest_classifier import RandomForestClassifier
+from .naive_bayes_classifier import ComplementNBClassifier
 from .model_factory import ModelFactory
+from .vectorizers import HashedTfidfVectorizer, build_vectorizer
 
-__all__ = ["BaseClassifier", "SVMClassifier", "ModelFactory"]
+__all__ = [
+    "BaseClassifier",
+    "SVMClassifier",
+    "DecisionTreeClassifier",
+    "RandomForestClassifier",
+    "ComplementNBClassifier",
+    "ModelFactory",
+    "HashedTfidfVectorizer",
+    "build_vectorizer"
+]
@@ -0,0 +1,199 @@
+"""
+Memory-mappable model artifact format
+
+Instead of compressed pickles, the fitted state is written as raw `.npy`
+arrays (coefficients, intercepts, classes, IDF weights) that load with
+`np.load(..., mmap_mode="r")` in milliseconds and are shared between
+processes through the page cache. The TF-IDF vocabulary is stored as a
+sorted UTF-8 string table with an offset index.
+"""
+import json
+import weakref
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .vectorizers import HashedTfidfVectorizer, build_vectorizer
+
+MANIFEST_FILE = "arrays.json"
+LEGACY_FILES = ("model.pkl", "vectorizer.pkl")
+
+
+class VocabularyTable(Mapping):
+    """
+    Read-only term -> column mapping backed by a sorted string table
+
+    The table is memory-mapped at load time; the lookup dict is only
+    decoded from it on the first term lookup, so loading a model never
+    pays for the vocabulary and idle workers never allocate it. Once
+    decoded, the dict replaces the table as the owner's `vocabulary_`,
+    so later transforms look terms up in a plain dict rather than
+    through the Mapping methods.
+    """
+
+    def __init__(self, strings: np.ndarray, offsets: np.ndarray, columns: np.ndarray, owner=None):
+        """
+        Args:
+            strings: uint8 array with the UTF-8 encoded terms, in sorted order
+            offsets: int64 array of length n_terms + 1 delimiting every term
+            columns: int64 array with the feature column of every term
+            owner: Vectorizer whose `vocabulary_` is this table
+        """
+        self._strings = strings
+        self._offsets = offsets
+        self._columns = columns
+        self._owner = weakref.ref(owner) if owner is not None else None
+        self._lookup: Optional[Dict[str, int]] = None
+
+    def _get_lookup(self) -> Dict[str, int]:
+        """Decode the string table into a dict on first use"""
+        if self._lookup is None:
+            blob = self._strings.tobytes()
+            bounds = self._offsets.tolist()
+            terms = [blob[start:end].decode("utf-8") for start, end in zip(bounds[:-1], bounds[1:])]
+            self._lookup = dict(zip(terms, self._columns.tolist()))
+
+            owner = self._owner() if self._owner is not None else None
+            if owner is not None and getattr(owner, "vocabulary_", None) is self:
+                owner.vocabulary_ = self._lookup
+        return self._lookup
+
+    def __getitem__(self, term: str) -> int:
+        return self._get_lookup()[term]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_lookup())
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __reduce__(self):
+        # Pickle as a plain dict (e.g. when a model is re-saved as joblib)
+        return dict, (dict(self._get_lookup()),)
+
+
+def has_array_artifacts(path: Path) -> bool:
+    """Check whether a directory holds a model in the array format"""
+    return (Path(path) / MANIFEST_FILE).exists()
+
+
+def _save_vocabulary(vocabulary: Dict[str, int], path: Path) -> None:
+    """Write a vocabulary as a sorted string table plus offset index"""
+    terms = sorted(vocabulary)
+    encoded = [term.encode("utf-8") for term in terms]
+
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(term) for term in encoded], out=offsets[1:])
+
+    np.save(path / "vocabulary_strings.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+    np.save(path / "vocabulary_offsets.npy", offsets)
+    np.save(path / "vocabulary_columns.npy", np.array([vocabulary[term] for term in terms], dtype=np.int64))
+
+
+def _load_vocabulary(path: Path, owner=None) -> VocabularyTable:
+    """Memory-map a vocabulary written by _save_vocabulary"""
+    return VocabularyTable(
+        np.load(path / "vocabulary_strings.npy", mmap_mode="r"),
+        np.load(path / "vocabulary_offsets.npy", mmap_mode="r"),
+        np.load(path / "vocabulary_columns.npy", mmap_mode="r"),
+        owner=owner
+    )
+
+
+def save_array_artifacts(classifier, path: Path) -> None:
+    """
+    Save a trained classifier's model and vectorizer as raw arrays
+
+    Linear models (anything with coef_/intercept_) are stored as arrays;
+    other models fall back to a joblib pickle inside the same directory.
+
+    Args:
+        classifier: Trained BaseClassifier instance
+        path: Directory to write the artifacts to
+    """
+    path = Path(path)
+    vectorizer = classifier.vectorizer
+    model = classifier.model
+    manifest: Dict[str, Any] = {
+        "format": "npy",
+        "vectorizer_params": classifier.metadata.get("vectorizer_params", {}),
+        "model_params": classifier.metadata.get("model_params", {}),
+    }
+
+    # Vectorizer state
+    if isinstance(vectorizer, HashedTfidfVectorizer):
+        manifest["vectorizer"] = "hashing"
+    elif isinstance(vectorizer, TfidfVectorizer):
+        manifest["vectorizer"] = "tfidf"
+        _save_vocabulary(vectorizer.vocabulary_, path)
+    else:
+        raise ValueError(f"Unsupported vectorizer for the npy format: {type(vectorizer).__name__}")
+    np.save(path / "idf.npy", np.asarray(vectorizer.idf_))
+
+    # Model state
+    np.save(path / "classes.npy", np.asarray(model.classes_).astype(str))
+    if hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        manifest["model"] = "linear"
+        np.save(path / "coef.npy", np.ascontiguousarray(model.coef_))
+        np.save(path / "intercept.npy", np.asarray(model.intercept_))
+        # SGD state needed to continue training with partial_fit
+        if hasattr(model, "t_"):
+            manifest["t_"] = float(model.t_)
+        if hasattr(model, "_expanded_class_weight"):
+            manifest["expanded_class_weight"] = np.asarray(model._expanded_class_weight).tolist()
+    else:
+        manifest["model"] = "joblib"
+        joblib.dump(model, path / "model.joblib")
+
+    # Remove files of the pickle format so the directory is unambiguous
+    for name in LEGACY_FILES:
+        (path / name).unlink(missing_ok=True)
+
+    with open(path / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def load_array_artifacts(classifier, path: Path) -> None:
+    """
+    Load a model saved by save_array_artifacts into a classifier
+
+    Arrays are memory-mapped read-only; nothing is copied until used.
+
+    Args:
+        classifier: BaseClassifier instance to populate
+        path: Directory holding the artifacts
+    """
+    path = Path(path)
+    with open(path / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    # Vectorizer
+    vectorizer = build_vectorizer(manifest["vectorizer_params"])
+    idf = np.load(path / "idf.npy", mmap_mode="r")
+    if manifest["vectorizer"] == "tfidf":
+        vectorizer.vocabulary_ = _load_vocabulary(path, owner=vectorizer)
+        vectorizer.idf_ = idf
+    else:
+        vectorizer.idf_ = idf
+
+    # Model
+    classes = np.load(path / "classes.npy")
+    if manifest["model"] == "linear":
+        model = classifier._create_model(**manifest["model_params"])
+        model.coef_ = np.load(path / "coef.npy", mmap_mode="r")
+        model.intercept_ = np.load(path / "intercept.npy", mmap_mode="r")
+        model.classes_ = classes
+        model.n_features_in_ = model.coef_.shape[1]
+        if "t_" in manifest:
+            model.t_ = manifest["t_"]
+        if "expanded_class_weight" in manifest:
+            model._expanded_class_weight = np.array(manifest["expanded_class_weight"])
+    else:
+        model = joblib.load(path / "model.joblib")
+
+    classifier.vectorizer = vectorizer
+    classifier.model = model
@@ -1,10 +1,46 @@
 """
 Abstract base class for all classifiers
 """
+import copy
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Tuple
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Any, Tuple
+import joblib
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from .array_format import MANIFEST_FILE, has_array_artifacts, load_array_artifacts, save_array_artifacts
+from .calibration import ScoreCalibrator, out_of_fold_scores, raw_scores, softmax
+from .vectorizers import build_vectorizer, vectorizer_fingerprint
+from config import CALIBRATION_CONFIG, PERSISTENCE_CONFIG
+
+
+def new_version_id() -> str:
+    """Create a sortable version identifier from the current UTC time"""
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def rank_top_k(scores: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the k best columns of every row of a score matrix
+    
+    np.argpartition selects the k best columns of the whole matrix in
+    linear time and only those k are sorted, instead of sorting every row.
+    
+    Args:
+        scores: (n_rows, n_classes) score matrix
+        k: Number of columns kept per row (capped at n_classes)
+        
+    Returns:
+        Tuple of (column indices, scores), both (n_rows, k), best first
+    """
+    k = max(1, min(k, scores.shape[1]))
+    
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
 
 
 class BaseClassifier(ABC):
@@ -19,6 +55,8 @@ class BaseClassifier(ABC):
         self.classes_ = None
         self.is_trained = False
         self.metadata = {}
+        self.calibrator = None
+        self._fingerprint = (None, None)
     
     @abstractmethod
     def _create_model(self, **params) -> Any:
@@ -30,31 +68,111 @@ class BaseClassifier(ABC):
         """Get model-specific parameters"""
         pass
     
-    def train(self, X: List[str], y: List[str], vectorizer_params: Dict[str, Any] = None) -> Dict[str, Any]:
+    def single_core_params(self, model_params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Model parameter overrides fitting the model on one core
+        
+        For fits already run in parallel processes (e.g. cross-validation
+        folds), where a model spreading over every core (n_jobs=-1) would
+        oversubscribe the CPU. Models without n_jobs get the overrides back
+        unchanged.
+        
+        Args:
+            model_params: Overrides of the model's default parameters
+            
+        Returns:
+            The overrides, with n_jobs=1 where the model has that parameter
+        """
+        model_params = dict(model_params or {})
+        if "n_jobs" in self._create_model().get_params():
+            model_params["n_jobs"] = 1
+        return model_params
+    
+    def _use_single_core(self) -> None:
+        """
+        Make the fitted model predict (and its calibration copies fit) on
+        one core
+        
+        n_jobs only speeds up the final fit: serving already runs in several
+        API workers and inference threads, which would each claim every core.
+        """
+        if self.model.get_params().get("n_jobs") not in (None, 1):
+            self.model.set_params(n_jobs=1)
+    
+    def train(
+        self,
+        X: List[str],
+        y: List[str],
+        vectorizer_params: Dict[str, Any] = None,
+        model_params: Dict[str, Any] = None,
+        calibrate: bool = True
+    ) -> Dict[str, Any]:
         """
         Train the classifier with the given data
         
         Args:
             X: List of text documents
             y: List of corresponding labels
-            vectorizer_params: Parameters for TF-IDF vectorizer
+            vectorizer_params: Parameters for the vectorizer; "backend" selects
+                "tfidf" (default) or "hashing"
+            model_params: Overrides of the model's default parameters
+            calibrate: Fit the score calibration of CALIBRATION_CONFIG
             
         Returns:
             Dictionary with training results and metrics
         """
         # Create vectorizer
         vectorizer_params = vectorizer_params or {}
-        self.vectorizer = TfidfVectorizer(**vectorizer_params)
+        vectorizer = build_vectorizer(vectorizer_params)
+        
+        # Transform text to features
+        start = time.perf_counter()
+        X_transformed = vectorizer.fit_transform(X)
+        vectorize_ms = round((time.perf_counter() - start) * 1000, 2)
+        
+        self.train_on_features(vectorizer, X_transformed, y, vectorizer_params, model_params, calibrate=calibrate)
+        self.metadata["training_timings_ms"] = {"vectorize": vectorize_ms, **self.metadata["training_timings_ms"]}
+        
+        return self.metadata
+    
+    def train_on_features(
+        self,
+        vectorizer: Any,
+        X_transformed: Any,
+        y: List[str],
+        vectorizer_params: Dict[str, Any] = None,
+        model_params: Dict[str, Any] = None,
+        calibrate: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Train the classifier on already vectorized data
+        
+        Lets several trainings share one fitted vectorizer and its feature
+        matrix (see data.feature_store.FeatureStore).
+        
+        Args:
+            vectorizer: Vectorizer fitted on the training texts
+            X_transformed: Feature matrix the vectorizer produced for them
+            y: List of corresponding labels
+            vectorizer_params: Parameters the vectorizer was built with
+            model_params: Overrides of the model's default parameters
+            calibrate: Fit the score calibration of CALIBRATION_CONFIG
+                (skipped when only the model's labels are needed)
+            
+        Returns:
+            Dictionary with training results and metrics
+        """
+        self.vectorizer = vectorizer
         
         # Create model
-        model_params = self._get_model_params()
+        model_params = {**self._get_model_params(), **(model_params or {})}
         self.model = self._create_model(**model_params)
         
-        # Transform text to features
-        X_transformed = self.vectorizer.fit_transform(X)
-        
         # Train model
+        start = time.perf_counter()
         self.model.fit(X_transformed, y)
+        fitted = time.perf_counter()
+        self._use_single_core()
         
         # Store classes
         self.classes_ = self.model.classes_
@@ -62,74 +180,353 @@ class BaseClassifier(ABC):
         
         # Calculate training metrics
         y_pred = self.model.predict(X_transformed)
-        accuracy = (y_pred == y).mean()
+        accuracy = (y_pred == np.asarray(y)).mean()
+        evaluated = time.perf_counter()
         
-        self.metadata = {
+        self.calibrator = self._fit_calibrator(X_transformed, y) if calibrate else None
+        calibrated = time.perf_counter()
+        
+        self.metadata = self._build_metadata(
+            training_samples=X_transformed.shape[0],
+            accuracy=float(accuracy),
+            vectorizer_params=vectorizer_params or {},
+            model_params=model_params,
+            timings={
+                "fit": round((fitted - start) * 1000, 2),
+                "evaluate": round((evaluated - fitted) * 1000, 2),
+                "calibrate": round((calibrated - evaluated) * 1000, 2)
+            }
+        )
+        if self.calibrator is not None:
+            self.metadata["calibration"] = self.calibrator.to_dict()
+        
+        return self.metadata
+    
+    def _fit_calibrator(self, X_transformed: Any, y: List[str]) -> Any:
+        """
+        Fit the score calibration on out-of-fold scores of the training data
+        
+        Copies of the model are fitted on CALIBRATION_CONFIG["cv"] folds of
+        the training matrix; the scores they give the held-out rows are
+        mapped to probabilities by a per-class sigmoid (Platt) or isotonic
+        fit. Returns None when calibration is disabled or the training set
+        is too small to split.
+        """
+        method = CALIBRATION_CONFIG["method"]
+        if not method:
+            return None
+        
+        y = np.asarray(y)
+        _, class_counts = np.unique(y, return_counts=True)
+        cv = min(CALIBRATION_CONFIG["cv"], int(class_counts.max()))
+        if cv < 2:
+            return None
+        
+        scores = out_of_fold_scores(self.model, X_transformed, y, self.classes_, cv)
+        return ScoreCalibrator(method).fit(scores, np.searchsorted(self.classes_, y))
+    
+    def train_streaming(
+        self,
+        chunks: Callable[[], Iterable[Tuple[List[str], List[str]]]],
+        vectorizer_params: Dict[str, Any] = None,
+        epochs: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Train the classifier out-of-core from a stream of chunks
+        
+        The first pass accumulates the vectorizer's document frequencies
+        and the class counts; every further pass vectorizes one chunk at
+        a time and feeds it to `partial_fit`, so peak memory is bounded by
+        the chunk size instead of the dataset size. Needs a vectorizer
+        with `partial_fit` (the "hashing" backend) and a model with
+        `partial_fit`.
+        
+        Args:
+            chunks: Callable returning a fresh iterator of (texts, labels)
+                chunks on every call (e.g. DatasetLoader.iter_chunks)
+            vectorizer_params: Parameters for the vectorizer
+            epochs: Number of partial_fit passes over the data
+            
+        Returns:
+            Dictionary with training results and metrics
+        """
+        vectorizer_params = vectorizer_params or {}
+        self.vectorizer = build_vectorizer(vectorizer_params)
+        if not hasattr(self.vectorizer, 'partial_fit'):
+            raise ValueError("Out-of-core training requires the 'hashing' vectorizer backend")
+        
+        model_params = self._get_model_params()
+        self.model = self._create_model(**model_params)
+        if not hasattr(self.model, 'partial_fit'):
+            raise ValueError(f"Model '{self.model_name}' does not support out-of-core training")
+        
+        # Pass 1: document frequencies and class counts
+        start = time.perf_counter()
+        class_counts: Dict[str, int] = {}
+        for texts, labels in chunks():
+            self.vectorizer.partial_fit(texts)
+            for label in labels:
+                class_counts[label] = class_counts.get(label, 0) + 1
+        vectorized = time.perf_counter()
+        
+        if not class_counts:
+            raise ValueError("Cannot train on an empty dataset")
+        
+        classes = np.array(sorted(class_counts))
+        n_samples = sum(class_counts.values())
+        if getattr(self.model, "class_weight", None) == "balanced":
+            # partial_fit cannot compute balanced weights from a single chunk
+            self.model.class_weight = {
+                label: n_samples / (len(classes) * count) for label, count in class_counts.items()
+            }
+        
+        # Remaining passes: incremental fit, one chunk in memory at a time
+        n_chunks = 0
+        for _ in range(epochs):
+            for texts, labels in chunks():
+                self.model.partial_fit(self.vectorizer.transform(texts), labels, classes=classes)
+                n_chunks += 1
+        fitted = time.perf_counter()
+        
+        self.classes_ = self.model.classes_
+        self.is_trained = True
+        # Held-out scores would need further passes over the stream
+        self.calibrator = None
+        
+        # Training accuracy, computed chunk by chunk as well
+        correct = 0
+        for texts, labels in chunks():
+            correct += int((self.model.predict(self.vectorizer.transform(texts)) == np.asarray(labels)).sum())
+        evaluated = time.perf_counter()
+        
+        self.metadata = self._build_metadata(
+            training_samples=n_samples,
+            accuracy=correct / n_samples,
+            vectorizer_params=vectorizer_params,
+            model_params=model_params,
+            timings={
+                "vectorize": round((vectorized - start) * 1000, 2),
+                "fit": round((fitted - vectorized) * 1000, 2),
+                "evaluate": round((evaluated - fitted) * 1000, 2)
+            }
+        )
+        self.metadata["streaming"] = {"epochs": epochs, "chunks": n_chunks // max(epochs, 1)}
+        
+        return self.metadata
+    
+    def _build_metadata(
+        self,
+        training_samples: int,
+        accuracy: float,
+        vectorizer_params: Dict[str, Any],
+        model_params: Dict[str, Any],
+        timings: Dict[str, float]
+    ) -> Dict[str, Any]:
+        """Assemble the metadata saved with a freshly trained model"""
+        return {
             "model_name": self.model_name,
-            "training_samples": len(X),
+            "training_samples": training_samples,
             "num_classes": len(self.classes_),
             "classes": self.classes_.tolist(),
-            "accuracy": float(accuracy),
+            "accuracy": accuracy,
             "vectorizer_params": vectorizer_params,
-            "model_params": model_params
+            "model_params": model_params,
+            "version": new_version_id(),
+            "training_timings_ms": timings
+        }
+    
+    def validate_update(self, texts: List[str], labels: List[str]) -> None:
+        """
+        Check that update() can learn the given samples
+        
+        Args:
+            texts: List of text documents
+            labels: List of corresponding labels
+            
+        Raises:
+            ValueError: If the model cannot be updated or a label is unknown
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before it can be updated")
+        
+        if not hasattr(self.model, 'partial_fit'):
+            raise ValueError(f"Model '{self.model_name}' does not support incremental updates")
+        
+        if len(texts) != len(labels):
+            raise ValueError(f"Got {len(texts)} texts but {len(labels)} labels")
+        
+        unknown = sorted(set(labels) - set(self.classes_.tolist()))
+        if unknown:
+            raise ValueError(f"Unknown labels: {unknown}. Known labels: {self.classes_.tolist()}")
+    
+    def update(self, texts: List[str], labels: List[str]) -> Dict[str, Any]:
+        """
+        Incrementally train the model on new labeled samples
+        
+        Runs one `partial_fit` pass over the samples in the feature space
+        fixed at training time (the vectorizer is not refitted), so only
+        labels the model already knows can be learned. The fitted model
+        is copied before it is updated and only replaced once the update
+        succeeded; predictions running concurrently keep using the old one.
+        Every update bumps the model version.
+        
+        Args:
+            texts: List of text documents
+            labels: List of corresponding labels
+            
+        Returns:
+            Dictionary with the updated metadata
+        """
+        self.validate_update(texts, labels)
+        
+        start = time.perf_counter()
+        X_transformed = self.vectorizer.transform(texts)
+        
+        model = copy.deepcopy(self.model)
+        # Fitted arrays may be read-only memory maps (npy format)
+        for attr in ("coef_", "intercept_"):
+            if hasattr(model, attr):
+                setattr(model, attr, np.array(getattr(model, attr)))
+        # "balanced" weights would be recomputed from each mini-batch; keep
+        # the weights computed on the full training set instead
+        if getattr(model, "class_weight", None) == "balanced" and hasattr(model, "_expanded_class_weight"):
+            model.class_weight = dict(zip(self.classes_.tolist(), model._expanded_class_weight.tolist()))
+        
+        model.partial_fit(X_transformed, labels)
+        
+        online = self.metadata.get("online_updates", {})
+        self.metadata = {
+            **self.metadata,
+            "version": new_version_id(),
+            "parent_version": self.version,
+            "online_updates": {
+                "updates": online.get("updates", 0) + 1,
+                "samples": online.get("samples", 0) + len(texts),
+                "last_update_ms": round((time.perf_counter() - start) * 1000, 2)
+            }
         }
+        self.model = model
         
         return self.metadata
     
-    def predict(self, text: str) -> Dict[str, Any]:
+    @property
+    def version(self) -> str:
+        """Version identifier of the trained model (set at training time)"""
+        return str(self.metadata.get("version", "unversioned"))
+    
+    def predict(self, text: str, top_k: int = 1) -> Dict[str, Any]:
         """
         Predict the class and score for a single text
         
         Args:
             text: Input text to classify
+            top_k: Number of ranked candidate classes to return
             
         Returns:
             Dictionary with prediction results
         """
+        return self.predict_batch([text], top_k)[0]
+    
+    def predict_batch(
+        self,
+        texts: List[str],
+        top_k: int = 1,
+        timings: Dict[str, float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Predict classes and scores for multiple texts
+        
+        The whole batch is vectorized with a single sparse transform and
+        scored with a single model call, so the per-document overhead is
+        paid once per batch instead of once per text.
+        
+        Args:
+            texts: List of input texts to classify
+            top_k: Number of ranked candidate classes returned per text
+                (capped at the number of classes)
+            timings: Optional dictionary receiving the "vectorize" and
+                "score" durations in seconds
+            
+        Returns:
+            List of dictionaries with prediction results; "candidates"
+            holds the top_k {"class", "score"} pairs, best first
+        """
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
         
-        # Transform text
-        text_transformed = self.vectorizer.transform([text])
+        if len(texts) == 0:
+            return []
         
-        # Get prediction and score
-        prediction = self.model.predict(text_transformed)[0]
+        # Transform all texts at once
+        start = time.perf_counter()
+        texts_transformed = self.vectorizer.transform(texts)
+        vectorized = time.perf_counter()
         
-        # Get prediction probabilities or decision function scores
-        if hasattr(self.model, 'predict_proba'):
-            scores = self.model.predict_proba(text_transformed)[0]
-            max_score = float(max(scores))
-        else:
-            # For SVM, use decision function and normalize to [0,1]
-            decision_scores = self.model.decision_function(text_transformed)[0]
-            if len(decision_scores.shape) == 1:
-                # Binary classification - normalize using sigmoid
-                import numpy as np
-                max_score = float(1 / (1 + np.exp(-decision_scores[0])))
-            else:
-                # Multi-class - normalize using softmax
-                import numpy as np
-                exp_scores = np.exp(decision_scores - np.max(decision_scores))
-                softmax_scores = exp_scores / np.sum(exp_scores)
-                max_score = float(max(softmax_scores))
+        top, top_scores = rank_top_k(self._probability_matrix(texts_transformed), top_k)
+        labels = self.classes_[top].tolist()
         
-        return {
-            "tagClass": prediction,
-            "score": max_score,
-            "model_used": self.model_name
-        }
+        if timings is not None:
+            timings["vectorize"] = vectorized - start
+            timings["score"] = time.perf_counter() - vectorized
+        
+        return [
+            {
+                "tagClass": row_labels[0],
+                "score": row_scores[0],
+                "candidates": [
+                    {"class": label, "score": score} for label, score in zip(row_labels, row_scores)
+                ],
+                "model_used": self.model_name
+            }
+            for row_labels, row_scores in zip(labels, top_scores.tolist())
+        ]
     
-    def predict_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+    def score_features(self, X) -> np.ndarray:
         """
-        Predict classes and scores for multiple texts
+        Compute the class probabilities of an already vectorized batch
+        
+        Lets several models that share one vectorizer score a single
+        feature matrix (see vectorizer_key).
         
         Args:
-            texts: List of input texts to classify
+            X: Sparse feature matrix returned by this model's vectorizer
+            
+        Returns:
+            (n_rows, n_classes) matrix, columns in the order of classes_
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
+        return self._probability_matrix(X)
+    
+    @property
+    def vectorizer_key(self) -> str:
+        """Fingerprint of the fitted vectorizer (equal keys produce equal features)"""
+        vectorizer, key = self._fingerprint
+        if vectorizer is not self.vectorizer:
+            key = vectorizer_fingerprint(self.vectorizer)
+            self._fingerprint = (self.vectorizer, key)
+        return key
+    
+    def _probability_matrix(self, X) -> np.ndarray:
+        """
+        Compute the class probabilities of every row with one model call
+        
+        Calibrated models map the raw scores through the calibration fitted
+        at training time. Models saved without one fall back to their own
+        predict_proba, or to a softmax over the decision margins.
+        
+        Args:
+            X: Sparse feature matrix returned by the vectorizer
             
         Returns:
-            List of dictionaries with prediction results
+            (n_rows, n_classes) matrix, columns in the order of classes_
         """
-        return [self.predict(text) for text in texts]
+        scores = raw_scores(self.model, X)
+        if self.calibrator is not None:
+            return self.calibrator.transform(scores)
+        if not hasattr(self.model, 'decision_function'):
+            return scores
+        return softmax(scores)
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the trained model"""
@@ -139,12 +536,82 @@ class BaseClassifier(ABC):
             "metadata": self.metadata
         }
     
-    @abstractmethod
     def save_model(self, path: str) -> None:
-        """Save the trained model to disk"""
-        pass
+        """
+        Save the trained model and vectorizer to disk
+        
+        The layout follows PERSISTENCE_CONFIG["format"]: "joblib" writes
+        model.pkl/vectorizer.pkl pickles, "npy" writes memory-mappable
+        arrays (see models/array_format.py).
+        
+        Args:
+            path: Directory path to save the model
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before saving")
+        
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        
+        if PERSISTENCE_CONFIG["format"] == "npy":
+            save_array_artifacts(self, path)
+        else:
+            # Save model
+            model_path = path / "model.pkl"
+            joblib.dump(self.model, model_path, compress=PERSISTENCE_CONFIG["compress"])
+            
+            # Save vectorizer
+            vectorizer_path = path / "vectorizer.pkl"
+            joblib.dump(self.vectorizer, vectorizer_path, compress=PERSISTENCE_CONFIG["compress"])
+            
+            # Drop array artifacts of a previous save so loading is unambiguous
+            (path / MANIFEST_FILE).unlink(missing_ok=True)
+        
+        # Save metadata
+        metadata_path = path / "metadata.json"
+        with open(metadata_path, 'w', encoding='utf-8') as f:
+            json.dump(self.metadata, f, indent=2, ensure_ascii=False)
+        
+        print(f"Model saved to {path}")
     
-    @abstractmethod
     def load_model(self, path: str) -> None:
-        """Load a trained model from disk"""
-        pass
+        """
+        Load a trained model and vectorizer from disk
+        
+        Args:
+            path: Directory path where the model is saved
+        """
+        path = Path(path)
+        
+        if has_array_artifacts(path):
+            load_array_artifacts(self, path)
+        else:
+            # Load model
+            model_path = path / "model.pkl"
+            if not model_path.exists():
+                raise FileNotFoundError(f"Model file not found: {model_path}")
+            self.model = joblib.load(model_path)
+            
+            # Load vectorizer
+            vectorizer_path = path / "vectorizer.pkl"
+            if not vectorizer_path.exists():
+                raise FileNotFoundError(f"Vectorizer file not found: {vectorizer_path}")
+            self.vectorizer = joblib.load(vectorizer_path)
+        
+        # Load metadata
+        metadata_path = path / "metadata.json"
+        if metadata_path.exists():
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                self.metadata = json.load(f)
+        
+        calibration = self.metadata.get("calibration")
+        self.calibrator = ScoreCalibrator.from_dict(calibration) if calibration else None
+        
+        # Models saved before n_jobs became training-only still ask for every core
+        self._use_single_core()
+        
+        # Set classes and training status
+        self.classes_ = self.model.classes_
+        self.is_trained = True
+        
+        print(f"Model loaded from {path}")
@@ -0,0 +1,182 @@
+"""
+Calibration of classifier scores into probabilities
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+
+CALIBRATION_METHODS = ("sigmoid", "isotonic")
+
+
+def raw_scores(model, X) -> np.ndarray:
+    """
+    Uncalibrated per-class scores of a fitted model as an (n_samples, n_classes) matrix
+
+    Uses decision_function when the model has one (margins of linear
+    models), otherwise predict_proba. Binary margins are expanded to two
+    columns (-margin, margin).
+    """
+    if hasattr(model, "decision_function"):
+        scores = model.decision_function(X)
+        if scores.ndim == 1:
+            return np.column_stack([-scores, scores])
+        return scores
+    return model.predict_proba(X)
+
+
+def softmax(scores: np.ndarray) -> np.ndarray:
+    """Row-wise softmax of a score matrix"""
+    exponentials = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return exponentials / exponentials.sum(axis=1, keepdims=True)
+
+
+class ScoreCalibrator:
+    """
+    One-vs-rest calibration of a score matrix
+
+    Fits, per class, a map from that class's raw score to the probability
+    of the class: a sigmoid (Platt scaling) or a monotone step function
+    (isotonic regression). The per-class probabilities are normalized to
+    sum to one. Both maps are applied to a whole batch matrix with a
+    handful of NumPy operations, and their parameters are plain lists
+    stored in the model metadata.
+    """
+
+    def __init__(self, method: str = "sigmoid"):
+        """
+        Args:
+            method: "sigmoid" (Platt scaling) or "isotonic"
+        """
+        if method not in CALIBRATION_METHODS:
+            raise ValueError(f"Unsupported calibration method: {method}. Available: {list(CALIBRATION_METHODS)}")
+        self.method = method
+        self.binary = False
+        self.slopes: Optional[np.ndarray] = None
+        self.intercepts: Optional[np.ndarray] = None
+        self.thresholds = None
+        self.values = None
+
+    def fit(self, scores: np.ndarray, y: np.ndarray) -> "ScoreCalibrator":
+        """
+        Fit the per-class maps
+
+        Args:
+            scores: (n_samples, n_classes) raw scores of held-out samples
+            y: Class index of every sample
+
+        Returns:
+            The fitted calibrator
+        """
+        n_classes = scores.shape[1]
+        # Two columns are the two sides of one binary margin: calibrate it once
+        self.binary = n_classes == 2
+        columns = [1] if self.binary else range(n_classes)
+
+        slopes, intercepts, thresholds, values = [], [], [], []
+        for column in columns:
+            target = (y == column).astype(int)
+            positives = int(target.sum())
+
+            if self.method == "sigmoid":
+                if 0 < positives < len(target):
+                    platt = LogisticRegression(C=1e4).fit(scores[:, [column]], target)
+                    slopes.append(float(platt.coef_[0, 0]))
+                    intercepts.append(float(platt.intercept_[0]))
+                else:
+                    # No contrast to learn from: fall back to the smoothed class prior
+                    prior = (positives + 1) / (len(target) + 2)
+                    slopes.append(0.0)
+                    intercepts.append(float(np.log(prior / (1 - prior))))
+            else:
+                isotonic = IsotonicRegression(out_of_bounds="clip", y_min=0.0, y_max=1.0)
+                isotonic.fit(scores[:, column], target)
+                thresholds.append(isotonic.X_thresholds_.tolist())
+                values.append(isotonic.y_thresholds_.tolist())
+
+        if self.method == "sigmoid":
+            self.slopes, self.intercepts = np.array(slopes), np.array(intercepts)
+        else:
+            self.thresholds, self.values = thresholds, values
+        return self
+
+    def transform(self, scores: np.ndarray) -> np.ndarray:
+        """
+        Map a raw score matrix to calibrated probabilities
+
+        Args:
+            scores: (n_samples, n_classes) raw scores
+
+        Returns:
+            (n_samples, n_classes) probabilities, rows summing to one
+        """
+        columns = scores[:, [1]] if self.binary else scores
+
+        if self.method == "sigmoid":
+            probabilities = 1 / (1 + np.exp(-(columns * self.slopes + self.intercepts)))
+        else:
+            probabilities = np.column_stack([
+                np.interp(columns[:, i], self.thresholds[i], self.values[i]) for i in range(columns.shape[1])
+            ])
+
+        if self.binary:
+            return np.column_stack([1 - probabilities[:, 0], probabilities[:, 0]])
+
+        totals = probabilities.sum(axis=1, keepdims=True)
+        # Rows where every class map returned 0 get a uniform distribution
+        uniform = np.full_like(probabilities, 1 / probabilities.shape[1])
+        return np.divide(probabilities, totals, out=uniform, where=totals > 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the fitted parameters (JSON compatible)"""
+        params: Dict[str, Any] = {"method": self.method, "binary": self.binary}
+        if self.method == "sigmoid":
+            params.update(slopes=self.slopes.tolist(), intercepts=self.intercepts.tolist())
+        else:
+            params.update(thresholds=self.thresholds, values=self.values)
+        return params
+
+    @classmethod
+    def from_dict(cls, params: Dict[str, Any]) -> "ScoreCalibrator":
+        """Rebuild a calibrator serialized by to_dict"""
+        calibrator = cls(params["method"])
+        calibrator.binary = params["binary"]
+        if calibrator.method == "sigmoid":
+            calibrator.slopes = np.array(params["slopes"])
+            calibrator.intercepts = np.array(params["intercepts"])
+        else:
+            calibrator.thresholds = [np.array(column) for column in params["thresholds"]]
+            calibrator.values = [np.array(column) for column in params["values"]]
+        return calibrator
+
+
+def out_of_fold_scores(model, X, y: np.ndarray, classes: np.ndarray, cv: int, random_state: int = 42) -> np.ndarray:
+    """
+    Raw scores of every training sample from a model fitted without it
+
+    Args:
+        model: Unfitted (or fitted) estimator to clone for every fold
+        X: Training feature matrix
+        y: Training labels
+        classes: Classes of the final model (column order of the result)
+        cv: Number of folds
+        random_state: Seed of the fold assignment
+
+    Returns:
+        (n_samples, n_classes) matrix of held-out raw scores
+    """
+    y = np.asarray(y)
+    scores = np.zeros((X.shape[0], len(classes)))
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+
+    for train_index, test_index in folds.split(np.zeros(len(y)), y):
+        fold_model = clone(model).fit(X[train_index], y[train_index])
+        fold_scores = raw_scores(fold_model, X[test_index])
+        # Classes missing from this fold's training part get the lowest score of the row
+        aligned = np.repeat(fold_scores.min(axis=1, keepdims=True), len(classes), axis=1)
+        aligned[:, np.searchsorted(classes, fold_model.classes_)] = fold_scores
+        scores[test_index] = aligned
+    return scores
@@ -0,0 +1,27 @@
+"""
+Decision Tree Classifier implementation
+"""
+from typing import Dict, Any
+from sklearn.tree import DecisionTreeClassifier as SklearnDecisionTreeClassifier
+from .base_classifier import BaseClassifier
+
+
+class DecisionTreeClassifier(BaseClassifier):
+    """
+    Decision Tree Classifier over the TF-IDF features
+    """
+    
+    def __init__(self):
+        super().__init__("decision_tree")
+    
+    def _create_model(self, **params) -> SklearnDecisionTreeClassifier:
+        """Create DecisionTreeClassifier with the given parameters"""
+        return SklearnDecisionTreeClassifier(**params)
+    
+    def _get_model_params(self) -> Dict[str, Any]:
+        """Get Decision Tree-specific parameters"""
+        return {
+            "max_depth": 10,
+            "class_weight": "balanced",
+            "random_state": 42
+        }
@@ -4,6 +4,9 @@ Model factory for creating different types of classifiers
 from typing import Dict, Type
 from .base_classifier import BaseClassifier
 from .svm_classifier import SVMClassifier
+from .decision_tree_classifier import DecisionTreeClassifier
+from .random_forest_classifier import RandomForestClassifier
+from .naive_bayes_classifier import ComplementNBClassifier
 
 
 class ModelFactory:
@@ -13,9 +16,10 @@ class ModelFactory:
     
     _models: Dict[str, Type[BaseClassifier]] = {
         "svm": SVMClassifier,
+        "decision_tree": DecisionTreeClassifier,
+        "random_forest": RandomForestClassifier,
+        "complement_nb": ComplementNBClassifier,
         # Add more models here as they are implemented
-        # "decision_tree": DecisionTreeClassifier,
-        # "random_forest": RandomForestClassifier,
     }
     
     @classmethod
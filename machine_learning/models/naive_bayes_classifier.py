@@ -0,0 +1,28 @@
+"""
+Complement Naive Bayes Classifier implementation
+"""
+from typing import Dict, Any
+from sklearn.naive_bayes import ComplementNB
+from .base_classifier import BaseClassifier
+
+
+class ComplementNBClassifier(BaseClassifier):
+    """
+    Complement Naive Bayes Classifier
+    
+    A Naive Bayes variant suited to imbalanced text classes; trains in a
+    single pass over the data and supports incremental updates.
+    """
+    
+    def __init__(self):
+        super().__init__("complement_nb")
+    
+    def _create_model(self, **params) -> ComplementNB:
+        """Create ComplementNB with the given parameters"""
+        return ComplementNB(**params)
+    
+    def _get_model_params(self) -> Dict[str, Any]:
+        """Get Complement Naive Bayes-specific parameters"""
+        return {
+            "alpha": 0.3
+        }
@@ -0,0 +1,32 @@
+"""
+Random Forest Classifier implementation
+"""
+from typing import Dict, Any
+from sklearn.ensemble import RandomForestClassifier as SklearnRandomForestClassifier
+from .base_classifier import BaseClassifier
+
+
+class RandomForestClassifier(BaseClassifier):
+    """
+    Random Forest Classifier over the TF-IDF features
+    
+    Trees are fitted in parallel on all cores (n_jobs=-1). The fitted
+    forest predicts on one core, like the cross-validation folds and
+    calibration copies fit, since those already run side by side.
+    """
+    
+    def __init__(self):
+        super().__init__("random_forest")
+    
+    def _create_model(self, **params) -> SklearnRandomForestClassifier:
+        """Create RandomForestClassifier with the given parameters"""
+        return SklearnRandomForestClassifier(**params)
+    
+    def _get_model_params(self) -> Dict[str, Any]:
+        """Get Random Forest-specific parameters"""
+        return {
+            "n_estimators": 200,
+            "class_weight": "balanced",
+            "n_jobs": -1,
+            "random_state": 42
+        }
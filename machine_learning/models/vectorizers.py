@@ -0,0 +1,193 @@
+"""
+Text vectorizer backends selectable through MODEL_CONFIGS
+"""
+import hashlib
+import json
+from typing import Any, Dict, Iterable
+
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+
+class HashedTfidfVectorizer(TransformerMixin, BaseEstimator):
+    """
+    TF-IDF vectorizer over hashed features
+
+    Terms are mapped to columns with the hashing trick instead of a fitted
+    vocabulary, so the only learned state is a fixed-size IDF weight
+    array. Buckets outside the `min_df`/`max_df` range get an IDF of zero,
+    which drops them the same way TfidfVectorizer prunes its vocabulary.
+    """
+
+    def __init__(
+        self,
+        n_features: int = 2 ** 18,
+        ngram_range: tuple = (1, 1),
+        min_df: float = 1,
+        max_df: float = 1.0,
+        lowercase: bool = True,
+        norm: str = "l2",
+        smooth_idf: bool = True,
+        sublinear_tf: bool = False
+    ):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.min_df = min_df
+        self.max_df = max_df
+        self.lowercase = lowercase
+        self.norm = norm
+        self.smooth_idf = smooth_idf
+        self.sublinear_tf = sublinear_tf
+
+    def _get_hasher(self) -> HashingVectorizer:
+        """Build the stateless hashing vectorizer for the current parameters"""
+        return HashingVectorizer(
+            n_features=self.n_features,
+            ngram_range=tuple(self.ngram_range),
+            lowercase=self.lowercase,
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float64
+        )
+
+    def _document_frequency_bounds(self, n_documents: int):
+        """Translate min_df/max_df (counts or proportions) into document counts"""
+        min_count = self.min_df if isinstance(self.min_df, int) else self.min_df * n_documents
+        max_count = self.max_df if isinstance(self.max_df, int) else self.max_df * n_documents
+        return min_count, max_count
+
+    def fit(self, raw_documents: Iterable[str], y=None) -> "HashedTfidfVectorizer":
+        """
+        Learn the IDF weights of the hashed features
+
+        Args:
+            raw_documents: Iterable of text documents
+
+        Returns:
+            The fitted vectorizer
+        """
+        counts = self._get_hasher().transform(raw_documents)
+        # Hashed rows are in canonical CSR form, so every index is one document hit
+        document_frequency = np.bincount(counts.indices, minlength=self.n_features)
+        self._set_idf(document_frequency, counts.shape[0])
+        # Frequencies accumulated by earlier partial_fit calls no longer apply
+        self.__dict__.pop("document_frequency_", None)
+        return self
+
+    def partial_fit(self, raw_documents: Iterable[str], y=None) -> "HashedTfidfVectorizer":
+        """
+        Update the IDF weights with another chunk of documents
+
+        Document frequencies are accumulated across calls, so fitting a
+        corpus chunk by chunk yields the same weights as one fit call.
+
+        Args:
+            raw_documents: Iterable of text documents
+
+        Returns:
+            The fitted vectorizer
+        """
+        counts = self._get_hasher().transform(raw_documents)
+        document_frequency = np.bincount(counts.indices, minlength=self.n_features)
+        if hasattr(self, "document_frequency_"):
+            document_frequency += self.document_frequency_
+            n_documents = self.n_documents_ + counts.shape[0]
+        else:
+            n_documents = counts.shape[0]
+        self.document_frequency_ = document_frequency
+        self._set_idf(document_frequency, n_documents)
+        return self
+
+    def _set_idf(self, document_frequency: np.ndarray, n_documents: int) -> None:
+        """Compute idf_ from per-bucket document frequencies"""
+        smoothing = int(self.smooth_idf)
+        idf = np.log((n_documents + smoothing) / (document_frequency + smoothing)) + 1
+
+        min_count, max_count = self._document_frequency_bounds(n_documents)
+        idf[(document_frequency < min_count) | (document_frequency > max_count)] = 0.0
+
+        self.idf_ = idf.astype(np.float32)
+        self.n_documents_ = n_documents
+
+    def transform(self, raw_documents: Iterable[str]):
+        """
+        Transform documents to a TF-IDF weighted sparse matrix
+
+        Args:
+            raw_documents: Iterable of text documents
+
+        Returns:
+            CSR matrix of shape (n_documents, n_features)
+        """
+        if not hasattr(self, "idf_"):
+            raise ValueError("The hashed TF-IDF vectorizer is not fitted")
+
+        X = self._get_hasher().transform(raw_documents)
+        if self.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1
+        X.data *= self.idf_[X.indices]
+        X.eliminate_zeros()
+
+        if self.norm:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
+
+    def fit_transform(self, raw_documents: Iterable[str], y=None):
+        """Fit the IDF weights and transform the same documents"""
+        raw_documents = list(raw_documents)
+        return self.fit(raw_documents).transform(raw_documents)
+
+
+VECTORIZER_BACKENDS = {
+    "tfidf": TfidfVectorizer,
+    "hashing": HashedTfidfVectorizer,
+}
+
+
+def build_vectorizer(vectorizer_params: Dict[str, Any] = None):
+    """
+    Create an unfitted vectorizer from MODEL_CONFIGS-style parameters
+
+    Args:
+        vectorizer_params: Vectorizer parameters; the optional "backend" key
+            selects the implementation ("tfidf" by default)
+
+    Returns:
+        Vectorizer instance
+
+    Raises:
+        ValueError: If the backend is not supported
+    """
+    params = dict(vectorizer_params or {})
+    backend = params.pop("backend", "tfidf")
+
+    if backend not in VECTORIZER_BACKENDS:
+        raise ValueError(
+            f"Unsupported vectorizer backend: {backend}. "
+            f"Available backends: {list(VECTORIZER_BACKENDS.keys())}"
+        )
+
+    # Parameters read back from JSON metadata turn tuples into lists
+    if "ngram_range" in params:
+        params["ngram_range"] = tuple(params["ngram_range"])
+
+    return VECTORIZER_BACKENDS[backend](**params)
+
+
+def vectorizer_fingerprint(vectorizer) -> str:
+    """
+    Identify a fitted vectorizer by its parameters and learned weights
+
+    Two vectorizers with the same fingerprint produce the same feature
+    matrix, e.g. the vectorizer shared by models trained on one feature
+    store entry, whether they were loaded from joblib or npy artifacts.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(type(vectorizer).__name__.encode("utf-8"))
+    digest.update(json.dumps(vectorizer.get_params(), sort_keys=True, default=str).encode("utf-8"))
+    digest.update(str(len(getattr(vectorizer, "vocabulary_", ()))).encode("utf-8"))
+    digest.update(np.ascontiguousarray(vectorizer.idf_).tobytes())
+    return digest.hexdigest()
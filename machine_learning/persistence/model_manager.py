@@ -1,17 +1,49 @@
 """
 Model management utilities for saving and loading models
 """
+import copy
+import json
 import os
+import uuid
+import shutil
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
-from models.base_classifier import BaseClassifier
+from typing import Any, Dict, List, Optional, Tuple
+from models.base_classifier import BaseClassifier, new_version_id
 from models.model_factory import ModelFactory
-from config import MODELS_DIR
+from models.array_format import has_array_artifacts
+from cache.backends import create_cache_backend
+from cache.prediction_cache import PredictionCache
+from utils.file_lock import file_lock
+from utils.logger import setup_logger
+from utils.metrics import STAGE_SECONDS
+from utils.profiling import profiler
+from config import CACHE_CONFIG, MODELS_DIR, MODEL_VERSIONING, ONLINE_LEARNING_CONFIG
+
+CURRENT_POINTER = "CURRENT"
+VERSIONS_DIR = "versions"
+UPDATE_LOG = "updates.jsonl"
+UPDATE_LOCK = ".update.lock"
+
+logger = setup_logger()
 
 
 class ModelManager:
     """
     Manages model persistence and loading
+    
+    Every save goes to its own directory under
+    `<models_dir>/<model_type>/versions/<version>` and a `CURRENT` file
+    points at the version being served. Switching versions loads the new
+    model completely before the pointer and the in-memory reference are
+    replaced, so requests never see a half-written or half-loaded model.
+    Models saved before versioning (files directly in `<model_type>/`)
+    are still served until the first versioned save.
+    
+    Every process serving a model (e.g. the pre-forked API workers)
+    watches the `CURRENT` file, so a version activated by any of them is
+    loaded, warmed up and served by all of them.
     """
     
     def __init__(self, models_dir: str = None):
@@ -24,14 +56,30 @@ class ModelManager:
         self.models_dir = Path(models_dir or MODELS_DIR)
         self.models_dir.mkdir(exist_ok=True)
         self._loaded_models: Dict[str, BaseClassifier] = {}
+        # Serializes disk loads when several inference threads miss the cache at once
+        self._load_lock = threading.Lock()
+        # Serializes version switches (pointer write + reference swap)
+        self._swap_lock = threading.Lock()
+        # model type -> stamp of the CURRENT file the loaded model was read from
+        self._pointer_stamps: Dict[str, Optional[tuple]] = {}
+        # model type -> monotonic time of the last CURRENT check
+        self._pointer_checked_at: Dict[str, float] = {}
+        self.prediction_cache = PredictionCache(
+            backend=create_cache_backend(CACHE_CONFIG) if CACHE_CONFIG["enabled"] else None,
+            enabled=CACHE_CONFIG["enabled"]
+        )
     
-    def save_model(self, classifier: BaseClassifier, model_type: str) -> str:
+    def save_model(self, classifier: BaseClassifier, model_type: str, activate: bool = True) -> str:
         """
-        Save a trained classifier
+        Save a trained classifier as a new version
+        
+        The files are written to a staging directory that is renamed into
+        place once complete.
         
         Args:
             classifier: Trained classifier instance
             model_type: Type of the model (e.g., 'svm')
+            activate: Whether to serve the new version right away
             
         Returns:
             Path where the model was saved
@@ -39,15 +87,373 @@ class ModelManager:
         if not classifier.is_trained:
             raise ValueError("Cannot save untrained model")
         
-        model_path = self.models_dir / model_type
-        classifier.save_model(str(model_path))
+        version = classifier.version
+        if version == "unversioned":
+            version = new_version_id()
+            classifier.metadata["version"] = version
+        
+        versions_dir = self.models_dir / model_type / VERSIONS_DIR
+        versions_dir.mkdir(parents=True, exist_ok=True)
+        
+        staging_path = versions_dir / f".{version}.staging"
+        if staging_path.exists():
+            shutil.rmtree(staging_path)
+        classifier.save_model(str(staging_path))
+        
+        model_path = versions_dir / version
+        if model_path.exists():
+            shutil.rmtree(model_path)
+        os.replace(staging_path, model_path)
+        
+        if activate:
+            self._activate(model_type, version, classifier)
         
         return str(model_path)
     
+    def swap(self, model_type: str, version: str) -> BaseClassifier:
+        """
+        Serve another saved version of a model
+        
+        The version is loaded and warmed up while the current one keeps
+        serving; only then are the pointer and reference switched.
+        
+        Args:
+            model_type: Type of model
+            version: Saved version to activate
+            
+        Returns:
+            The newly active classifier
+            
+        Raises:
+            ValueError: If the version is not a saved version of the model
+        """
+        if version not in self.list_versions(model_type):
+            raise ValueError(f"No saved version '{version}' for model: {model_type}")
+        
+        model_path = self.models_dir / model_type / VERSIONS_DIR / version
+        if not self._has_model_files(model_path):
+            raise FileNotFoundError(f"No model files in version '{version}' of model: {model_type}")
+        
+        classifier = ModelFactory.create_classifier(model_type)
+        classifier.load_model(str(model_path))
+        self.warm_up(classifier)
+        
+        self._activate(model_type, version, classifier)
+        return classifier
+    
+    @staticmethod
+    def warm_up(classifier: BaseClassifier) -> None:
+        """
+        Materialize lazily loaded state (e.g. a memory-mapped vocabulary)
+        before the first real request hits a freshly loaded model
+        
+        Args:
+            classifier: Loaded classifier instance
+        """
+        classifier.predict_batch(["warm up"])
+    
+    def update_model(self, model_type: str, texts: List[str], labels: List[str]) -> Dict[str, Any]:
+        """
+        Incrementally train a model on new labeled samples
+        
+        The update is appended to `<model_type>/updates.jsonl` under a file
+        lock and then applied to the served model right away. Other API
+        processes apply the updates they find in the log when they next
+        check it (see MODEL_VERSIONING["pointer_check_seconds"]), so every
+        worker serves the same corrections. The log is saved as a new
+        version once it holds ONLINE_LEARNING_CONFIG["persist_every_updates"]
+        updates or its oldest one is ["persist_every_seconds"] old.
+        
+        Args:
+            model_type: Type of model to update
+            texts: List of text documents
+            labels: List of corresponding labels
+            
+        Returns:
+            Dictionary with the version served before and after the update,
+            whether a new version was saved and the number of logged
+            updates not saved yet
+        """
+        current = self.load_model(model_type)
+        # Reject samples the model cannot learn before they reach the shared log
+        current.validate_update(texts, labels)
+        
+        with file_lock(self.models_dir / model_type / UPDATE_LOCK):
+            self._append_update(model_type, texts, labels)
+            _, updates, _ = self._read_update_log(model_type)
+            persisted = self._update_log_due(updates)
+            if persisted:
+                classifier = self._apply_update_log(model_type)
+            else:
+                with self._load_lock:
+                    classifier = self._refresh(model_type)
+        
+        return {
+            "previous_version": current.version,
+            "version": classifier.version,
+            "persisted": persisted,
+            "pending_updates": 0 if persisted else len(updates)
+        }
+    
+    def persist_updates(self, model_type: Optional[str] = None, due_only: bool = False) -> List[str]:
+        """
+        Save the logged incremental updates as new versions
+        
+        Args:
+            model_type: Only save this model type (None saves all)
+            due_only: Only save logs that reached the ONLINE_LEARNING_CONFIG
+                size or age limit
+            
+        Returns:
+            Paths of the saved versions
+        """
+        model_types = [model_type] if model_type is not None else [
+            item.name for item in self.models_dir.iterdir() if (item / UPDATE_LOG).exists()
+        ]
+        
+        saved = []
+        for pending_type in model_types:
+            with file_lock(self.models_dir / pending_type / UPDATE_LOCK):
+                _, updates, _ = self._read_update_log(pending_type)
+                if not updates or (due_only and not self._update_log_due(updates)):
+                    continue
+                classifier = self._apply_update_log(pending_type)
+                saved.append(str(self.models_dir / pending_type / VERSIONS_DIR / classifier.version))
+        return saved
+    
+    @staticmethod
+    def _update_log_due(updates: List[Dict[str, Any]]) -> bool:
+        """Whether logged updates reached the size or age at which they are saved"""
+        return bool(updates) and (
+            len(updates) >= ONLINE_LEARNING_CONFIG["persist_every_updates"]
+            or time.time() - updates[0]["logged_at"] >= ONLINE_LEARNING_CONFIG["persist_every_seconds"]
+        )
+    
+    def _append_update(self, model_type: str, texts: List[str], labels: List[str]) -> None:
+        """Append an update to the log, creating it with a fresh id (the caller holds the update lock)"""
+        with open(self.models_dir / model_type / UPDATE_LOG, 'ab') as f:
+            lines = []
+            if f.tell() == 0:
+                # Tells a new log apart from a deleted one whose position a version recorded
+                lines.append({"log_id": uuid.uuid4().hex})
+            lines.append({"texts": texts, "labels": labels, "logged_at": time.time()})
+            # One write per update, so readers without the lock see whole lines or none
+            f.write("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines).encode("utf-8"))
+    
+    def _read_update_log(
+        self, model_type: str, position: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Optional[str], List[Dict[str, Any]], int]:
+        """
+        Read the update log of a model
+        
+        Args:
+            model_type: Type of model
+            position: {"id", "offset"} of the log a model already reflects;
+                only later updates are read if it names the current log
+            
+        Returns:
+            Tuple of (log id, updates oldest first, offset after the last
+            complete update); (None, [], 0) without a log
+        """
+        try:
+            f = open(self.models_dir / model_type / UPDATE_LOG, 'rb')
+        except FileNotFoundError:
+            return None, [], 0
+        
+        with f:
+            header = f.readline()
+            if not header.endswith(b"\n"):
+                return None, [], 0
+            log_id = json.loads(header)["log_id"]
+            if position is not None and position.get("id") == log_id:
+                f.seek(position["offset"])
+            
+            updates = []
+            offset = f.tell()
+            for line in f:
+                # A line still being appended by another process
+                if not line.endswith(b"\n"):
+                    break
+                updates.append(json.loads(line))
+                offset += len(line)
+        return log_id, updates, offset
+    
+    def _replay_updates(self, model_type: str, classifier: BaseClassifier) -> Tuple[BaseClassifier, int]:
+        """
+        Apply the logged updates a classifier does not reflect yet
+        
+        Returns:
+            Tuple of (updated copy, or the classifier itself when the log
+            has nothing new, number of updates read)
+        """
+        log_id, updates, offset = self._read_update_log(model_type, classifier.metadata.get("update_log"))
+        if not updates:
+            return classifier, 0
+        
+        updated = copy.copy(classifier)
+        for update in updates:
+            try:
+                updated.update(update["texts"], update["labels"])
+            except ValueError as e:
+                # e.g. a label missing from a version trained after the update was logged
+                logger.warning(f"Skipped a logged update of {model_type}: {e}")
+        updated.metadata = {**updated.metadata, "update_log": {"id": log_id, "offset": offset}}
+        return updated, len(updates)
+    
+    def _apply_logged_updates(self, model_type: str) -> Optional[BaseClassifier]:
+        """
+        Serve the loaded model with the updates logged since it was read
+        (the caller holds the load lock)
+        """
+        current = self._loaded_models.get(model_type)
+        if current is None:
+            return None
+        
+        classifier, count = self._replay_updates(model_type, current)
+        if not count:
+            return current
+        
+        with self._swap_lock:
+            # A version activated meanwhile (e.g. by a training job) wins
+            if self._loaded_models.get(model_type) is not current:
+                return self._loaded_models.get(model_type)
+            self._loaded_models[model_type] = classifier
+        self.prediction_cache.invalidate(model_type)
+        return classifier
+    
+    def _apply_update_log(self, model_type: str) -> BaseClassifier:
+        """
+        Apply the logged updates to the saved current version, save the
+        result as a new version and delete the log (the caller holds the
+        update lock)
+        """
+        # Start from the saved version, which other processes may have
+        # replaced since this one loaded its model
+        classifier = ModelFactory.create_classifier(model_type)
+        classifier.load_model(str(self._resolve_model_path(model_type)))
+        classifier, _ = self._replay_updates(model_type, classifier)
+        
+        self.warm_up(classifier)
+        # The version records the log position it reflects, so processes
+        # loading it before the log is deleted do not apply updates twice
+        self.save_model(classifier, model_type)
+        (self.models_dir / model_type / UPDATE_LOG).unlink()
+        return classifier
+    
+    def rollback(self, model_type: str) -> BaseClassifier:
+        """
+        Serve the version saved before the current one
+        
+        Args:
+            model_type: Type of model
+            
+        Returns:
+            The newly active classifier
+        """
+        versions = self.list_versions(model_type)
+        current = self.get_current_version(model_type)
+        older = [version for version in versions if current is None or version < current]
+        if not older:
+            raise ValueError(f"No previous version to roll back to for model: {model_type}")
+        
+        return self.swap(model_type, older[-1])
+    
+    def _activate(self, model_type: str, version: str, classifier: BaseClassifier) -> None:
+        """Point CURRENT at a version and swap the served classifier"""
+        with self._swap_lock:
+            pointer_path = self.models_dir / model_type / CURRENT_POINTER
+            staging_pointer = pointer_path.with_name(f".{CURRENT_POINTER}.staging")
+            staging_pointer.write_text(version, encoding='utf-8')
+            os.replace(staging_pointer, pointer_path)
+            
+            self._loaded_models[model_type] = classifier
+            self._pointer_stamps[model_type] = self._pointer_stamp(model_type)
+            self.prediction_cache.invalidate(model_type)
+            
+            self._prune_versions(model_type, version)
+    
+    def _prune_versions(self, model_type: str, current: str) -> None:
+        """Delete all but the newest MODEL_VERSIONING["keep_versions"] previous versions"""
+        others = [version for version in self.list_versions(model_type) if version != current]
+        stale = others[:max(len(others) - MODEL_VERSIONING["keep_versions"], 0)]
+        for version in stale:
+            # Memory-mapped files of a version still in use stay valid after unlinking
+            shutil.rmtree(self.models_dir / model_type / VERSIONS_DIR / version, ignore_errors=True)
+    
+    def list_versions(self, model_type: str) -> List[str]:
+        """
+        Get the saved versions of a model, oldest first
+        
+        Args:
+            model_type: Type of model
+            
+        Returns:
+            List of version identifiers
+        """
+        versions_dir = self.models_dir / model_type / VERSIONS_DIR
+        if not versions_dir.exists():
+            return []
+        return sorted(
+            item.name for item in versions_dir.iterdir()
+            if item.is_dir() and not item.name.startswith(".")
+        )
+    
+    def get_current_version(self, model_type: str) -> Optional[str]:
+        """
+        Get the version the CURRENT pointer refers to
+        
+        Args:
+            model_type: Type of model
+            
+        Returns:
+            Version identifier, or None for unversioned (legacy) models
+        """
+        pointer_path = self.models_dir / model_type / CURRENT_POINTER
+        if not pointer_path.exists():
+            return None
+        return pointer_path.read_text(encoding='utf-8').strip()
+    
+    def _pointer_stamp(self, model_type: str) -> Optional[tuple]:
+        """Identify the CURRENT file as written last (None without a pointer)"""
+        try:
+            stat = os.stat(self.models_dir / model_type / CURRENT_POINTER)
+        except FileNotFoundError:
+            return None
+        # CURRENT is replaced by a rename, so every write has a new inode
+        return (stat.st_ino, stat.st_mtime_ns)
+    
+    def _check_due(self, model_type: str, consume: bool = True) -> bool:
+        """
+        Whether CURRENT and the update log are due for a check, at most
+        every MODEL_VERSIONING["pointer_check_seconds"] per model type
+        
+        Args:
+            model_type: Type of model
+            consume: Start the next interval when a check is due
+        """
+        now = time.monotonic()
+        if now - self._pointer_checked_at.get(model_type, 0.0) < MODEL_VERSIONING["pointer_check_seconds"]:
+            return False
+        if consume:
+            self._pointer_checked_at[model_type] = now
+        return True
+    
+    def _resolve_model_path(self, model_type: str) -> Path:
+        """Directory holding the files of the current version"""
+        version = self.get_current_version(model_type)
+        if version is None:
+            return self.models_dir / model_type
+        return self.models_dir / model_type / VERSIONS_DIR / version
+    
     def load_model(self, model_type: str, force_reload: bool = False) -> BaseClassifier:
         """
         Load a trained model
         
+        A loaded model is served from memory until CURRENT points at
+        another version, which is then loaded and warmed up while the
+        loaded one keeps serving the other threads. Updates logged by
+        other processes are applied to it in the same way.
+        
         Args:
             model_type: Type of model to load (e.g., 'svm')
             force_reload: Force reload even if already in memory
@@ -55,24 +461,123 @@ class ModelManager:
         Returns:
             Loaded classifier instance
         """
-        if not force_reload and model_type in self._loaded_models:
-            return self._loaded_models[model_type]
+        classifier = self._loaded_models.get(model_type)
+        if classifier is not None and not force_reload:
+            if not self._check_due(model_type):
+                return classifier
+            # Keep serving the loaded version while another thread reloads
+            if not self._load_lock.acquire(blocking=False):
+                return classifier
+            try:
+                return self._refresh(model_type) or classifier
+            finally:
+                self._load_lock.release()
+        
+        with self._load_lock:
+            # Another thread may have loaded the model while we waited
+            classifier = self._loaded_models.get(model_type)
+            if not force_reload and classifier is not None:
+                return classifier
+            
+            if force_reload:
+                self.prediction_cache.invalidate(model_type)
+            return self._load_from_disk(model_type)
+    
+    def _refresh(self, model_type: str) -> Optional[BaseClassifier]:
+        """
+        Serve the version CURRENT points at with the updates logged since
+        (the caller holds the load lock)
+        """
+        if self._pointer_stamp(model_type) != self._pointer_stamps.get(model_type):
+            return self._reload(model_type)
+        return self._apply_logged_updates(model_type)
+    
+    def _reload(self, model_type: str) -> BaseClassifier:
+        """Load and warm up the version CURRENT points at, then swap it in"""
+        stamp = self._pointer_stamp(model_type)
+        classifier = ModelFactory.create_classifier(model_type)
+        classifier.load_model(str(self._resolve_model_path(model_type)))
+        classifier, _ = self._replay_updates(model_type, classifier)
+        self.warm_up(classifier)
         
+        with self._swap_lock:
+            self._loaded_models[model_type] = classifier
+            self._pointer_stamps[model_type] = stamp
+        self.prediction_cache.invalidate(model_type)
+        return classifier
+    
+    def _load_from_disk(self, model_type: str) -> BaseClassifier:
+        """Load the current version of a model from disk and cache it"""
         # Create new classifier instance
         classifier = ModelFactory.create_classifier(model_type)
         
         # Load the trained model
-        model_path = self.models_dir / model_type
+        stamp = self._pointer_stamp(model_type)
+        model_path = self._resolve_model_path(model_type)
         if not model_path.exists():
             raise FileNotFoundError(f"No saved model found for type: {model_type}")
         
         classifier.load_model(str(model_path))
+        classifier, _ = self._replay_updates(model_type, classifier)
         
         # Cache the loaded model
         self._loaded_models[model_type] = classifier
+        self._pointer_stamps[model_type] = stamp
         
         return classifier
     
+    def predict_batch(self, model_type: str, texts: List[str], top_k: int = 1) -> List[Dict[str, Any]]:
+        """
+        Classify texts, serving repeated texts from the prediction cache
+        
+        Args:
+            model_type: Type of model to use
+            texts: Texts to classify
+            top_k: Number of ranked candidate classes per text
+            
+        Returns:
+            List of dictionaries with prediction results
+        """
+        classifier = self.load_model(model_type)
+        version = classifier.version
+        
+        results = self.prediction_cache.get_many(model_type, version, texts, top_k=top_k)
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            timings = {}
+            if profiler.enabled:
+                predictions = profiler.call(classifier.predict_batch, missing_texts, top_k, timings)
+            else:
+                predictions = classifier.predict_batch(missing_texts, top_k, timings)
+            for stage, seconds in timings.items():
+                STAGE_SECONDS.labels(stage, model_type).observe(seconds)
+            self.prediction_cache.put_many(model_type, version, missing_texts, predictions, top_k)
+            for i, prediction in zip(missing, predictions):
+                results[i] = prediction
+        
+        return results
+    
+    def get_cached_prediction(self, model_type: str, text: str, top_k: int = 1) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result without touching the disk
+        
+        Args:
+            model_type: Type of model
+            text: Text to look up
+            top_k: Number of ranked candidate classes
+            
+        Returns:
+            Cached prediction, or None if the model is not loaded or the text is not cached
+        """
+        classifier = self._loaded_models.get(model_type)
+        if classifier is None or self._check_due(model_type, consume=False):
+            return None
+        # A miss here falls through to predict_batch, which counts it
+        return self.prediction_cache.get_many(
+            model_type, classifier.version, [text], count_misses=False, top_k=top_k
+        )[0]
+    
     def get_available_models(self) -> List[str]:
         """
         Get list of available saved models
@@ -82,7 +587,7 @@ class ModelManager:
         """
         available = []
         for item in self.models_dir.iterdir():
-            if item.is_dir() and (item / "model.pkl").exists():
+            if item.is_dir() and self._has_model_files(self._resolve_model_path(item.name)):
                 available.append(item.name)
         return available
     
@@ -96,19 +601,18 @@ class ModelManager:
         Returns:
             Dictionary with model information
         """
-        model_path = self.models_dir / model_type
+        model_path = self._resolve_model_path(model_type)
         metadata_path = model_path / "metadata.json"
         
         if not metadata_path.exists():
             raise FileNotFoundError(f"No metadata found for model: {model_type}")
         
-        import json
         with open(metadata_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     
     def delete_model(self, model_type: str) -> bool:
         """
-        Delete a saved model
+        Delete a saved model, including all of its versions
         
         Args:
             model_type: Type of model to delete
@@ -121,12 +625,13 @@ class ModelManager:
         if not model_path.exists():
             return False
         
-        import shutil
         shutil.rmtree(model_path)
         
         # Remove from cache if loaded
-        if model_type in self._loaded_models:
-            del self._loaded_models[model_type]
+        with self._swap_lock:
+            self._loaded_models.pop(model_type, None)
+            self._pointer_stamps.pop(model_type, None)
+        self.prediction_cache.invalidate(model_type)
         
         return True
     
@@ -140,5 +645,10 @@ class ModelManager:
         Returns:
             True if model is available, False otherwise
         """
-        model_path = self.models_dir / model_type
-        return model_path.exists() and (model_path / "model.pkl").exists()
+        model_path = self._resolve_model_path(model_type)
+        return model_path.exists() and self._has_model_files(model_path)
+    
+    @staticmethod
+    def _has_model_files(path: Path) -> bool:
+        """Check for a saved model in either the joblib or the npy format"""
+        return (path / "model.pkl").exists() or has_array_artifacts(path)
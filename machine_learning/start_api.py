@@ -3,11 +3,23 @@
 Startup script for ML Classification API
 Handles environment setup, model training, and API startup
 """
+import argparse
+import gc
 import os
+import signal
+import socket
 import sys
 import subprocess
+import time
+import traceback
 from pathlib import Path
 
+# A worker exiting sooner than this after its start is restarted with a
+# growing delay (up to MAX_RESTART_DELAY seconds), so a worker that
+# crashes at startup does not make the supervisor fork in a tight loop
+MIN_WORKER_UPTIME = 10.0
+MAX_RESTART_DELAY = 30.0
+
 def check_environment():
     """Check if the environment is properly set up"""
     print("🔍 Checking environment...")
@@ -52,9 +64,10 @@ def check_dependencies():
 def check_model():
     """Check if model is trained and available"""
     print("🔍 Checking model...")
+    from persistence.model_manager import ModelManager
     
-    model_path = Path("saved_models/svm")
-    if model_path.exists() and (model_path / "model.pkl").exists():
+    # Follows the CURRENT pointer to the served version, in either artifact format
+    if ModelManager().is_model_available("svm"):
         print("✅ SVM model is available")
         return True
     else:
@@ -90,8 +103,184 @@ def start_api():
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to start API server: {e}")
 
+def preload_models():
+    """Load and warm up every saved model in the shared model manager"""
+    from api.endpoints import model_manager
+    
+    for model_type in model_manager.get_available_models():
+        classifier = model_manager.load_model(model_type)
+        # Decode lazily loaded state (e.g. the npy vocabulary) before forking,
+        # so the workers share one copy instead of each building its own
+        model_manager.warm_up(classifier)
+    return model_manager.get_available_models()
+
+def run_worker(app, sock):
+    """Serve the app on an inherited listening socket (runs in a forked child)"""
+    import uvicorn
+    
+    config = uvicorn.Config(app, log_level="info")
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+def fork_worker(app, sock):
+    """
+    Fork a worker serving the app; returns its pid in the parent
+    
+    The child never returns: it exits with status 0 when the server stops
+    normally and nonzero when it fails, so the supervisor can tell a crash
+    from a shutdown.
+    """
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            # Uvicorn installs its own handlers; drop the supervisor's
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            run_worker(app, sock)
+            status = 0
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+    return pid
+
+def report_worker_memory(parent_pid, worker_pids):
+    """Print RSS and PSS of the parent and every worker"""
+    from utils.memory import get_process_memory
+    
+    print(f"{'process':<16} {'pid':>7} {'rss MB':>8} {'pss MB':>8} {'shared MB':>10} {'private MB':>11}")
+    total_pss = 0.0
+    for name, pid in [("parent", parent_pid)] + [(f"worker-{i}", pid) for i, pid in enumerate(worker_pids)]:
+        try:
+            stats = get_process_memory(pid)
+        except FileNotFoundError:
+            continue
+        total_pss += stats.get("pss_mb", 0.0)
+        print(
+            f"{name:<16} {pid:>7} {stats['rss_mb']:8.1f} {stats.get('pss_mb', 0.0):8.1f} "
+            f"{stats.get('shared_mb', 0.0):10.1f} {stats.get('private_mb', 0.0):11.1f}"
+        )
+    print(f"{'total (pss)':<16} {'':>7} {'':>8} {total_pss:8.1f}")
+
+def start_api_production(workers, host, port, report_interval):
+    """
+    Start the API with pre-forked workers sharing preloaded models
+    
+    Models are loaded once in the parent, then the parent forks the
+    workers. The model pages are shared copy-on-write, so adding workers
+    does not multiply the memory taken by the vocabulary and weights.
+    
+    The parent supervises the workers: one that exits before SIGINT or
+    SIGTERM (a crash, or a server that stopped on its own) is replaced by
+    a new fork of the parent.
+    """
+    if not hasattr(os, "fork"):
+        print("⚠️  Pre-fork mode needs os.fork; starting a single process instead")
+        start_api()
+        return
+    
+    print(f"🚀 Starting API server with {workers} pre-forked workers...")
+    from app import app
+    
+    loaded = preload_models()
+    print(f"✅ Preloaded models: {loaded}")
+    
+    # Any worker answering /metrics reports the counts of all of them
+    from config import METRICS_CONFIG
+    from utils.metrics import registry
+    registry.enable_multiprocess(METRICS_CONFIG["multiprocess_dir"])
+    
+    # Move everything allocated so far out of the garbage collector's reach,
+    # so collections in the workers do not write to (and copy) shared pages
+    gc.collect()
+    gc.freeze()
+    
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    print(f"📍 API will be available at: http://localhost:{port}")
+    
+    started = {}  # pid -> start time of every running worker
+    for _ in range(workers):
+        started[fork_worker(app, sock)] = time.monotonic()
+    
+    stopping = False
+    
+    def stop_workers(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(started):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGINT, stop_workers)
+    signal.signal(signal.SIGTERM, stop_workers)
+    
+    # Give the workers a moment to start before the first memory report
+    time.sleep(2)
+    report_worker_memory(os.getpid(), sorted(started))
+    
+    restarts = []  # start times of the replacement workers still to fork
+    restart_delay = 0.0
+    last_report = time.monotonic()
+    while started or (restarts and not stopping):
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            pid = 0
+        if pid:
+            uptime = time.monotonic() - started.pop(pid)
+            if not stopping:
+                print(f"⚠️  Worker {pid} exited with status {os.waitstatus_to_exitcode(status)} "
+                      f"after {uptime:.1f}s; starting a replacement")
+                # Back off while workers keep failing right after their start
+                restart_delay = 0.0 if uptime >= MIN_WORKER_UPTIME else min(
+                    max(1.0, restart_delay * 2), MAX_RESTART_DELAY
+                )
+                restarts.append(time.monotonic() + restart_delay)
+            continue
+        while restarts and not stopping and restarts[0] <= time.monotonic():
+            restarts.pop(0)
+            started[fork_worker(app, sock)] = time.monotonic()
+        if report_interval and time.monotonic() - last_report >= report_interval:
+            report_worker_memory(os.getpid(), sorted(started))
+            last_report = time.monotonic()
+        time.sleep(0.5)
+    
+    sock.close()
+    print("\n🛑 Server stopped")
+
+def parse_args():
+    """Parse command line options"""
+    from config import API_CONFIG
+    
+    parser = argparse.ArgumentParser(description="Start the ML Classification API")
+    parser.add_argument(
+        "--production", action="store_true",
+        help="Preload models and serve with pre-forked workers instead of the reloading dev server"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of workers in production mode")
+    parser.add_argument("--host", default=API_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=API_CONFIG["port"])
+    parser.add_argument(
+        "--report-interval", type=float, default=0,
+        help="Seconds between per-worker memory reports in production mode (0 reports once)"
+    )
+    return parser.parse_args()
+
 def main():
     """Main startup function"""
+    args = parse_args()
+    
     print("🚀 ML Classification API Startup")
     print("=" * 40)
     
@@ -111,7 +300,10 @@ def main():
             sys.exit(1)
     
     # Start API
-    start_api()
+    if args.production:
+        start_api_production(args.workers, args.host, args.port, args.report_interval)
+    else:
+        start_api()
 
 if __name__ == "__main__":
     main()
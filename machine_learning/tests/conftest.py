@@ -0,0 +1,8 @@
+"""
+Shared setup of the unit tests (python -m pytest tests, from machine_learning/)
+"""
+import sys
+from pathlib import Path
+
+# Make the machine_learning modules importable as in the scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,108 @@
+"""
+Micro-batching of concurrent single-text predictions
+"""
+import asyncio
+import time
+
+from api.batching import MicroBatcher, MicroBatcherPool
+
+
+class RecordingModel:
+    """predict_fn stub recording the batches it is called with"""
+
+    def __init__(self, error: Exception = None):
+        self.batches = []
+        self.error = error
+
+    async def __call__(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return [{"tagClass": text.upper()} for text in texts]
+
+
+def test_concurrent_submits_form_one_batch():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=64, max_latency_ms=20)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(text) for text in ["a", "b", "c"]))
+
+    results = asyncio.run(main())
+
+    assert model.batches == [["a", "b", "c"]]
+    assert results == [{"tagClass": "A"}, {"tagClass": "B"}, {"tagClass": "C"}]
+    assert batcher.get_stats()["batches_flushed"] == 1
+    assert batcher.queue_depth == 0
+
+
+def test_full_batch_flushes_without_waiting_for_the_timer():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=2, max_latency_ms=10_000)
+
+    async def main():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(text) for text in ["a", "b", "c", "d"])), timeout=1
+        )
+
+    results = asyncio.run(main())
+
+    assert model.batches == [["a", "b"], ["c", "d"]]
+    assert [result["tagClass"] for result in results] == ["A", "B", "C", "D"]
+
+
+def test_lone_request_is_flushed_after_max_latency():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=64, max_latency_ms=50)
+
+    async def main():
+        task = asyncio.ensure_future(batcher.submit("a"))
+        await asyncio.sleep(0.01)
+        queued_early = batcher.queue_depth
+        start = time.perf_counter()
+        result = await task
+        return queued_early, time.perf_counter() - start, result
+
+    queued_early, waited, result = asyncio.run(main())
+
+    assert queued_early == 1
+    assert waited >= 0.02
+    assert result == {"tagClass": "A"}
+    assert model.batches == [["a"]]
+
+
+def test_exception_reaches_every_waiter_of_the_batch():
+    model = RecordingModel(error=RuntimeError("model failed"))
+    batcher = MicroBatcher(model, max_batch_size=64, max_latency_ms=5)
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(text) for text in ["a", "b"]), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert model.batches == [["a", "b"]]
+    assert all(isinstance(result, RuntimeError) and str(result) == "model failed" for result in results)
+    assert batcher.get_stats()["batches_flushed"] == 0
+
+
+def test_pool_batches_per_model_type_and_top_k():
+    calls = []
+
+    async def predict(model_type, texts, top_k):
+        calls.append((model_type, top_k, list(texts)))
+        return [{"tagClass": model_type} for _ in texts]
+
+    pool = MicroBatcherPool(predict, max_batch_size=64, max_latency_ms=5)
+
+    async def main():
+        return await asyncio.gather(
+            pool.submit("svm", "a"), pool.submit("svm", "b"),
+            pool.submit("random_forest", "c"), pool.submit("svm", "d", top_k=3)
+        )
+
+    results = asyncio.run(main())
+
+    assert [result["tagClass"] for result in results] == ["svm", "svm", "random_forest", "svm"]
+    assert sorted(calls) == [("random_forest", 1, ["c"]), ("svm", 1, ["a", "b"]), ("svm", 3, ["d"])]
+    assert set(pool.get_stats()["models"]) == {"svm", "random_forest", "svm:top3"}
@@ -0,0 +1,61 @@
+"""
+Incremental parsing of top-level JSON arrays
+"""
+import io
+import json
+
+import pytest
+
+from data.dataset_loader import iter_json_array
+
+# Tiny blocks put every token, and the gaps between them, across a block boundary
+BLOCK_SIZES = [1, 2, 3, 5, 7, 1 << 20]
+
+
+def parse(text, block_size):
+    return list(iter_json_array(io.StringIO(text), block_size=block_size))
+
+
+@pytest.mark.parametrize("block_size", BLOCK_SIZES)
+@pytest.mark.parametrize("text", [
+    "[]",
+    " \n[ \t]\n",
+    "[1]",
+    "[12345, 678, -9.5e3]",
+    '[{"text": "a, b ]", "tag": "x"}, {"text": "[c]", "tag": "y"}]',
+    '[ "\\u00e9\\"", [1, [2, []]] , {} ,true,false,null ]',
+    "[123456789012345678901234567890]",
+])
+def test_valid_arrays_match_json_load(text, block_size):
+    assert parse(text, block_size) == json.loads(text)
+
+
+@pytest.mark.parametrize("block_size", BLOCK_SIZES)
+@pytest.mark.parametrize("text", [
+    "[1 2]",
+    '[{"a": 1} {"a": 2}]',
+    "[1,]",
+    "[1, 2 , ]",
+    "[,1]",
+    "[1,,2]",
+    "[,]",
+    "{}",
+    "",
+    "[",
+    "[1",
+    "[1,",
+    '["open',
+    "[1x]",
+])
+def test_malformed_arrays_are_rejected(text, block_size):
+    with pytest.raises(ValueError):
+        parse(text, block_size)
+
+
+def test_elements_are_yielded_before_the_end_is_read():
+    items = iter_json_array(io.StringIO('[{"tag": "a"}, {"tag": "b"}, oops'), block_size=4)
+
+    assert next(items) == {"tag": "a"}
+    assert next(items) == {"tag": "b"}
+    with pytest.raises(ValueError):
+        next(items)
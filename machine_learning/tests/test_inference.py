@@ -0,0 +1,42 @@
+"""
+InferenceExecutor dispatch to its thread pool
+"""
+import asyncio
+import threading
+from contextvars import ContextVar
+
+import pytest
+
+from api.inference import InferenceExecutor
+
+request_id: ContextVar[str] = ContextVar("request_id", default=None)
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor(mode="thread", max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+def test_call_runs_on_pool_with_callers_context(executor):
+    def read_context(suffix):
+        return threading.current_thread().name, f"{request_id.get()}-{suffix}"
+
+    async def handle_request():
+        request_id.set("req-1")
+        return await executor.run(read_context, "score")
+
+    thread_name, value = asyncio.run(handle_request())
+
+    assert thread_name.startswith("inference")
+    assert value == "req-1-score"
+
+
+def test_context_changes_in_pool_stay_in_the_call(executor):
+    async def handle_request():
+        request_id.set("req-2")
+        await executor.run(request_id.set, "changed")
+        return request_id.get()
+
+    assert asyncio.run(handle_request()) == "req-2"
@@ -0,0 +1,102 @@
+"""
+Merging the metrics of pre-forked workers at scrape time
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.metrics import MetricsRegistry
+
+
+def make_registry():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("handler",))
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    in_flight = registry.gauge("in_flight", "Requests in flight")
+    return registry, requests, latency.labels(), in_flight.labels()
+
+
+@pytest.fixture
+def other_worker():
+    """A live process standing in for another worker"""
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    yield process.pid
+    process.kill()
+    process.wait()
+
+
+@pytest.fixture
+def exited_worker():
+    """The pid of a worker that has exited"""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def write_worker_snapshot(directory, pid, requests, latencies, in_flight):
+    registry, counter, histogram, gauge = make_registry()
+    counter.labels("classify").inc(requests)
+    for value in latencies:
+        histogram.observe(value)
+    gauge.inc(in_flight)
+    (directory / f"{pid}.json").write_text(json.dumps(registry.snapshot()))
+
+
+def test_single_process_render_has_no_pid_label():
+    registry, requests, _, in_flight = make_registry()
+    requests.labels("classify").inc()
+    in_flight.inc()
+
+    text = registry.render()
+
+    assert 'requests_total{handler="classify"} 1' in text
+    assert "in_flight 1" in text
+
+
+def test_scrape_sums_counters_and_histograms_of_every_worker(tmp_path, other_worker, exited_worker):
+    registry, requests, latency, in_flight = make_registry()
+    registry.enable_multiprocess(tmp_path)
+    requests.labels("classify").inc(2)
+    latency.observe(0.05)
+    in_flight.inc()
+    write_worker_snapshot(tmp_path, other_worker, 3, [0.5], 4)
+    write_worker_snapshot(tmp_path, exited_worker, 5, [2.0], 7)
+
+    text = registry.render()
+
+    # Exited workers still count towards the totals
+    assert 'requests_total{handler="classify"} 10' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+    assert "latency_seconds_sum 2.55" in text
+
+
+def test_scrape_reports_gauges_per_live_worker(tmp_path, other_worker, exited_worker):
+    registry, _, _, in_flight = make_registry()
+    registry.enable_multiprocess(tmp_path)
+    in_flight.inc()
+    write_worker_snapshot(tmp_path, other_worker, 0, [], 4)
+    write_worker_snapshot(tmp_path, exited_worker, 0, [], 7)
+
+    lines = [line for line in registry.render().splitlines() if line.startswith("in_flight")]
+
+    # Exited workers have no in-flight requests left to report
+    assert sorted(lines) == sorted([f'in_flight{{pid="{os.getpid()}"}} 1', f'in_flight{{pid="{other_worker}"}} 4'])
+
+
+def test_enable_multiprocess_removes_previous_snapshots(tmp_path):
+    registry, requests, _, _ = make_registry()
+    registry.enable_multiprocess(tmp_path)
+    requests.labels("classify").inc(3)
+    registry.write_snapshot()
+
+    snapshot = json.loads((tmp_path / f"{os.getpid()}.json").read_text())
+    assert snapshot["requests_total"]["samples"] == [[["classify"], [3]]]
+
+    make_registry()[0].enable_multiprocess(tmp_path)
+    assert not list(tmp_path.glob("*.json"))
@@ -0,0 +1,163 @@
+"""
+ModelManager versioning across processes sharing one models directory
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from corpus import make_corpus
+from config import CACHE_CONFIG, MODEL_VERSIONING, ONLINE_LEARNING_CONFIG
+from models.svm_classifier import SVMClassifier
+from persistence.model_manager import ModelManager
+
+
+@pytest.fixture(scope="module")
+def classifiers():
+    texts, labels = make_corpus(300, seed=1)
+    trained = []
+    for size in (300, 200):
+        classifier = SVMClassifier()
+        classifier.train(texts[:size], labels[:size], calibrate=False)
+        trained.append(classifier)
+    return trained
+
+
+@pytest.fixture
+def managers(monkeypatch, tmp_path):
+    """Two managers standing in for two API workers"""
+    monkeypatch.setitem(MODEL_VERSIONING, "pointer_check_seconds", 0.0)
+    return ModelManager(str(tmp_path)), ModelManager(str(tmp_path))
+
+
+def test_version_activated_elsewhere_is_served(managers, classifiers):
+    writer, reader = managers
+    writer.save_model(classifiers[0], "svm")
+    assert reader.load_model("svm").version == classifiers[0].version
+
+    writer.save_model(classifiers[1], "svm")
+    assert reader.load_model("svm").version == classifiers[1].version
+
+    writer.swap("svm", classifiers[0].version)
+    assert reader.get_cached_prediction("svm", "texto") is None
+    assert reader.load_model("svm").version == classifiers[0].version
+
+
+def test_unchanged_pointer_keeps_the_loaded_model(managers, classifiers):
+    writer, reader = managers
+    writer.save_model(classifiers[0], "svm")
+    loaded = reader.load_model("svm")
+
+    assert reader.load_model("svm") is loaded
+
+
+@pytest.mark.parametrize("version", ["..", "../svm", "missing"])
+def test_swap_rejects_unknown_versions(managers, classifiers, version):
+    writer, _ = managers
+    writer.save_model(classifiers[0], "svm")
+
+    with pytest.raises(ValueError):
+        writer.swap("svm", version)
+    assert writer.get_current_version("svm") == classifiers[0].version
+
+
+def test_update_is_served_at_once_by_every_worker(managers, classifiers):
+    writer, reader = managers
+    writer.save_model(classifiers[0], "svm")
+    reader.load_model("svm")
+    texts, labels = make_corpus(2, seed=2)
+
+    result = writer.update_model("svm", texts, labels)
+
+    assert not result["persisted"]
+    assert result["pending_updates"] == 1
+    assert result["version"] != result["previous_version"]
+    assert writer.load_model("svm").version == result["version"]
+    assert reader.load_model("svm").metadata["online_updates"]["updates"] == 1
+
+
+def test_updates_from_every_worker_land_in_one_version(monkeypatch, managers, classifiers):
+    monkeypatch.setitem(ONLINE_LEARNING_CONFIG, "persist_every_updates", 4)
+    writer, reader = managers
+    writer.save_model(classifiers[0], "svm")
+    texts, labels = make_corpus(8, seed=2)
+
+    results = [
+        manager.update_model("svm", texts[i:i + 2], labels[i:i + 2])
+        for i, manager in zip(range(0, 8, 2), [writer, reader, writer, reader])
+    ]
+
+    assert [result["pending_updates"] for result in results] == [1, 2, 3, 0]
+    assert [result["persisted"] for result in results] == [False, False, False, True]
+    assert writer.get_current_version("svm") == results[3]["version"]
+    for manager in managers:
+        served = manager.load_model("svm")
+        assert served.version == results[3]["version"]
+        assert served.metadata["online_updates"]["updates"] == 4
+
+    # A worker loading the saved version does not apply the updates again
+    fresh = ModelManager(str(writer.models_dir)).load_model("svm")
+    assert fresh.metadata["online_updates"]["updates"] == 4
+
+
+def test_aged_updates_are_saved_without_further_updates(monkeypatch, managers, classifiers):
+    writer, reader = managers
+    writer.save_model(classifiers[0], "svm")
+    texts, labels = make_corpus(2, seed=2)
+    writer.update_model("svm", texts, labels)
+
+    assert reader.persist_updates(due_only=True) == []
+    monkeypatch.setitem(ONLINE_LEARNING_CONFIG, "persist_every_seconds", 0)
+    saved = reader.persist_updates(due_only=True)
+
+    assert len(saved) == 1
+    assert writer.load_model("svm").metadata["online_updates"]["updates"] == 1
+
+
+def test_update_with_unknown_label_is_not_logged(managers, classifiers):
+    writer, _ = managers
+    writer.save_model(classifiers[0], "svm")
+
+    with pytest.raises(ValueError):
+        writer.update_model("svm", ["texto"], ["Etiqueta desconocida"])
+    assert writer.persist_updates() == []
+
+
+@pytest.fixture
+def cached_manager(monkeypatch, tmp_path, classifiers):
+    """Manager with the in-memory prediction cache holding one result of the served version"""
+    monkeypatch.setitem(CACHE_CONFIG, "enabled", True)
+    monkeypatch.setitem(CACHE_CONFIG, "backend", "memory")
+    manager = ModelManager(str(tmp_path))
+    manager.save_model(classifiers[0], "svm")
+    manager.predict_batch("svm", ["texto"])
+    assert manager.get_cached_prediction("svm", "texto") is not None
+    return manager
+
+
+def cached_result(manager, version):
+    return manager.prediction_cache.get_many("svm", version, ["texto"], count_misses=False)[0]
+
+
+def test_saving_a_version_invalidates_the_cache(cached_manager, classifiers):
+    cached_manager.save_model(classifiers[1], "svm")
+
+    assert cached_manager.get_cached_prediction("svm", "texto") is None
+    assert cached_result(cached_manager, classifiers[0].version) is None
+
+
+def test_deleting_a_model_invalidates_the_cache(cached_manager, classifiers):
+    assert cached_manager.delete_model("svm")
+
+    assert cached_manager.get_cached_prediction("svm", "texto") is None
+    assert cached_result(cached_manager, classifiers[0].version) is None
+
+
+def test_forced_reload_invalidates_the_cache(cached_manager, classifiers):
+    reloaded = cached_manager.load_model("svm", force_reload=True)
+
+    # Same version, so only the invalidation keeps the old results from being served
+    assert reloaded.version == classifiers[0].version
+    assert cached_manager.get_cached_prediction("svm", "texto") is None
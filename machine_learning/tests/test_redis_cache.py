@@ -0,0 +1,121 @@
+"""
+RedisCacheBackend against an in-process fakeredis server
+"""
+import fakeredis
+import pytest
+
+from cache.backends import RedisCacheBackend
+from cache.prediction_cache import PredictionCache
+
+NAMESPACE = "test:prediction:"
+
+
+class CountingRedis(fakeredis.FakeRedis):
+    """FakeRedis recording the round trips made by the backend"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    def mget(self, keys, *args):
+        self.calls.append("mget")
+        return super().mget(keys, *args)
+
+    def get(self, name):
+        self.calls.append("get")
+        return super().get(name)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        self.calls.append("pipeline")
+        return super().pipeline(transaction=transaction, shard_hint=shard_hint)
+
+
+@pytest.fixture
+def client():
+    return CountingRedis()
+
+
+def make_backend(client, ttl_seconds=3600):
+    return RedisCacheBackend(client, ttl_seconds=ttl_seconds, namespace=NAMESPACE)
+
+
+def test_get_many_is_one_mget(client):
+    backend = make_backend(client)
+    backend.set_many({"a": {"tagClass": "A"}, "c": {"tagClass": "C"}})
+    client.calls.clear()
+
+    values = backend.get_many(["a", "b", "c"])
+
+    assert values == [{"tagClass": "A"}, None, {"tagClass": "C"}]
+    assert client.calls == ["mget"]
+
+
+def test_get_many_without_keys_skips_redis(client):
+    assert make_backend(client).get_many([]) == []
+    assert client.calls == []
+
+
+def test_set_many_is_one_pipeline(client):
+    backend = make_backend(client)
+    items = {f"key{i}": {"tagClass": f"class{i}", "confidence": 0.5} for i in range(50)}
+
+    backend.set_many(items)
+
+    assert client.calls == ["pipeline"]
+    assert sorted(client.keys(f"{NAMESPACE}*")) == sorted((NAMESPACE + key).encode() for key in items)
+
+
+def test_set_many_keeps_non_ascii_labels(client):
+    backend = make_backend(client)
+    backend.set_many({"a": {"tagClass": "Informe de Tomografía"}})
+
+    assert backend.get_many(["a"]) == [{"tagClass": "Informe de Tomografía"}]
+
+
+def test_set_many_sets_ttl(client):
+    make_backend(client, ttl_seconds=3600).set_many({"a": {"tagClass": "A"}})
+
+    assert 3590 < client.ttl(NAMESPACE + "a") <= 3600
+
+
+@pytest.mark.parametrize("ttl_seconds", [0.2, 0.999])
+def test_sub_second_ttl_is_clamped_to_one_second(client, ttl_seconds):
+    backend = make_backend(client, ttl_seconds=ttl_seconds)
+    backend.set_many({"a": {"tagClass": "A"}})
+
+    assert client.ttl(NAMESPACE + "a") == 1
+    assert backend.errors == 0
+
+
+def test_without_ttl_entries_do_not_expire(client):
+    make_backend(client, ttl_seconds=None).set_many({"a": {"tagClass": "A"}})
+
+    assert client.ttl(NAMESPACE + "a") == -1
+
+
+def test_corrupt_value_is_a_miss(client):
+    backend = make_backend(client)
+    client.set(NAMESPACE + "a", b"not json")
+
+    assert backend.get_many(["a"]) == [None]
+    assert backend.errors == 1
+
+
+def test_redis_errors_are_misses():
+    server = fakeredis.FakeServer()
+    server.connected = False
+    backend = make_backend(fakeredis.FakeRedis(server=server))
+
+    backend.set_many({"a": {"tagClass": "A"}})
+    assert backend.get_many(["a", "b"]) == [None, None]
+    assert backend.errors == 2
+
+
+def test_invalidate_leaves_versioned_entries_to_ttl(client):
+    cache = PredictionCache(make_backend(client))
+    cache.put_many("svm", "v1", ["texto"], [{"tagClass": "A"}])
+
+    assert cache.invalidate("svm") == 0
+    assert client.calls == ["pipeline"]
+    assert cache.get_many("svm", "v2", ["texto"]) == [None]
+    assert cache.get_many("svm", "v1", ["texto"]) == [{"tagClass": "A"}]
@@ -0,0 +1,96 @@
+"""
+Training job records shared between API processes
+"""
+import threading
+import time
+
+import pytest
+
+from persistence.model_manager import ModelManager
+from training import jobs
+from training.jobs import TrainingJobManager
+
+
+@pytest.fixture
+def release(monkeypatch):
+    """Replace the training with a stub that waits until the event is set"""
+    event = threading.Event()
+
+    def fake_phases(store, job_id, model_type, models_dir):
+        store.update(job_id, model_type, status="running", phase="train")
+        event.wait(timeout=10)
+        raise RuntimeError("stub training")
+
+    monkeypatch.setattr(jobs, "_run_phases", fake_phases)
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two job managers standing in for two API workers"""
+    managers = [
+        TrainingJobManager(ModelManager(str(tmp_path)), max_concurrent_jobs=1, executor="thread") for _ in range(2)
+    ]
+    yield managers
+    for manager in managers:
+        manager.shutdown()
+
+
+def test_job_is_visible_and_exclusive_across_workers(release, workers):
+    first, second = workers
+    job = first.submit("svm")
+
+    with pytest.raises(ValueError):
+        second.submit("svm")
+    assert second.get(job["job_id"])["model_type"] == "svm"
+    assert [listed["job_id"] for listed in second.list_jobs()] == [job["job_id"]]
+
+    release.set()
+    first.shutdown()
+    finished = second.get(job["job_id"])
+    assert finished["status"] == "failed"
+    assert "stub training" in finished["error"]
+
+
+def wait_for_status(manager, job_id, status, timeout=5):
+    deadline = time.monotonic() + timeout
+    while manager.get(job_id)["status"] != status and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return manager.get(job_id)["status"]
+
+
+def test_concurrent_job_limit_spans_workers(release, workers):
+    first, second = workers
+    running = first.submit("svm")
+    assert wait_for_status(second, running["job_id"], "running") == "running"
+
+    # Each worker allows one training, but the slot is taken by the other worker
+    waiting = second.submit("random_forest")
+    time.sleep(1)
+    assert second.get(waiting["job_id"])["status"] == "queued"
+
+    release.set()
+    assert wait_for_status(first, waiting["job_id"], "failed") == "failed"
+    assert first.get(running["job_id"])["status"] == "failed"
+
+
+def test_job_of_an_exited_process_fails(workers):
+    first, second = workers
+    first.store.write({
+        "job_id": "abc123",
+        "model_type": "svm",
+        "status": "running",
+        "phase": "train",
+        "submitted_at": "2026-01-01T00:00:00+00:00",
+        "finished_at": None,
+        "owner_pid": 2 ** 22 + 1
+    })
+
+    assert second.get("abc123")["status"] == "failed"
+    assert first.store.read("abc123")["status"] == "failed"
+
+
+@pytest.mark.parametrize("job_id", ["../CURRENT", "", "missing"])
+def test_unknown_job_ids(workers, job_id):
+    assert workers[0].get(job_id) is None
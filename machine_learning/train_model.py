@@ -1,6 +1,7 @@
 """
 Script to train and save the SVM model
 """
+import argparse
 import sys
 from pathlib import Path
 
@@ -9,8 +10,10 @@ sys.path.append(str(Path(__file__).parent))
 
 from models.model_factory import ModelFactory
 from data.dataset_loader import DatasetLoader
+from data.feature_store import FeatureStore
 from persistence.model_manager import ModelManager
-from config import DATASET_PATH, MODEL_CONFIGS
+from evaluation import cross_validate
+from config import DATASET_PATH, EVALUATION_CONFIG, MODEL_CONFIGS, STREAMING_CONFIG
 from utils.logger import setup_logger
 
 logger = setup_logger()
@@ -21,29 +24,45 @@ def train_svm_model():
     try:
         logger.info("Starting SVM model training...")
         
-        # Load dataset
-        logger.info("Loading dataset...")
-        dataset_loader = DatasetLoader(str(DATASET_PATH))
-        X, y = dataset_loader.get_training_data()  # Use same train/test split as original
+        # Get SVM configuration
+        svm_config = MODEL_CONFIGS["svm"]
+        vectorizer_params = svm_config.get("vectorizer_params", {})
+        
+        # Load the vectorized train split, reusing it when the dataset and
+        # vectorizer settings are unchanged since the last training
+        logger.info("Loading dataset features...")
+        features = FeatureStore().get_or_build(str(DATASET_PATH), vectorizer_params)
         
-        logger.info(f"Dataset loaded: {len(X)} samples")
-        logger.info(f"Classes: {set(y)}")
+        logger.info(f"Dataset loaded: {len(features.y_train)} samples "
+                    f"({'feature store hit' if features.cached else 'vectorized and stored'})")
+        logger.info(f"Classes: {set(features.y_train)}")
         
         # Create SVM classifier
         logger.info("Creating SVM classifier...")
         classifier = ModelFactory.create_classifier("svm")
         
-        # Get SVM configuration
-        svm_config = MODEL_CONFIGS["svm"]
-        vectorizer_params = svm_config.get("vectorizer_params", {})
-        
         # Train the model
         logger.info("Training model...")
-        metadata = classifier.train(X, y, vectorizer_params)
+        metadata = classifier.train_on_features(
+            features.vectorizer, features.X_train, features.y_train, vectorizer_params
+        )
         
         logger.info(f"Training completed. Accuracy: {metadata['accuracy']:.3f}")
         logger.info(f"Classes: {metadata['classes']}")
         
+        # Estimate generalization with stratified k-fold cross-validation
+        if EVALUATION_CONFIG["enabled"]:
+            logger.info(f"Cross-validating ({EVALUATION_CONFIG['n_splits']} folds)...")
+            evaluation = cross_validate(
+                "svm",
+                str(DATASET_PATH),
+                n_splits=EVALUATION_CONFIG["n_splits"],
+                n_jobs=EVALUATION_CONFIG["n_jobs"],
+                vectorizer_params=vectorizer_params
+            )
+            metadata["evaluation"] = evaluation
+            logger.info(f"Cross-validation: accuracy {evaluation['accuracy']:.3f}, macro F1 {evaluation['macro_f1']:.3f}")
+        
         # Save the model
         logger.info("Saving model...")
         model_manager = ModelManager()
@@ -59,6 +78,47 @@ def train_svm_model():
         return False
 
 
+def train_svm_model_streaming(dataset_path: str, chunk_size: int, epochs: int):
+    """Train and save the SVM model out-of-core, one chunk of the dataset at a time"""
+    try:
+        logger.info(f"Starting out-of-core SVM training from {dataset_path} (chunks of {chunk_size})...")
+        dataset_loader = DatasetLoader(dataset_path)
+        
+        # Hashed features need no vocabulary, so they can be fitted chunk by chunk
+        vectorizer_params = dict(MODEL_CONFIGS["svm"].get("vectorizer_params", {}), backend="hashing")
+        
+        # The stream is not split; every sample is used for training
+        classifier = ModelFactory.create_classifier("svm")
+        metadata = classifier.train_streaming(
+            lambda: dataset_loader.iter_chunks(chunk_size), vectorizer_params, epochs=epochs
+        )
+        
+        logger.info(f"Training completed on {metadata['training_samples']} samples. Accuracy: {metadata['accuracy']:.3f}")
+        logger.info(f"Classes: {metadata['classes']}")
+        
+        # Save the model
+        logger.info("Saving model...")
+        model_path = ModelManager().save_model(classifier, "svm")
+        
+        logger.info(f"Model saved successfully to: {model_path}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Training failed: {str(e)}")
+        return False
+
+
 if __name__ == "__main__":
-    success = train_svm_model()
+    parser = argparse.ArgumentParser(description="Train and save the SVM model")
+    parser.add_argument("--stream", action="store_true",
+                        help="Train out-of-core from a JSON array or JSONL dataset, one chunk at a time")
+    parser.add_argument("--dataset", default=str(DATASET_PATH), help="Dataset path (--stream only)")
+    parser.add_argument("--chunk-size", type=int, default=STREAMING_CONFIG["chunk_size"], help="Samples per chunk")
+    parser.add_argument("--epochs", type=int, default=STREAMING_CONFIG["epochs"], help="partial_fit passes")
+    args = parser.parse_args()
+    
+    if args.stream:
+        success = train_svm_model_streaming(args.dataset, args.chunk_size, args.epochs)
+    else:
+        success = train_svm_model()
     sys.exit(0 if success else 1)
@@ -0,0 +1,6 @@
+"""
+Training package for ML Classification API
+"""
+from .jobs import JobStore, TrainingJobManager, run_training_job
+
+__all__ = ["JobStore", "TrainingJobManager", "run_training_job"]
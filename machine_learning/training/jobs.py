@@ -0,0 +1,346 @@
+"""
+Background training jobs with progress polling
+"""
+import json
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import DATASET_PATH, EVALUATION_CONFIG, MODEL_CONFIGS
+from utils.file_lock import any_file_lock, file_lock
+
+ACTIVE_STATUSES = ("queued", "running")
+JOBS_DIR = "jobs"
+
+
+def _now() -> str:
+    """Current UTC time as an ISO 8601 string"""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _process_alive(pid: int) -> bool:
+    """Check whether a process exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """
+    Job records as one JSON file per job under `<models_dir>/jobs/`
+
+    Every API process (e.g. the pre-forked workers of start_api.py
+    --production) and every training worker reads and writes the same
+    files, so a job can be polled through any worker. Changes to the jobs
+    of a model type happen under that type's lock file, and records are
+    replaced atomically, so readers never see a half-written one.
+    """
+
+    def __init__(self, models_dir: str):
+        """
+        Args:
+            models_dir: Directory of the model manager the jobs train for
+        """
+        self.jobs_dir = Path(models_dir) / JOBS_DIR
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+
+    def lock(self, model_type: str):
+        """Lock the jobs of a model type (a context manager)"""
+        return file_lock(self.jobs_dir / f".{model_type}.lock")
+
+    def training_slot(self, slots: int):
+        """
+        Wait for and hold one of `slots` training slots shared by every
+        process (a context manager)
+        """
+        return any_file_lock([self.jobs_dir / f".slot-{index}.lock" for index in range(slots)])
+
+    def _path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+
+    def read(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Read a job record, None if there is none"""
+        # Job ids are hex uuids; anything else cannot name a record
+        if not job_id.isalnum():
+            return None
+        try:
+            with open(self._path(job_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def write(self, job: Dict[str, Any]) -> None:
+        """Create or replace a job record"""
+        path = self._path(job["job_id"])
+        staging_path = path.with_name(f".{path.name}.{os.getpid()}.staging")
+        with open(staging_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(staging_path, path)
+
+    def update(self, job_id: str, model_type: str, **fields) -> None:
+        """Change fields of a job record"""
+        with self.lock(model_type):
+            job = self.read(job_id)
+            if job is not None:
+                job.update(fields)
+                self.write(job)
+
+    def delete(self, job_id: str) -> None:
+        """Delete a job record"""
+        self._path(job_id).unlink(missing_ok=True)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Read every job record, oldest first"""
+        jobs = []
+        for path in self.jobs_dir.glob("*.json"):
+            job = self.read(path.stem)
+            if job is not None:
+                jobs.append(job)
+        return sorted(jobs, key=lambda job: job["submitted_at"])
+
+
+def run_training_job(job_id: str, model_type: str, models_dir: str, max_concurrent_jobs: int) -> Dict[str, Any]:
+    """
+    Vectorize the dataset (or reuse it from the feature store), train a
+    model, cross-validate its configuration and save it as a new
+    (inactive) version
+
+    Runs inside a pool worker. The job stays queued until it holds one of
+    the `max_concurrent_jobs` training slots shared by every API process;
+    the current phase is then written to the job's record so any API
+    process can report it while the job runs.
+
+    Args:
+        job_id: Identifier of the job
+        model_type: Type of model to train
+        models_dir: Directory of the model manager to save into
+        max_concurrent_jobs: Trainings running at once across all processes
+
+    Returns:
+        Dictionary with the saved version, its path, metadata and phase timings
+    """
+    store = JobStore(models_dir)
+    with store.training_slot(max_concurrent_jobs):
+        return _run_phases(store, job_id, model_type, models_dir)
+
+
+def _run_phases(store: JobStore, job_id: str, model_type: str, models_dir: str) -> Dict[str, Any]:
+    """Run the phases of a training job holding a training slot"""
+    # Imported here so spawned workers only pay for them when they train
+    from data.feature_store import FeatureStore
+    from evaluation import cross_validate
+    from models.model_factory import ModelFactory
+    from persistence.model_manager import ModelManager
+
+    timings: Dict[str, float] = {}
+
+    # Vectorized splits are shared by every model type with the same settings
+    store.update(job_id, model_type, status="running", phase="load")
+    vectorizer_params = MODEL_CONFIGS[model_type].get("vectorizer_params", {})
+    features = FeatureStore().get_or_build(str(DATASET_PATH), vectorizer_params)
+    timings.update(features.timings_ms)
+
+    store.update(job_id, model_type, phase="train")
+    classifier = ModelFactory.create_classifier(model_type)
+    metadata = classifier.train_on_features(
+        features.vectorizer, features.X_train, features.y_train, vectorizer_params
+    )
+    metadata["training_timings_ms"] = {"vectorize": features.timings_ms["vectorize"], **metadata["training_timings_ms"]}
+    metadata["feature_set"] = {"key": features.key, "cached": features.cached}
+    timings.update(metadata["training_timings_ms"])
+
+    if EVALUATION_CONFIG["enabled"]:
+        store.update(job_id, model_type, phase="cross_validate")
+        start = time.perf_counter()
+        metadata["evaluation"] = cross_validate(
+            model_type,
+            str(DATASET_PATH),
+            n_splits=EVALUATION_CONFIG["n_splits"],
+            n_jobs=EVALUATION_CONFIG["n_jobs"],
+            vectorizer_params=vectorizer_params
+        )
+        timings["cross_validate"] = round((time.perf_counter() - start) * 1000, 2)
+
+    store.update(job_id, model_type, phase="save")
+    start = time.perf_counter()
+    model_path = ModelManager(models_dir).save_model(classifier, model_type, activate=False)
+    timings["save"] = round((time.perf_counter() - start) * 1000, 2)
+
+    return {
+        "version": classifier.version,
+        "model_path": model_path,
+        "metadata": metadata,
+        "phase_timings_ms": timings
+    }
+
+
+class TrainingJobManager:
+    """
+    Runs model trainings in a worker pool and tracks their progress
+
+    At most `max_concurrent_jobs` trainings run at once across all API
+    processes (file-locked slots under the jobs directory; a job waits in
+    `queued` for a free one), and at most one job per model type is queued
+    or running. A finished training is saved by the worker and then hot-swapped
+    in by the submitting process through ModelManager.swap (the other
+    processes follow the CURRENT pointer), so serving never waits on a
+    fit. Jobs are JobStore records, so any process can report any job.
+    """
+
+    def __init__(self, model_manager, max_concurrent_jobs: int = 2, executor: str = "process", history_size: int = 100):
+        """
+        Initialize the job manager
+
+        Args:
+            model_manager: ModelManager serving the trained models
+            max_concurrent_jobs: Maximum number of trainings running at once across all processes
+            executor: "process" (separate worker processes) or "thread"
+            history_size: Number of finished jobs kept for polling
+        """
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unsupported training executor: {executor}. Available: ['process', 'thread']")
+
+        self.model_manager = model_manager
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.executor_type = executor
+        self.history_size = history_size
+        self.store = JobStore(model_manager.models_dir)
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        """Create the worker pool on first use"""
+        if self._executor is None:
+            if self.executor_type == "process":
+                # Spawned workers do not inherit the API's threads or open sockets
+                context = multiprocessing.get_context("spawn")
+                self._executor = ProcessPoolExecutor(max_workers=self.max_concurrent_jobs, mp_context=context)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_jobs, thread_name_prefix="training"
+                )
+        return self._executor
+
+    def submit(self, model_type: str) -> Dict[str, Any]:
+        """
+        Queue a training job
+
+        Args:
+            model_type: Type of model to train
+
+        Returns:
+            The job's status dictionary
+
+        Raises:
+            ValueError: If a job for this model type is already queued or running
+        """
+        with self.store.lock(model_type):
+            for job in self.list_jobs():
+                if job["model_type"] == model_type and job["status"] in ACTIVE_STATUSES:
+                    raise ValueError(
+                        f"A training job for '{model_type}' is already {job['status']}: {job['job_id']}"
+                    )
+
+            executor = self._get_executor()
+            job_id = uuid.uuid4().hex
+            self.store.write({
+                "job_id": job_id,
+                "model_type": model_type,
+                "status": "queued",
+                "phase": None,
+                "phase_timings_ms": {},
+                "version": None,
+                "metadata": None,
+                "error": None,
+                "submitted_at": _now(),
+                "finished_at": None,
+                # Process that activates the result; its jobs fail if it exits first
+                "owner_pid": os.getpid()
+            })
+
+        self._trim_history()
+        future = executor.submit(
+            run_training_job, job_id, model_type, str(self.model_manager.models_dir), self.max_concurrent_jobs
+        )
+        future.add_done_callback(lambda done: self._on_done(job_id, model_type, done))
+
+        return self.get(job_id)
+
+    def _on_done(self, job_id: str, model_type: str, future: Future) -> None:
+        """Record the outcome of a job and activate the trained model"""
+        try:
+            result = future.result()
+            self.store.update(job_id, model_type, status="running", phase="activate")
+            start = time.perf_counter()
+            self.model_manager.swap(model_type, result["version"])
+            result["phase_timings_ms"]["activate"] = round((time.perf_counter() - start) * 1000, 2)
+
+            self.store.update(
+                job_id, model_type,
+                status="succeeded",
+                phase=None,
+                version=result["version"],
+                metadata=result["metadata"],
+                phase_timings_ms=result["phase_timings_ms"],
+                finished_at=_now()
+            )
+        except Exception as e:
+            self.store.update(
+                job_id, model_type,
+                status="failed",
+                phase=None,
+                error=f"{type(e).__name__}: {e}",
+                finished_at=_now()
+            )
+
+    def _check_owner(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Mark an active job failed when the process that ran it is gone"""
+        if job["status"] in ACTIVE_STATUSES and not _process_alive(job["owner_pid"]):
+            job.update(
+                status="failed",
+                phase=None,
+                error=f"Interrupted: API process {job['owner_pid']} exited before the job finished",
+                finished_at=_now()
+            )
+            self.store.write(job)
+        return job
+
+    def _trim_history(self) -> None:
+        """Delete the oldest finished jobs beyond history_size"""
+        jobs = self.store.list()
+        finished = [job["job_id"] for job in jobs if job["status"] not in ACTIVE_STATUSES]
+        for job_id in finished[:max(len(jobs) - self.history_size, 0)]:
+            self.store.delete(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the status of a job
+
+        Args:
+            job_id: Identifier of the job
+
+        Returns:
+            Job status dictionary, or None if the job is unknown
+        """
+        job = self.store.read(job_id)
+        if job is None:
+            return None
+        return self._check_owner(job)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Get the status of every tracked job, oldest first"""
+        return [self._check_owner(job) for job in self.store.list()]
+
+    def shutdown(self) -> None:
+        """Wait for running jobs and stop the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
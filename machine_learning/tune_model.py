@@ -0,0 +1,328 @@
+"""
+Hyperparameter search for the classifiers in MODEL_CONFIGS
+
+Runs a grid or random search over the model and vectorizer parameters
+listed in config.TUNING_CONFIG. Trials run in parallel in a process pool;
+every distinct vectorizer setting is fitted once and its train/test
+matrices are shared through the feature store. With successive halving
+(the default) all trials first train on a small stratified share of the
+training split, and only the best third of every rung moves on to a
+larger share, so bad configurations are dropped early.
+
+Trials are scored by macro F1 on a validation split held out of the
+training split, so the test split plays no part in the selection. The
+ranked results are written to tuning_results/ and the best configuration
+is trained on the full training split, scored once on the test split and
+saved as a new model version.
+"""
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score
+
+# Add the current directory to Python path
+sys.path.append(str(Path(__file__).parent))
+
+from data.feature_store import FeatureStore
+from models.model_factory import ModelFactory
+from persistence.model_manager import ModelManager
+from config import BASE_DIR, DATASET_PATH, FEATURE_STORE_CONFIG, MODEL_CONFIGS, TUNING_CONFIG
+
+RESULTS_DIR = BASE_DIR / "tuning_results"
+
+# Feature sets already loaded by this (worker) process, by vectorizer settings
+_FEATURES = {}
+
+
+def build_candidates(space: Dict[str, Dict[str, list]], search: str, n_iter: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Expand a search space into trial configurations
+
+    Args:
+        space: {"model_params": {...}, "vectorizer_params": {...}} of value lists
+        search: "grid" (every combination) or "random" (n_iter sampled combinations)
+        n_iter: Number of random combinations
+        seed: Seed of the random sampling
+
+    Returns:
+        List of {"vectorizer_params": ..., "model_params": ...} overrides
+    """
+    axes = [
+        (group, name, values)
+        for group in ("vectorizer_params", "model_params")
+        for name, values in sorted(space.get(group, {}).items())
+    ]
+    grid = []
+    for combination in itertools.product(*(values for _, _, values in axes)):
+        candidate = {"vectorizer_params": {}, "model_params": {}}
+        for (group, name, _), value in zip(axes, combination):
+            candidate[group][name] = value
+        grid.append(candidate)
+
+    if search == "random" and n_iter < len(grid):
+        grid = random.Random(seed).sample(grid, n_iter)
+    return grid
+
+
+def _get_features(vectorizer_params: Dict[str, Any], max_entries: int):
+    """Load (or build) a feature set once per process"""
+    key = json.dumps(vectorizer_params, sort_keys=True)
+    if key not in _FEATURES:
+        _FEATURES[key] = FeatureStore(max_entries=max_entries).get_or_build(str(DATASET_PATH), vectorizer_params)
+    return _FEATURES[key]
+
+
+def prepare_features(vectorizer_params: Dict[str, Any], max_entries: int) -> bool:
+    """Make sure a vectorizer setting is in the feature store; returns whether it already was"""
+    return FeatureStore(max_entries=max_entries).get_or_build(str(DATASET_PATH), vectorizer_params).cached
+
+
+def stratified_subset(y: List[str], fraction: float, seed: int = 42) -> np.ndarray:
+    """Indices of a random share of the samples of every class (at least one per class)"""
+    y = np.asarray(y)
+    if fraction >= 1:
+        return np.arange(len(y))
+
+    rng = np.random.RandomState(seed)
+    rows = []
+    for label in np.unique(y):
+        indices = np.flatnonzero(y == label)
+        rng.shuffle(indices)
+        rows.append(indices[:max(1, math.ceil(fraction * len(indices)))])
+    return np.sort(np.concatenate(rows))
+
+
+def validation_split(y: List[str], fraction: float, seed: int = 42) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hold out a share of the samples of every class for validation
+
+    Classes with a single sample stay entirely in the fitting rows.
+
+    Returns:
+        Tuple of (fitting row indices, validation row indices)
+    """
+    y = np.asarray(y)
+    rng = np.random.RandomState(seed)
+    fit_rows, validation_rows = [], []
+    for label in np.unique(y):
+        indices = np.flatnonzero(y == label)
+        rng.shuffle(indices)
+        n_validation = min(int(round(fraction * len(indices))), len(indices) - 1)
+        validation_rows.append(indices[:n_validation])
+        fit_rows.append(indices[n_validation:])
+    return np.sort(np.concatenate(fit_rows)), np.sort(np.concatenate(validation_rows))
+
+
+def run_trial(model_type: str, vectorizer_params: Dict[str, Any], model_params: Dict[str, Any],
+              fraction: float, max_entries: int, validation_fraction: float = 0.2) -> Dict[str, float]:
+    """
+    Train one configuration on a share of the training split and score it
+    on the validation rows held out of that split
+
+    Returns:
+        Dictionary with validation macro F1, accuracy and fit time
+    """
+    features = _get_features(vectorizer_params, max_entries)
+    y_train = np.asarray(features.y_train)
+    fit_rows, validation_rows = validation_split(y_train, validation_fraction)
+    rows = fit_rows[stratified_subset(y_train[fit_rows], fraction)]
+
+    classifier = ModelFactory.create_classifier(model_type)
+    start = time.perf_counter()
+    classifier.train_on_features(
+        features.vectorizer, features.X_train[rows], y_train[rows].tolist(),
+        vectorizer_params, model_params, calibrate=False
+    )
+    fit_ms = (time.perf_counter() - start) * 1000
+
+    predictions = classifier.model.predict(features.X_train[validation_rows])
+    y_validation = y_train[validation_rows]
+    return {
+        "macro_f1": float(f1_score(y_validation, predictions, average="macro", zero_division=0)),
+        "accuracy": float(accuracy_score(y_validation, predictions)),
+        "fit_ms": fit_ms
+    }
+
+
+def _run_all(executor: Optional[ProcessPoolExecutor], func: Callable, calls: List[Tuple]) -> List[Any]:
+    """Run func over argument tuples in the pool (or inline without one), keeping order"""
+    if executor is None:
+        return [func(*args) for args in calls]
+    futures = [executor.submit(func, *args) for args in calls]
+    return [future.result() for future in futures]
+
+
+def budget_fractions(early_stop: bool, eta: int, min_fraction: float) -> List[float]:
+    """Training-set shares of the successive halving rungs, ending at the full split"""
+    if not early_stop:
+        return [1.0]
+    n_rungs = max(1, math.ceil(math.log(1 / min_fraction, eta) - 1e-9) + 1)
+    return [eta ** (rung - n_rungs + 1) for rung in range(n_rungs)]
+
+
+def search(model_type: str, candidates: List[Dict[str, Any]], n_jobs: int,
+           fractions: List[float], eta: int, max_entries: int, validation_fraction: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Run the trials, halving the surviving candidates after every rung
+
+    Returns:
+        One result per candidate, ranked best first
+    """
+    base_params = MODEL_CONFIGS[model_type].get("vectorizer_params", {})
+    trials = [
+        {
+            "trial": i,
+            "vectorizer_params": dict(base_params, **candidate["vectorizer_params"]),
+            "overrides": candidate,
+            "model_params": candidate["model_params"],
+        }
+        for i, candidate in enumerate(candidates)
+    ]
+
+    executor = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+    try:
+        survivors = trials
+        for rung, fraction in enumerate(fractions):
+            scores = _run_all(executor, run_trial, [
+                (model_type, trial["vectorizer_params"], trial["model_params"], fraction, max_entries,
+                 validation_fraction)
+                for trial in survivors
+            ])
+            for trial, score in zip(survivors, scores):
+                trial.update(score, fraction=fraction, rung=rung)
+
+            survivors.sort(key=lambda trial: trial["macro_f1"], reverse=True)
+            if rung < len(fractions) - 1:
+                survivors = survivors[:max(1, math.ceil(len(survivors) / eta))]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Trials that reached the full budget first, then by how far they got
+    return sorted(trials, key=lambda trial: (trial["rung"], trial["macro_f1"]), reverse=True)
+
+
+def write_results(model_type: str, ranked: List[Dict[str, Any]]) -> Path:
+    """Write the ranked trials to a CSV file in tuning_results/"""
+    RESULTS_DIR.mkdir(exist_ok=True)
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = RESULTS_DIR / f"{model_type}_{timestamp}.csv"
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["rank", "val_macro_f1", "val_accuracy", "train_fraction", "fit_ms",
+                         "vectorizer_params", "model_params"])
+        for rank, trial in enumerate(ranked, 1):
+            writer.writerow([
+                rank, round(trial["macro_f1"], 4), round(trial["accuracy"], 4), round(trial["fraction"], 4),
+                round(trial["fit_ms"], 1), json.dumps(trial["overrides"]["vectorizer_params"]),
+                json.dumps(trial["model_params"])
+            ])
+    return path
+
+
+def print_results(ranked: List[Dict[str, Any]], top: int) -> None:
+    """Print the best trials as a table"""
+    print(f"\n{'rank':>4} {'val F1':>9} {'val acc':>9} {'budget':>7} {'fit ms':>8}  parameters")
+    print("-" * 100)
+    for rank, trial in enumerate(ranked[:top], 1):
+        params = {**trial["overrides"]["vectorizer_params"], **trial["model_params"]}
+        print(f"{rank:4d} {trial['macro_f1']:9.4f} {trial['accuracy']:9.4f} {trial['fraction']:7.0%} "
+              f"{trial['fit_ms']:8.1f}  {params}")
+
+
+def save_best(model_type: str, best: Dict[str, Any], n_trials: int, max_entries: int) -> Tuple[str, Dict[str, Any]]:
+    """
+    Train the best configuration on the full training split, score it
+    once on the test split and save it
+
+    Returns:
+        Tuple of (saved model path, tuning metadata)
+    """
+    features = FeatureStore(max_entries=max_entries).get_or_build(str(DATASET_PATH), best["vectorizer_params"])
+    classifier = ModelFactory.create_classifier(model_type)
+    classifier.train_on_features(
+        features.vectorizer, features.X_train, features.y_train, best["vectorizer_params"], best["model_params"]
+    )
+
+    predictions = classifier.model.predict(features.X_test)
+    classifier.metadata["tuning"] = {
+        "metric": "macro_f1",
+        "validation_score": best["macro_f1"],
+        "test_macro_f1": float(f1_score(features.y_test, predictions, average="macro", zero_division=0)),
+        "test_accuracy": float(accuracy_score(features.y_test, predictions)),
+        "trials": n_trials
+    }
+    return ModelManager().save_model(classifier, model_type), classifier.metadata["tuning"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-type", default="svm", choices=sorted(TUNING_CONFIG), help="Model to tune")
+    parser.add_argument("--search", default="grid", choices=["grid", "random"], help="Search strategy")
+    parser.add_argument("--n-iter", type=int, default=40, help="Sampled configurations for --search random")
+    parser.add_argument("--n-jobs", type=int, default=os.cpu_count() or 1, help="Parallel trial processes")
+    parser.add_argument("--no-early-stop", action="store_true", help="Train every trial on the full split")
+    parser.add_argument("--eta", type=int, default=3, help="Successive halving keeps 1/eta trials per rung")
+    parser.add_argument("--min-fraction", type=float, default=1 / 9, help="Training share of the first rung")
+    parser.add_argument("--validation-fraction", type=float, default=0.2,
+                        help="Share of the training split held out to score the trials")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the random search")
+    parser.add_argument("--top", type=int, default=15, help="Rows of the printed table")
+    parser.add_argument("--no-save", action="store_true", help="Do not save the best configuration as a model")
+    parser.add_argument("--compare-serial", action="store_true",
+                        help="Re-run the search in a single process and report the parallel speedup")
+    args = parser.parse_args()
+
+    candidates = build_candidates(TUNING_CONFIG[args.model_type], args.search, args.n_iter, args.seed)
+    fractions = budget_fractions(not args.no_early_stop, args.eta, args.min_fraction)
+
+    base_params = MODEL_CONFIGS[args.model_type].get("vectorizer_params", {})
+    vectorizer_settings = {
+        json.dumps(dict(base_params, **candidate["vectorizer_params"]), sort_keys=True) for candidate in candidates
+    }
+    # Keep every setting of this search in the store at once
+    max_entries = max(FEATURE_STORE_CONFIG["max_entries"], len(vectorizer_settings))
+    print(f"{len(candidates)} trials over {len(vectorizer_settings)} vectorizer settings, "
+          f"rungs at {', '.join(f'{fraction:.0%}' for fraction in fractions)} of the training split")
+
+    # Fit each vectorizer setting once; trials then only load its matrices
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.n_jobs) as executor:
+        cached = _run_all(executor, prepare_features, [(json.loads(s), max_entries) for s in vectorizer_settings])
+    print(f"Features ready in {time.perf_counter() - start:.1f}s ({sum(cached)} from the feature store)")
+
+    start = time.perf_counter()
+    ranked = search(args.model_type, candidates, args.n_jobs, fractions, args.eta, max_entries,
+                    args.validation_fraction)
+    parallel_seconds = time.perf_counter() - start
+    print(f"Search finished in {parallel_seconds:.1f}s with {args.n_jobs} processes")
+
+    print_results(ranked, args.top)
+    print(f"\nResults written to {write_results(args.model_type, ranked)}")
+
+    if args.compare_serial:
+        start = time.perf_counter()
+        search(args.model_type, candidates, 1, fractions, args.eta, max_entries, args.validation_fraction)
+        serial_seconds = time.perf_counter() - start
+        print(f"Serial search: {serial_seconds:.1f}s -> parallel speedup {serial_seconds / parallel_seconds:.2f}x")
+
+    if not args.no_save:
+        model_path, tuning = save_best(args.model_type, ranked[0], len(candidates), max_entries)
+        print(f"Best configuration saved to {model_path} "
+              f"(test macro F1 {tuning['test_macro_f1']:.4f}, accuracy {tuning['test_accuracy']:.4f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """
 Utilities package for ML Classification API
 """
-from .logger import setup_logger
+from .logger import setup_logger, shutdown_logging
+from .memory import get_process_memory
 
-__all__ = ["setup_logger"]
+__all__ = ["setup_logger", "shutdown_logging", "get_process_memory"]
@@ -0,0 +1,96 @@
+"""
+Advisory file locks serializing writers across processes
+
+The pre-forked API workers (start_api.py --production) and the training
+pool share saved_models/, so read-modify-write sequences on it are
+guarded by an exclusive `flock` on a lock file next to the data.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows runs a single API process (no pre-forking)
+    fcntl = None
+
+# Threads of one process queue on an in-process lock first, so at most
+# one of them per process holds the lock file open and waits in flock
+# (and threads still exclude each other where fcntl is missing)
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(path: Path) -> threading.Lock:
+    """In-process lock paired with a lock file"""
+    key = str(path.resolve())
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(key, threading.Lock())
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a file for the duration of the block
+
+    The file (and its directory) is created if needed and never deleted,
+    so every process locks the same inode.
+
+    Args:
+        path: Lock file
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _thread_lock(path):
+        with open(path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def any_file_lock(paths: Sequence[Path], poll_seconds: float = 0.5) -> Iterator[Path]:
+    """
+    Hold an exclusive lock on the first free file of several, waiting
+    until one is free
+
+    N lock files make a semaphore of N slots shared by every process; a
+    slot is freed when its holder exits, even if it crashes.
+
+    Args:
+        paths: Lock files (the slots)
+        poll_seconds: Pause between two rounds over busy slots
+
+    Yields:
+        The lock file held
+    """
+    paths = [Path(path) for path in paths]
+    for path in paths:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        for path in paths:
+            thread_lock = _thread_lock(path)
+            if not thread_lock.acquire(blocking=False):
+                continue
+            try:
+                with open(path, "a") as lock_file:
+                    if fcntl is not None:
+                        try:
+                            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        except BlockingIOError:
+                            continue
+                    try:
+                        yield path
+                    finally:
+                        if fcntl is not None:
+                            fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    return
+            finally:
+                thread_lock.release()
+        time.sleep(poll_seconds)
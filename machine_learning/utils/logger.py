@@ -1,20 +1,219 @@
 """
 Logging configuration for ML Classification API
+
+Loggers only put records on a bounded in-memory queue; a QueueListener
+thread formats them and writes them to stdout and the rotating log file,
+so slow terminals and disks never hold up a request.
 """
+import atexit
+import copy
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
+from contextvars import ContextVar, Token
 from pathlib import Path
-from config import LOGS_DIR
+from typing import Any, Dict, List, Optional
+
+from pythonjsonlogger import jsonlogger
+
+from config import LOGS_DIR, LOGGING_CONFIG
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+JSON_FORMAT = '%(asctime)s %(levelname)s %(name)s %(message)s'
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def set_request_id(request_id: str) -> Token:
+    """Tag the records logged by the current request (or task) with an id"""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token: Token) -> None:
+    """Restore the request id that was current before set_request_id"""
+    _request_id.reset(token)
+
+
+def get_request_id() -> Optional[str]:
+    """Id of the request being handled, if any"""
+    return _request_id.get()
+
+
+class RequestContextFilter(logging.Filter):
+    """Adds the id of the request being handled to every record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = _request_id.get()
+        if request_id is not None and not hasattr(record, "request_id"):
+            record.request_id = request_id
+        return True
+
+
+class InfoSamplingFilter(logging.Filter):
+    """Keeps a random share of DEBUG and INFO records; warnings and errors always pass"""
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"info_sample_rate must be between 0 and 1, got {rate}")
+        self.rate = rate
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or self.rate >= 1.0 or random.random() < self.rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that drops records when the queue is full
+
+    The stock handler reports a full queue through handleError, which
+    prints a traceback to stderr on the calling thread. A dropped record is
+    only counted here.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merge the message arguments on the calling thread
+
+        Unlike the stock prepare, the traceback is kept in exc_text rather
+        than appended to the message, so JSON records carry it as their own
+        field.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _LoggingPipeline:
+    """The process-wide queue, its handler and the listener writing the records"""
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=LOGGING_CONFIG["queue_size"])
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.sampling = InfoSamplingFilter(LOGGING_CONFIG["info_sample_rate"])
+        # Both filters run on the calling thread: the request id is only
+        # visible there, and sampled-out records never reach the queue
+        self.handler.addFilter(RequestContextFilter())
+        self.handler.addFilter(self.sampling)
+        self.outputs = _build_output_handlers(_log_path())
+        self.listener = None
+        self.start()
+
+    def start(self) -> None:
+        """Start the thread writing queued records"""
+        self.listener = logging.handlers.QueueListener(self.queue, *self.outputs, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Write the queued records and stop the listener thread"""
+        if self.listener is not None:
+            listener, self.listener = self.listener, None
+            try:
+                listener.stop()
+            except queue.Full:
+                pass
 
+    def restart_after_fork(self) -> None:
+        """
+        Give a forked child its own queue, listener and log file
 
-def setup_logger(name: str = "ml_classification_api", level: str = "INFO") -> logging.Logger:
+        The parent's listener thread does not exist in the child, and the
+        queue's locks may have been held by it at the time of the fork. A
+        shared file would be rotated by every worker independently, so each
+        child writes to a file suffixed with its pid.
+        """
+        for output in self.outputs:
+            output.close()
+        self.outputs = _build_output_handlers(_log_path(os.getpid()))
+        self.queue = queue.Queue(maxsize=LOGGING_CONFIG["queue_size"])
+        self.handler.queue = self.queue
+        self.handler.dropped = 0
+        self.start()
+
+
+_pipeline: Optional[_LoggingPipeline] = None
+
+
+def _log_path(pid: Optional[int] = None) -> Path:
+    """Log file of the process (api.log, or api-<pid>.log in forked workers)"""
+    path = LOGS_DIR / LOGGING_CONFIG["file"]
+    if pid is None:
+        return path
+    return path.with_name(f"{path.stem}-{pid}{path.suffix}")
+
+
+def _build_output_handlers(log_path: Path) -> List[logging.Handler]:
+    """Console and rotating file handlers, run on the listener thread"""
+    if LOGGING_CONFIG["json"]:
+        formatter = jsonlogger.JsonFormatter(
+            JSON_FORMAT, rename_fields={"asctime": "timestamp", "levelname": "level", "name": "logger"}
+        )
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+
+    # delay: the file is only created once a record is written, so forked
+    # processes that never log (e.g. training pool workers) leave no file
+    if LOGGING_CONFIG["rotation"] == "time":
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            log_path, when=LOGGING_CONFIG["when"], backupCount=LOGGING_CONFIG["backup_count"], delay=True
+        )
+    elif LOGGING_CONFIG["rotation"] == "size":
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=LOGGING_CONFIG["max_bytes"], backupCount=LOGGING_CONFIG["backup_count"], delay=True
+        )
+    else:
+        raise ValueError(f"Unknown log rotation: {LOGGING_CONFIG['rotation']}. Use 'size' or 'time'")
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(formatter)
+
+    return [console_handler, file_handler]
+
+
+def _get_pipeline() -> _LoggingPipeline:
+    """Create the logging pipeline on first use"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = _LoggingPipeline()
+        atexit.register(shutdown_logging)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_pipeline.restart_after_fork)
+    return _pipeline
+
+
+def setup_logger(name: str = "ml_classification_api", level: str = None) -> logging.Logger:
     """
     Set up logging configuration
     
     Args:
         name: Logger name
-        level: Logging level
-        
+        level: Logging level (defaults to LOGGING_CONFIG["level"])
+    
     Returns:
         Configured logger instance
     """
@@ -23,27 +222,38 @@ def setup_logger(name: str = "ml_classification_api", level: str = "INFO") -> lo
     
     # Create logger
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level.upper()))
+    logger.setLevel(getattr(logging, (level or LOGGING_CONFIG["level"]).upper()))
     
     # Prevent duplicate handlers
     if logger.handlers:
         return logger
     
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler
-    file_handler = logging.FileHandler(LOGS_DIR / "api.log")
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    # Every logger shares the one queue handler; formatting and I/O happen
+    # on the listener thread
+    logger.addHandler(_get_pipeline().handler)
     
     return logger
+
+
+def shutdown_logging() -> None:
+    """Write the records still queued and stop the listener thread"""
+    if _pipeline is not None:
+        _pipeline.stop()
+
+
+def flush_logging() -> None:
+    """Write the records queued so far; logging keeps working afterwards"""
+    if _pipeline is not None:
+        _pipeline.stop()
+        _pipeline.start()
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Get queue depth and the counts of dropped and sampled-out records"""
+    if _pipeline is None:
+        return {"queued": 0, "dropped": 0, "sampled_out": 0}
+    return {
+        "queued": _pipeline.queue.qsize(),
+        "dropped": _pipeline.handler.dropped,
+        "sampled_out": _pipeline.sampling.sampled_out
+    }
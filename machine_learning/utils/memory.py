@@ -0,0 +1,44 @@
+"""
+Process memory statistics read from /proc (Linux only)
+"""
+from pathlib import Path
+from typing import Dict
+
+
+def _read_kb_fields(path: Path) -> Dict[str, int]:
+    """Parse 'Key:   1234 kB' lines into a dict of kilobyte values"""
+    fields = {}
+    with open(path, 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return fields
+
+
+def get_process_memory(pid: int) -> Dict[str, float]:
+    """
+    Get memory usage of a process in megabytes
+
+    `rss_mb` counts every resident page, including pages shared with the
+    parent after fork. `pss_mb` divides shared pages between the processes
+    that map them, so summing it over workers gives the real total.
+
+    Args:
+        pid: Process id
+
+    Returns:
+        Dictionary with rss_mb, pss_mb, shared_mb and private_mb
+    """
+    proc = Path("/proc") / str(pid)
+    status = _read_kb_fields(proc / "status")
+    stats = {"rss_mb": status.get("VmRSS", 0) / 1024}
+
+    rollup_path = proc / "smaps_rollup"
+    if rollup_path.exists():
+        rollup = _read_kb_fields(rollup_path)
+        stats["pss_mb"] = rollup.get("Pss", 0) / 1024
+        stats["shared_mb"] = (rollup.get("Shared_Clean", 0) + rollup.get("Shared_Dirty", 0)) / 1024
+        stats["private_mb"] = (rollup.get("Private_Clean", 0) + rollup.get("Private_Dirty", 0)) / 1024
+
+    return stats
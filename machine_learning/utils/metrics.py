@@ -0,0 +1,395 @@
+"""
+In-process metrics with a Prometheus text exposition
+
+Counters, gauges and histograms keep one slot per thread: a thread only
+ever writes its own slot, so updates take no lock and cost a few hundred
+nanoseconds; a scrape sums the slots of every thread.
+
+Pre-forked workers (start_api.py --production) each hold their own
+registry. In multiprocess mode every worker writes a snapshot of its
+metrics to `<pid>.json` in a shared directory, and a scrape answered by
+any worker merges them: counters and histograms are summed over every
+worker (including exited ones, so totals never go back), gauges are
+reported per live worker with a `pid` label.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import METRICS_CONFIG
+
+
+class _ThreadSlots:
+    """
+    Base of metrics holding one value slot per thread
+
+    The lock only guards registering a new thread's slot, never an update.
+    """
+
+    __slots__ = ("_local", "_slots", "_lock")
+
+    def __init__(self, size: int):
+        self._local = threading.local()
+        self._slots: List[list] = [[0] * size]  # keeps the size for totals()
+        self._lock = threading.Lock()
+
+    def _new_slot(self) -> list:
+        """Create and register the slot of the calling thread"""
+        slot = [0] * len(self._slots[0])
+        with self._lock:
+            self._slots.append(slot)
+        self._local.slot = slot
+        return slot
+
+    def totals(self) -> List[float]:
+        """Element-wise sum of every thread's slot"""
+        with self._lock:
+            slots = list(self._slots)
+        return [sum(values) for values in zip(*slots)]
+
+
+class Counter(_ThreadSlots):
+    """Monotonically increasing count"""
+
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1) -> None:
+        """Add to the count"""
+        try:
+            self._local.slot[0] += amount
+        except AttributeError:
+            self._new_slot()[0] += amount
+
+    @property
+    def value(self) -> float:
+        """Current count"""
+        return self.totals()[0]
+
+    def samples(self, name: str, labels: str) -> Iterable[str]:
+        """Exposition lines of this metric"""
+        yield f"{name}{labels} {_format(self.value)}"
+
+
+class Gauge(Counter):
+    """Value that goes up and down (e.g. requests in flight)"""
+
+    __slots__ = ()
+
+    def dec(self, amount: float = 1) -> None:
+        """Subtract from the value"""
+        self.inc(-amount)
+
+
+class Histogram(_ThreadSlots):
+    """Distribution of observed values over fixed buckets"""
+
+    __slots__ = ("_bounds",)
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Args:
+            buckets: Sorted upper bounds; a +Inf bucket is added
+        """
+        self._bounds = tuple(buckets)
+        # One count per bucket, the +Inf bucket, then the sum
+        super().__init__(len(self._bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        """Record a value"""
+        try:
+            slot = self._local.slot
+        except AttributeError:
+            slot = self._new_slot()
+        slot[bisect.bisect_left(self._bounds, value)] += 1
+        slot[-1] += value
+
+    def samples(self, name: str, labels: str) -> Iterable[str]:
+        """Exposition lines of this metric (cumulative buckets, sum and count)"""
+        return _histogram_samples(name, labels, self._bounds, self.totals())
+
+
+class MetricFamily:
+    """
+    A named metric with one child metric per combination of label values
+    """
+
+    def __init__(self, name: str, help_text: str, kind: str, labelnames: Sequence[str],
+                 factory: Callable[[], object], buckets: Sequence[float] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)  # histograms only
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = factory()
+
+    def labels(self, *values: str):
+        """Get (or create) the child metric of the given label values"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {list(self.labelnames)}, got {list(values)}")
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    def render(self) -> Iterable[str]:
+        """Exposition lines of the family"""
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in sorted(self._children.items()):
+            yield from child.samples(self.name, _labels(self.labelnames, values))
+
+    def snapshot(self) -> List[Tuple[List[str], List[float]]]:
+        """(label values, totals) of every child"""
+        return [(list(values), child.totals()) for values, child in list(self._children.items())]
+
+
+class CallbackGauge:
+    """Gauge family whose values are read from a callback at scrape time"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str],
+                 callback: Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]):
+        self.name = name
+        self.help_text = help_text
+        self.kind = "gauge"
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def render(self) -> Iterable[str]:
+        """Exposition lines of the family"""
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} gauge"
+        for values, value in self.callback():
+            yield f"{self.name}{_labels(self.labelnames, [str(v) for v in values])} {_format(value)}"
+
+    def snapshot(self) -> List[Tuple[List[str], List[float]]]:
+        """(label values, [value]) of every sample"""
+        return [([str(v) for v in values], [value]) for values, value in self.callback()]
+
+
+class MetricsRegistry:
+    """
+    Collection of metric families rendered together for a scrape
+    """
+
+    def __init__(self):
+        self._families: Dict[str, object] = {}
+        self._multiprocess_dir: Optional[Path] = None
+        self._snapshot_thread: Optional[threading.Thread] = None
+
+    def _register(self, family):
+        """Add a family, refusing duplicate names"""
+        if family.name in self._families:
+            raise ValueError(f"Metric already registered: {family.name}")
+        self._families[family.name] = family
+        return family
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        """Register a counter family"""
+        return self._register(MetricFamily(name, help_text, "counter", labelnames, Counter))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        """Register a gauge family"""
+        return self._register(MetricFamily(name, help_text, "gauge", labelnames, Gauge))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = None) -> MetricFamily:
+        """Register a histogram family"""
+        buckets = tuple(buckets or METRICS_CONFIG["latency_buckets"])
+        return self._register(
+            MetricFamily(name, help_text, "histogram", labelnames, lambda: Histogram(buckets), buckets)
+        )
+
+    def gauge_callback(self, name: str, help_text: str, callback, labelnames: Sequence[str] = ()) -> CallbackGauge:
+        """
+        Register a gauge read at scrape time
+
+        Args:
+            callback: Returns (label values, value) pairs
+        """
+        return self._register(CallbackGauge(name, help_text, labelnames, callback))
+
+    def unregister(self, name: str) -> None:
+        """Remove a metric family"""
+        self._families.pop(name, None)
+
+    def enable_multiprocess(self, directory: Path) -> None:
+        """
+        Merge the metrics of every process writing snapshots to a directory
+
+        Called once in the parent before the workers are forked; the
+        snapshots of a previous run are removed.
+
+        Args:
+            directory: Directory shared by the workers
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for path in directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+        self._multiprocess_dir = directory
+
+    def start_snapshots(self) -> None:
+        """
+        Write this process's snapshot periodically from a daemon thread
+
+        Runs in each worker after the fork (threads do not survive it);
+        does nothing outside multiprocess mode.
+        """
+        if self._multiprocess_dir is None:
+            return
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return
+
+        def write_periodically():
+            while True:
+                self.write_snapshot()
+                time.sleep(METRICS_CONFIG["snapshot_seconds"])
+
+        self._snapshot_thread = threading.Thread(target=write_periodically, name="metrics-snapshot", daemon=True)
+        self._snapshot_thread.start()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current totals of every family, keyed by family name"""
+        return {
+            name: {"kind": family.kind, "samples": family.snapshot()}
+            for name, family in list(self._families.items())
+        }
+
+    def write_snapshot(self) -> None:
+        """Write this process's snapshot for the other workers' scrapes (multiprocess mode only)"""
+        if self._multiprocess_dir is None:
+            return
+        path = self._multiprocess_dir / f"{os.getpid()}.json"
+        temp_path = path.with_suffix(".tmp")
+        try:
+            temp_path.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+            os.replace(temp_path, path)
+        except OSError:
+            pass  # the next write retries; a scrape then sees slightly older values
+
+    def _read_snapshots(self) -> Dict[int, Dict[str, Any]]:
+        """Snapshots of every process, this one taken live"""
+        snapshots = {}
+        for path in self._multiprocess_dir.glob("*.json"):
+            try:
+                snapshots[int(path.stem)] = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue  # removed or replaced while reading
+        snapshots[os.getpid()] = self.snapshot()
+        return snapshots
+
+    def _render_merged(self) -> Iterable[str]:
+        """Exposition lines merging the snapshots of every process"""
+        snapshots = self._read_snapshots()
+        live = {pid for pid in snapshots if _process_alive(pid)}
+        for name, family in self._families.items():
+            yield f"# HELP {name} {family.help_text}"
+            yield f"# TYPE {name} {family.kind}"
+            if family.kind == "gauge":
+                # Gauges are not summed (e.g. a hit ratio); exited workers have no value
+                for pid in sorted(live):
+                    for values, totals in sorted(snapshots[pid].get(name, {}).get("samples", [])):
+                        labels = _labels(family.labelnames + ("pid",), values + [str(pid)])
+                        yield f"{name}{labels} {_format(totals[0])}"
+                continue
+
+            merged: Dict[Tuple[str, ...], List[float]] = {}
+            for snapshot in snapshots.values():
+                for values, totals in snapshot.get(name, {}).get("samples", []):
+                    key = tuple(values)
+                    current = merged.get(key)
+                    merged[key] = totals if current is None else [a + b for a, b in zip(current, totals)]
+            for values, totals in sorted(merged.items()):
+                labels = _labels(family.labelnames, values)
+                if family.kind == "histogram":
+                    yield from _histogram_samples(name, labels, family.buckets, totals)
+                else:
+                    yield f"{name}{labels} {_format(totals[0])}"
+
+    def render(self) -> str:
+        """Render every family in the Prometheus text format (version 0.0.4)"""
+        if self._multiprocess_dir is not None:
+            return "\n".join(self._render_merged()) + "\n"
+        lines = []
+        for family in self._families.values():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_samples(name: str, labels: str, bounds: Sequence[float], totals: Sequence[float]) -> Iterable[str]:
+    """Cumulative bucket, sum and count lines of histogram totals"""
+    cumulative = 0
+    for bound, count in zip(tuple(bounds) + (float("inf"),), totals):
+        cumulative += count
+        le = "+Inf" if bound == float("inf") else _format(bound)
+        yield f"{name}_bucket{_add_label(labels, 'le', le)} {cumulative}"
+    yield f"{name}_sum{labels} {_format(totals[-1])}"
+    yield f"{name}_count{labels} {cumulative}"
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with this pid is running"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _format(value: float) -> str:
+    """Format a sample value"""
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render a label set (empty without labels)"""
+    labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{labels}}}" if labels else ""
+
+
+def _escape(value: str) -> str:
+    """Escape a label value"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _add_label(labels: str, name: str, value: str) -> str:
+    """Append a label to a rendered label set"""
+    if labels:
+        return f'{labels[:-1]},{name}="{value}"}}'
+    return f'{{{name}="{value}"}}'
+
+
+# Metrics of the API process
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter(
+    "ml_api_requests_total", "HTTP requests by handler, method and status", ("handler", "method", "status")
+)
+ERRORS = registry.counter(
+    "ml_api_errors_total", "HTTP requests answered with a 4xx or 5xx status", ("handler", "status")
+)
+IN_FLIGHT = registry.gauge("ml_api_requests_in_flight", "HTTP requests being processed").labels()
+REQUEST_SECONDS = registry.histogram(
+    "ml_api_request_duration_seconds", "End-to-end request latency", ("handler", "model_type")
+)
+STAGE_SECONDS = registry.histogram(
+    "ml_api_stage_duration_seconds",
+    "Latency of a request stage (validation, model_lookup, serialize) or of a model call (vectorize, score)",
+    ("stage", "model_type")
+)
@@ -0,0 +1,167 @@
+"""
+Opt-in profiling of sampled model calls, exported as collapsed stacks
+"""
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Tuple
+
+from config import PROFILING_CONFIG
+
+TRUNCATED_STACK = ("[other stacks]",)
+
+
+def _frame_name(frame) -> str:
+    """module.qualified_name of a Python frame"""
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}"
+
+
+def _builtin_name(function) -> str:
+    """module.qualified_name of a C function"""
+    module = getattr(function, "__module__", None)
+    if module is None:
+        owner = getattr(function, "__self__", None)
+        module = type(owner).__name__ if owner is not None else "builtins"
+    return f"{module}.{getattr(function, '__qualname__', repr(function))}"
+
+
+class _StackTracer:
+    """
+    sys.setprofile hook recording the self time of every call stack
+
+    Python and C calls (the sparse products and tokenizer regexes run in
+    C) are both recorded, keyed by the tuple of frame names from the
+    profiled function down.
+    """
+
+    def __init__(self):
+        self.stack = []  # [names so far, start time, time spent in children]
+        self.self_times: Dict[Tuple[str, ...], float] = defaultdict(float)
+
+    def __call__(self, frame, event: str, arg: Any) -> None:
+        now = time.perf_counter()
+        if event == "call" or event == "c_call":
+            name = _frame_name(frame) if event == "call" else _builtin_name(arg)
+            names = self.stack[-1][0] + (name,) if self.stack else (name,)
+            self.stack.append([names, now, 0.0])
+        elif self.stack and event in ("return", "c_return", "c_exception"):
+            names, start, children = self.stack.pop()
+            elapsed = now - start
+            self.self_times[names] += elapsed - children
+            if self.stack:
+                self.stack[-1][2] += elapsed
+
+
+class SamplingProfiler:
+    """
+    Profiles a random share of the calls passed through `call`
+
+    A sampled call runs under a per-thread `sys.setprofile` tracer that
+    attributes its wall time to full call stacks (tokenization, n-gram
+    generation, the sparse dot product, ...). The stacks of all sampled
+    calls are summed and exported in the collapsed format read by
+    flamegraph.pl and speedscope. Call sites check `enabled` first, so a
+    disabled profiler costs one attribute read.
+    """
+
+    def __init__(self, enabled: bool = False, sample_rate: float = 0.1, max_stacks: int = 10000):
+        """
+        Initialize the profiler
+
+        Args:
+            enabled: Whether calls are sampled
+            sample_rate: Share of calls that are profiled (0.0 to 1.0)
+            max_stacks: Distinct stacks kept; further ones are merged into one entry
+        """
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.max_stacks = max_stacks
+        self._stacks: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self.calls_seen = 0
+        self.calls_profiled = 0
+        self.profiled_seconds = 0.0
+
+    def configure(self, enabled: bool, sample_rate: float = None) -> None:
+        """Switch profiling on or off, optionally changing the sample rate"""
+        if sample_rate is not None:
+            if not 0.0 <= sample_rate <= 1.0:
+                raise ValueError(f"sample_rate must be between 0 and 1, got {sample_rate}")
+            self.sample_rate = sample_rate
+        self.enabled = enabled
+
+    def call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a function, profiling it if this call is sampled
+
+        Args:
+            func: Function to call
+            *args: Positional arguments for the function
+
+        Returns:
+            The function's return value
+        """
+        self.calls_seen += 1
+        if not self.enabled or random.random() >= self.sample_rate or sys.getprofile() is not None:
+            return func(*args)
+
+        tracer = _StackTracer()
+        start = time.perf_counter()
+        sys.setprofile(tracer)
+        try:
+            return func(*args)
+        finally:
+            sys.setprofile(None)
+            self._merge(tracer, time.perf_counter() - start)
+
+    def _merge(self, tracer: _StackTracer, seconds: float) -> None:
+        """Add the stacks of one profiled call to the totals"""
+        with self._lock:
+            self.calls_profiled += 1
+            self.profiled_seconds += seconds
+            for names, self_time in tracer.self_times.items():
+                if names not in self._stacks and len(self._stacks) >= self.max_stacks:
+                    names = TRUNCATED_STACK
+                self._stacks[names] += self_time
+
+    def collapsed(self) -> str:
+        """
+        Export the summed stacks as collapsed-stack lines
+
+        Returns:
+            One "frame;frame;frame microseconds" line per stack, heaviest first
+        """
+        with self._lock:
+            stacks = sorted(self._stacks.items(), key=lambda item: item[1], reverse=True)
+        lines = [f"{';'.join(names)} {round(seconds * 1e6)}" for names, seconds in stacks]
+        return "\n".join(line for line in lines if not line.endswith(" 0")) + "\n"
+
+    def reset(self) -> None:
+        """Drop the collected stacks and counters"""
+        with self._lock:
+            self._stacks.clear()
+            self.calls_seen = 0
+            self.calls_profiled = 0
+            self.profiled_seconds = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the profiler settings and counters"""
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "calls_seen": self.calls_seen,
+            "calls_profiled": self.calls_profiled,
+            "profiled_ms": round(self.profiled_seconds * 1000, 2),
+            "stacks": len(self._stacks)
+        }
+
+
+# Profiler of the API's model calls (GET/POST /api/v1/debug/profile)
+profiler = SamplingProfiler(
+    enabled=PROFILING_CONFIG["enabled"],
+    sample_rate=PROFILING_CONFIG["sample_rate"],
+    max_stacks=PROFILING_CONFIG["max_stacks"]
+)